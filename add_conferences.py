@@ -360,39 +360,50 @@ CONFERENCE_MAPPINGS = {
 import sqlite3
 import pandas as pd
 
-def add_conference_to_database():
+from app_state import bump_data_version
+from db_access import connect_readonly, write_transaction
+from player_history import player_conferences, rebuild_changed_conferences
+from player_search import rebuild_player_search
+
+def add_conference_to_database(db_path=None):
     """Add conference column to players table and populate it"""
-    conn = sqlite3.connect('data/ncaa_soccer.db')
-    cursor = conn.cursor()
-    
-    # Add conference column if it doesn't exist
-    try:
-        cursor.execute("ALTER TABLE players ADD COLUMN conference TEXT")
-        print("Added conference column to players table")
-    except sqlite3.OperationalError as e:
-        if "duplicate column name" in str(e):
-            print("Conference column already exists")
-        else:
-            raise e
-    
-    # Update players with conference information
-    updated_count = 0
-    for team, conference in CONFERENCE_MAPPINGS.items():
-        cursor.execute("UPDATE players SET conference = ? WHERE team = ?", (conference, team))
-        updated_count += cursor.rowcount
-    
-    # Set remaining teams to "Other" conference
-    cursor.execute("UPDATE players SET conference = 'Other' WHERE conference IS NULL")
-    other_count = cursor.rowcount
-    
-    conn.commit()
-    conn.close()
+    with write_transaction(db_path) as conn:
+        cursor = conn.cursor()
+        
+        # Add conference column if it doesn't exist
+        try:
+            cursor.execute("ALTER TABLE players ADD COLUMN conference TEXT")
+            print("Added conference column to players table")
+        except sqlite3.OperationalError as e:
+            if "duplicate column name" in str(e):
+                print("Conference column already exists")
+            else:
+                raise e
+        
+        before = player_conferences(conn)
+        
+        # Update players with conference information
+        updated_count = 0
+        for team, conference in CONFERENCE_MAPPINGS.items():
+            cursor.execute("UPDATE players SET conference = ? WHERE team = ?", (conference, team))
+            updated_count += cursor.rowcount
+        
+        # Set remaining teams to "Other" conference
+        cursor.execute("UPDATE players SET conference = 'Other' WHERE conference IS NULL")
+        other_count = cursor.rowcount
+        
+        # Conferences are searchable too, and filterable on historical snapshots
+        rebuild_player_search(conn)
+        rebuilt = rebuild_changed_conferences(conn, before)
+        bump_data_version(conn)
     
     print(f"Updated {updated_count} players with known conferences")
     print(f"Set {other_count} players to 'Other' conference")
+    if rebuilt:
+        print(f"📚 Re-encoded player history for {', '.join(rebuilt)}")
     
     # Show conference distribution
-    conn = sqlite3.connect('data/ncaa_soccer.db')
+    conn = connect_readonly(db_path)
     cursor = conn.cursor()
     cursor.execute("SELECT conference, COUNT(*) as player_count FROM players GROUP BY conference ORDER BY player_count DESC")
     conferences = cursor.fetchall()
@@ -0,0 +1,65 @@
+"""
+Shared Data Version for NCAA Soccer Dashboard
+Writers bump one counter in app_state inside the same transaction as their change, so
+readers can cache anything derived from the tables (counts, pages) until the next ingest.
+"""
+
+import sqlite3
+import threading
+
+DATA_VERSION_SQL = "SELECT value FROM app_state WHERE key = 'data_version'"
+
+
+def get_data_version(conn):
+    """Current data version (0 before anything bumped it or on an unmigrated database)"""
+    try:
+        row = conn.execute(DATA_VERSION_SQL).fetchone()
+    except sqlite3.OperationalError:
+        return 0
+    return row[0] if row else 0
+
+
+def bump_data_version(conn):
+    """Mark the tables as changed; call inside the writer's transaction"""
+    try:
+        conn.execute("""
+            INSERT INTO app_state (key, value) VALUES ('data_version', 1)
+            ON CONFLICT(key) DO UPDATE SET value = value + 1
+        """)
+    except sqlite3.OperationalError as e:
+        # Legacy scripts may run against a database the migrations haven't reached yet
+        if "no such table" not in str(e):
+            raise e
+
+
+class VersionedCache:
+    """Small in-process cache whose entries are only valid for the data version they were built at"""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = {}
+        self._version = None
+        self._lock = threading.Lock()
+
+    def get(self, key, version, compute):
+        """Cached value for key at this version, computing and storing it on a miss"""
+        with self._lock:
+            if version != self._version:
+                self._entries = {}
+                self._version = version
+            if key in self._entries:
+                return self._entries[key]
+
+        value = compute()
+        with self._lock:
+            if version == self._version:
+                if len(self._entries) >= self.max_entries:
+                    # Drop the oldest entry; dicts keep insertion order
+                    self._entries.pop(next(iter(self._entries)))
+                self._entries[key] = value
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+            self._version = None
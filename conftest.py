@@ -0,0 +1,34 @@
+"""
+Shared pytest fixtures
+ncaa_app reads NCAA_DB_PATH once, when it is first imported, so every test that talks to the
+web app shares the one scratch copy of the database set up here. Test modules take the
+ncaa_app fixture instead of importing the module themselves.
+"""
+import os
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DB = os.path.join(ROOT, 'data', 'ncaa_soccer.db')
+if ROOT not in sys.path:
+    sys.path.append(ROOT)
+
+
+@pytest.fixture(scope='session')
+def ncaa_app(tmp_path_factory):
+    """The ncaa_app module, migrated and serving a scratch copy of data/ncaa_soccer.db"""
+    assert 'ncaa_app' not in sys.modules, "ncaa_app was imported before NCAA_DB_PATH pointed at the test copy"
+    db_path = str(tmp_path_factory.mktemp('app') / 'ncaa_soccer.db')
+    shutil.copy(SOURCE_DB, db_path)
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setenv('NCAA_DB_PATH', db_path)
+        import ncaa_app
+        assert ncaa_app.db_path == db_path
+        yield ncaa_app
+
+
+@pytest.fixture
+def client(ncaa_app):
+    return ncaa_app.app.test_client()
@@ -0,0 +1,125 @@
+"""
+Shared SQLite Access for the NCAA Soccer Dashboard
+The web service and the weekly cron share one database file on the Render disk. Connections
+opened here use WAL journaling, so readers keep reading while an import writes, and a busy
+timeout, so lock contention waits instead of failing with "database is locked". They also get
+a memory map and a larger page cache for the read-heavy pages.
+
+Web workers read through a pool of read-only connections (read_pool_options); the ingest path
+writes through one long-lived writer connection per process (write_transaction).
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+# How long a connection waits for a lock before raising "database is locked"
+BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', '30000'))
+# Reads through the memory map skip copying pages into the page cache
+MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)))
+# Page cache per connection in KiB (SQLite reads a negative cache_size as KiB)
+CACHE_SIZE_KIB = int(os.getenv('SQLITE_CACHE_SIZE_KIB', str(32 * 1024)))
+# Read-only connections kept open per web process, and how many more a burst may open
+READ_POOL_SIZE = int(os.getenv('SQLITE_READ_POOL_SIZE', '5'))
+READ_POOL_OVERFLOW = int(os.getenv('SQLITE_READ_POOL_OVERFLOW', '10'))
+
+
+def default_db_path():
+    return os.getenv('NCAA_DB_PATH', 'data/ncaa_soccer.db')
+
+
+def apply_pragmas(conn):
+    """Per-connection settings (none of them persist in the database file)"""
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+    conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KIB}")
+    return conn
+
+
+def connect(db_path=None, check_same_thread=True):
+    """Read-write connection; a drop-in for sqlite3.connect that also switches the file to WAL"""
+    conn = sqlite3.connect(db_path or default_db_path(), timeout=BUSY_TIMEOUT_MS / 1000,
+                           check_same_thread=check_same_thread)
+    apply_pragmas(conn)
+    # WAL is recorded in the file, so read-only connections opened later use it too
+    conn.execute("PRAGMA journal_mode=WAL")
+    # NORMAL is durable in WAL mode except for the last commit on power loss
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def connect_readonly(db_path=None, check_same_thread=True):
+    """Read-only connection (mode=ro): a stray write raises instead of taking the write lock"""
+    uri = Path(os.path.abspath(db_path or default_db_path())).as_uri() + '?mode=ro'
+    conn = sqlite3.connect(uri, uri=True, timeout=BUSY_TIMEOUT_MS / 1000,
+                           check_same_thread=check_same_thread)
+    return apply_pragmas(conn)
+
+
+def read_pool_options(db_path=None):
+    """SQLALCHEMY_ENGINE_OPTIONS for a pool of read-only connections shared by request threads"""
+    db_path = db_path or default_db_path()
+    return {
+        # A pooled connection is used by one request thread at a time, but not always the same one
+        'creator': lambda: connect_readonly(db_path, check_same_thread=False),
+        'pool_size': READ_POOL_SIZE,
+        'max_overflow': READ_POOL_OVERFLOW,
+        'pool_timeout': BUSY_TIMEOUT_MS / 1000,
+    }
+
+
+class Writer:
+    """A process's one write connection to a database; `lock` serializes its transactions"""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.pid = os.getpid()
+        self.conn = connect(db_path, check_same_thread=False)
+        # Transactions are issued explicitly by write_transaction
+        self.conn.isolation_level = None
+        self.lock = threading.RLock()
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def get_writer(db_path=None):
+    """The long-lived Writer for db_path, opened on first use (and again in a forked child)"""
+    key = os.path.abspath(db_path or default_db_path())
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None or writer.pid != os.getpid():
+            writer = _writers[key] = Writer(key)
+        return writer
+
+
+@contextmanager
+def write_transaction(db_path=None):
+    """BEGIN IMMEDIATE ... COMMIT on the shared writer, rolled back if the block raises.
+
+    Taking the write lock up front means a transaction that reads before it writes cannot hit
+    SQLITE_BUSY halfway through, which busy_timeout does not retry.
+    """
+    writer = get_writer(db_path)
+    with writer.lock:
+        conn = writer.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+
+def close_writers():
+    """Close every writer this process opened"""
+    with _writers_lock:
+        for writer in _writers.values():
+            if writer.pid == os.getpid():
+                writer.conn.close()
+        _writers.clear()
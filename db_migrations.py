@@ -0,0 +1,486 @@
+"""
+Versioned Schema Migrations for NCAA Soccer Dashboard
+Applies numbered schema changes once per database and records them in schema_migrations.
+Safe to run on every app start and cron run.
+"""
+
+import os
+import sqlite3
+
+from db_access import connect
+
+
+def _add_column(cursor, table, column, definition):
+    """ALTER TABLE ADD COLUMN that tolerates the column already existing"""
+    try:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    except sqlite3.OperationalError as e:
+        if "duplicate column name" not in str(e):
+            raise e
+
+
+def migration_001_season_tracking(cursor):
+    """Season/date tracking schema from setup_season_tracking.py, without resetting existing rows"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS players (
+            name TEXT,
+            team TEXT,
+            position TEXT,
+            minutes_played BIGINT,
+            goals BIGINT,
+            assists BIGINT,
+            shots BIGINT,
+            shots_on_target BIGINT,
+            fouls_won BIGINT
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS matches (
+            home_team TEXT,
+            home_team_score BIGINT,
+            away_team TEXT,
+            away_team_score BIGINT,
+            home_team_conference TEXT,
+            away_team_conference TEXT
+        )
+    """)
+    _add_column(cursor, 'players', 'conference', 'TEXT')
+    _add_column(cursor, 'players', 'season', "TEXT DEFAULT '2024'")
+    _add_column(cursor, 'players', 'data_date', "TEXT DEFAULT '2024-12-31'")
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS data_snapshots (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            season TEXT NOT NULL,
+            snapshot_date TEXT NOT NULL,
+            description TEXT,
+            file_path TEXT,
+            total_players INTEGER,
+            total_games INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            is_current BOOLEAN DEFAULT FALSE,
+            UNIQUE(season, snapshot_date)
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS player_stats_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            player_name TEXT NOT NULL,
+            team TEXT NOT NULL,
+            season TEXT NOT NULL,
+            snapshot_date TEXT NOT NULL,
+            position TEXT,
+            minutes_played INTEGER,
+            goals INTEGER,
+            assists INTEGER,
+            shots INTEGER,
+            shots_on_target INTEGER,
+            fouls_won INTEGER,
+            conference TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (season, snapshot_date) REFERENCES data_snapshots(season, snapshot_date)
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS seasons (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            season TEXT UNIQUE NOT NULL,
+            display_name TEXT NOT NULL,
+            start_date TEXT,
+            end_date TEXT,
+            is_active BOOLEAN DEFAULT FALSE,
+            data_collection_active BOOLEAN DEFAULT FALSE
+        )
+    """)
+    # INSERT OR IGNORE so an already activated season keeps its flags
+    cursor.execute("""
+        INSERT OR IGNORE INTO seasons
+        (season, display_name, start_date, end_date, is_active, data_collection_active)
+        VALUES
+        ('2024', '2024-25 Season', '2024-08-22', '2024-12-16', FALSE, FALSE),
+        ('2025', '2025-26 Season', '2025-08-15', '2025-12-15', FALSE, FALSE)
+    """)
+
+
+def migration_002_secondary_indexes(cursor):
+    """Covering indexes for the players/matches access paths used by ncaa_app.py"""
+    # Profile lookups and name-ordered listings
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_players_name ON players(name)")
+    # Team filter, team dropdown and rosters ordered by minutes
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_players_team ON players(team, minutes_played, goals)")
+    # Position and conference filters, ordered by goals
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_players_position ON players(position, goals)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_players_conference ON players(conference, goals)")
+    # Snapshot selection
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_players_season_date ON players(season, data_date)")
+    # Default goals sort and top scorers
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_players_goals ON players(goals, name, team, assists)")
+    # Unfiltered listing counts (minutes_played >= 250)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_players_minutes ON players(minutes_played, name, team)")
+
+    # Team match lookups and standings aggregation
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_matches_home ON matches(home_team, home_team_score, away_team_score)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_matches_away ON matches(away_team, away_team_score, home_team_score)")
+    # High-scoring matches on the home page
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_matches_total_goals ON matches((home_team_score + away_team_score))")
+
+    # Active season lookup for /api/season-status
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_seasons_active ON seasons(is_active)")
+
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_history_snapshot
+        ON player_stats_history(season, snapshot_date)
+    """)
+
+
+def migration_003_incremental_ingestion(cursor):
+    """Per-game player lines and the ledger of ingested games for incremental collection"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS player_game_stats (
+            game_id TEXT NOT NULL,
+            season TEXT NOT NULL,
+            game_date TEXT,
+            name TEXT NOT NULL,
+            team TEXT NOT NULL,
+            position TEXT,
+            minutes_played INTEGER DEFAULT 0,
+            goals INTEGER DEFAULT 0,
+            assists INTEGER DEFAULT 0,
+            shots INTEGER DEFAULT 0,
+            shots_on_target INTEGER DEFAULT 0,
+            fouls_won INTEGER DEFAULT 0,
+            PRIMARY KEY (game_id, name, team)
+        )
+    """)
+    # Season roster per team (name resolution) and per-player lines (position re-derivation)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_game_stats_player
+        ON player_game_stats(season, team, name)
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS ingested_games (
+            game_id TEXT PRIMARY KEY,
+            season TEXT NOT NULL,
+            game_date TEXT,
+            player_lines INTEGER,
+            ingested_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_ingested_games_season
+        ON ingested_games(season, game_date)
+    """)
+
+
+def migration_004_name_resolutions(cursor):
+    """Memo of fuzzy-resolved player names, replayed in first-seen order by NameResolver"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS name_resolutions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            variant TEXT UNIQUE NOT NULL,
+            canonical TEXT NOT NULL,
+            matched_name TEXT,
+            score REAL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def migration_005_player_ratings(cursor):
+    """Computed MAX/overall ratings per players snapshot, filled by ratings_table.py"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS player_ratings (
+            name TEXT NOT NULL,
+            team TEXT NOT NULL,
+            season TEXT NOT NULL,
+            data_date TEXT NOT NULL,
+            max_rating REAL,
+            overall_rating REAL,
+            PRIMARY KEY (name, team, season, data_date)
+        )
+    """)
+    # Per-snapshot refreshes and rating-ordered listings
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_player_ratings_snapshot
+        ON player_ratings(season, data_date, max_rating)
+    """)
+
+
+def migration_006_app_state(cursor):
+    """Key/value state shared by writers and the web app; holds the data_version counter"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS app_state (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    cursor.execute("INSERT OR IGNORE INTO app_state (key, value) VALUES ('data_version', 1)")
+
+
+def migration_007_player_search(cursor):
+    """FTS5 index over player name, team and conference for the search box and /api/search"""
+    cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS players_fts USING fts5(
+            name, team, conference,
+            content='players', content_rowid='rowid',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+    """)
+    cursor.execute("INSERT INTO players_fts(players_fts) VALUES('rebuild')")
+
+
+def migration_008_team_standings(cursor):
+    """Materialized standings per snapshot, plus triggers that mark teams whose matches changed"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS team_standings (
+            season TEXT NOT NULL,
+            snapshot_date TEXT NOT NULL,
+            team TEXT NOT NULL,
+            games_played INTEGER,
+            wins INTEGER,
+            draws INTEGER,
+            losses INTEGER,
+            goals_for INTEGER,
+            goals_against INTEGER,
+            goal_difference INTEGER,
+            points INTEGER,
+            att_rating REAL,
+            def_rating REAL,
+            max_rating REAL,
+            PRIMARY KEY (season, snapshot_date, team)
+        )
+    """)
+    # The /teams table order
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_team_standings_rank
+        ON team_standings(season, snapshot_date, points DESC, goal_difference DESC, goals_for DESC)
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS team_standings_dirty (
+            team TEXT PRIMARY KEY NOT NULL
+        )
+    """)
+    # OR IGNORE also skips NULL team names
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS matches_standings_insert AFTER INSERT ON matches
+        BEGIN
+            INSERT OR IGNORE INTO team_standings_dirty (team) VALUES (NEW.home_team), (NEW.away_team);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS matches_standings_update AFTER UPDATE ON matches
+        BEGIN
+            INSERT OR IGNORE INTO team_standings_dirty (team)
+            VALUES (OLD.home_team), (OLD.away_team), (NEW.home_team), (NEW.away_team);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS matches_standings_delete AFTER DELETE ON matches
+        BEGIN
+            INSERT OR IGNORE INTO team_standings_dirty (team) VALUES (OLD.home_team), (OLD.away_team);
+        END
+    """)
+
+
+def migration_009_match_events(cursor):
+    """Typed play-by-play events per game, parsed once at collection time"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS match_events (
+            game_id TEXT NOT NULL,
+            season TEXT NOT NULL,
+            game_date TEXT,
+            sequence INTEGER NOT NULL,
+            period INTEGER,
+            clock TEXT,
+            home_team TEXT,
+            away_team TEXT,
+            side TEXT,
+            team TEXT,
+            event_type TEXT NOT NULL,
+            player TEXT,
+            home_score INTEGER,
+            away_score INTEGER,
+            description TEXT,
+            PRIMARY KEY (game_id, sequence)
+        )
+    """)
+    # Season and team totals by event type (goals, fouls, corners, ...)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_match_events_team
+        ON match_events(season, team, event_type)
+    """)
+    # A player's events, e.g. fouls won per player
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_match_events_player
+        ON match_events(season, player, event_type)
+    """)
+
+
+def migration_010_jobs(cursor):
+    """Background jobs (admin-triggered collections) with their status and per-stage progress"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            season TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'queued',
+            params TEXT,
+            progress TEXT,
+            error TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            started_at TIMESTAMP,
+            finished_at TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    # At most one queued or running job per kind and season, across every web worker
+    cursor.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_active
+        ON jobs(kind, season) WHERE status IN ('queued', 'running')
+    """)
+
+
+def migration_011_player_history(cursor):
+    """Delta-encoded player history; player_stats_history becomes a view over it"""
+    from player_history import HISTORY_COLUMNS, OPEN_ENDED, append_history_snapshot
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS player_history (
+            season TEXT NOT NULL,
+            player_name TEXT NOT NULL,
+            team TEXT NOT NULL,
+            valid_from TEXT NOT NULL,
+            valid_to TEXT NOT NULL,
+            position TEXT,
+            minutes_played INTEGER,
+            goals INTEGER,
+            assists INTEGER,
+            shots INTEGER,
+            shots_on_target INTEGER,
+            fouls_won INTEGER,
+            conference TEXT
+        )
+    """)
+    # Each player's one open version; only open versions are looked up by name when writing,
+    # so closed versions stay out of this index
+    cursor.execute(f"""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_player_history_open
+        ON player_history(season, player_name, team) WHERE valid_to = '{OPEN_ENDED}'
+    """)
+    # As-of reads: versions still valid after a date, then those that started by it
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_player_history_asof
+        ON player_history(season, valid_to, valid_from)
+    """)
+
+    # Re-encode the stored full copies oldest first; snapshots recorded only in players seed it
+    columns = ', '.join(HISTORY_COLUMNS)
+    conn = cursor.connection
+    snapshots = conn.execute("""
+        SELECT season, snapshot_date FROM player_stats_history
+        UNION
+        SELECT season, data_date FROM players
+        WHERE (season, data_date) IN (SELECT season, snapshot_date FROM data_snapshots)
+        ORDER BY 1, 2
+    """).fetchall()
+    for season, snapshot_date in snapshots:
+        rows = conn.execute(f"""
+            SELECT player_name, team, {columns} FROM player_stats_history
+            WHERE season = ? AND snapshot_date = ?
+            ORDER BY id
+        """, (season, snapshot_date)).fetchall()
+        if not rows:
+            rows = conn.execute(f"""
+                SELECT name, team, {columns} FROM players
+                WHERE season = ? AND data_date = ? AND name IS NOT NULL AND team IS NOT NULL
+                ORDER BY rowid
+            """, (season, snapshot_date)).fetchall()
+        append_history_snapshot(conn, season, snapshot_date, rows)
+
+    cursor.execute("DROP TABLE player_stats_history")
+    cursor.execute("""
+        CREATE VIEW player_stats_history AS
+        SELECT player_history.player_name, player_history.team,
+               data_snapshots.season, data_snapshots.snapshot_date,
+               player_history.position, player_history.minutes_played, player_history.goals,
+               player_history.assists, player_history.shots, player_history.shots_on_target,
+               player_history.fouls_won, player_history.conference
+        FROM data_snapshots
+        JOIN player_history
+            ON player_history.season = data_snapshots.season
+            AND player_history.valid_to > data_snapshots.snapshot_date
+            AND player_history.valid_from <= data_snapshots.snapshot_date
+    """)
+
+
+# Ordered list of (version, description, function); append new migrations at the end
+MIGRATIONS = [
+    (1, 'season tracking schema', migration_001_season_tracking),
+    (2, 'secondary indexes', migration_002_secondary_indexes),
+    (3, 'incremental ingestion tables', migration_003_incremental_ingestion),
+    (4, 'name resolution memo', migration_004_name_resolutions),
+    (5, 'player ratings table', migration_005_player_ratings),
+    (6, 'app state and data version', migration_006_app_state),
+    (7, 'player full-text search', migration_007_player_search),
+    (8, 'materialized team standings', migration_008_team_standings),
+    (9, 'play-by-play events', migration_009_match_events),
+    (10, 'background jobs', migration_010_jobs),
+    (11, 'delta-encoded player history', migration_011_player_history),
+]
+
+
+def get_schema_version(conn):
+    """Highest applied migration version (0 for a fresh database)"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    row = conn.execute("SELECT MAX(version) FROM schema_migrations").fetchone()
+    return row[0] or 0
+
+
+def run_migrations(db_path=None, verbose=True):
+    """Apply any pending migrations; returns the resulting schema version"""
+    db_path = db_path or os.getenv('NCAA_DB_PATH', 'data/ncaa_soccer.db')
+    # Also switches the file to WAL before the web workers open their read-only connections
+    conn = connect(db_path)
+    # Manage transactions explicitly so each migration commits atomically with its version row
+    conn.isolation_level = None
+    cursor = conn.cursor()
+
+    try:
+        current = get_schema_version(conn)
+        for version, description, migrate in MIGRATIONS:
+            if version <= current:
+                continue
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                # Another process may have applied it while we waited for the write lock
+                if get_schema_version(conn) >= version:
+                    cursor.execute("COMMIT")
+                    continue
+                migrate(cursor)
+                cursor.execute(
+                    "INSERT INTO schema_migrations (version, description) VALUES (?, ?)",
+                    (version, description)
+                )
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+            if verbose:
+                print(f"✅ Applied migration {version:03d}: {description}")
+            current = version
+        return current
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    import sys
+    path = sys.argv[1] if len(sys.argv) > 1 else None
+    version = run_migrations(path)
+    print(f"ℹ️  Schema version: {version}")
@@ -0,0 +1,90 @@
+"""
+On-disk HTTP Response Cache for the NCAA data collector
+Stores JSON/HTML payloads under a hash of their cache key (e.g. game id + endpoint).
+Final payloads are kept permanently; everything else expires after a TTL and is
+revalidated with ETag / Last-Modified when the server supports it.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+
+def default_cache_dir():
+    """Keep the cache next to the database so it lives on the persistent disk"""
+    db_path = os.getenv('NCAA_DB_PATH', 'data/ncaa_soccer.db')
+    return os.getenv('NCAA_HTTP_CACHE_DIR', os.path.join(os.path.dirname(db_path) or '.', 'http_cache'))
+
+
+class HTTPResponseCache:
+    """File-per-key response cache with permanent and TTL entries"""
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or default_cache_dir()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def path_for(self, key):
+        """Hash the key into a two-level directory layout"""
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}.json")
+
+    def get(self, key):
+        """Return the stored entry for a key, or None"""
+        path = self.path_for(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # Guard against hash collisions and half-written files from older versions
+        if entry.get('key') != key:
+            return None
+        return entry
+
+    def put(self, key, url, body, final=False, etag=None, last_modified=None):
+        """Store a payload atomically (write to a temp file, then rename)"""
+        entry = {
+            'key': key,
+            'url': url,
+            'stored_at': time.time(),
+            'final': bool(final),
+            'etag': etag,
+            'last_modified': last_modified,
+            'body': body,
+        }
+        path = self.path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except Exception:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        return entry
+
+    def touch(self, entry):
+        """Mark a revalidated (304) entry as fresh again"""
+        return self.put(entry['key'], entry['url'], entry['body'], entry['final'],
+                        entry.get('etag'), entry.get('last_modified'))
+
+    def is_fresh(self, entry, ttl):
+        """Final entries never expire; others are fresh for ttl seconds"""
+        if entry.get('final'):
+            return True
+        return ttl is not None and time.time() - entry.get('stored_at', 0) < ttl
+
+    def validators(self, entry):
+        """Conditional request headers for revalidating an entry"""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
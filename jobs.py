@@ -0,0 +1,199 @@
+"""
+Background Jobs for the NCAA Soccer Dashboard
+Long admin tasks (a 7-day scrape and import) run on a worker thread instead of inside the
+HTTP request. Each job is a row in jobs with its status and per-stage progress, so any web
+worker can report on it. Triggering a kind and season that already has a queued or running
+job returns that job instead of starting a second one.
+"""
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+from db_access import connect_readonly, default_db_path, write_transaction
+
+# A queued or running job with no progress for this long is assumed dead (its web worker
+# was restarted) and stops blocking new triggers
+STALE_AFTER_MINUTES = int(os.getenv('JOB_STALE_MINUTES', '30'))
+# Progress is written at most this often while a stage is advancing
+FLUSH_INTERVAL = 1.0
+
+JOB_COLUMNS = ['id', 'kind', 'season', 'status', 'params', 'progress', 'error',
+               'created_at', 'started_at', 'finished_at', 'updated_at']
+
+
+def utc_now():
+    """UTC timestamp in SQLite's CURRENT_TIMESTAMP format"""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+
+class JobProgress:
+    """Per-stage counters and timings for one job, saved to jobs.progress as they change"""
+
+    def __init__(self, db_path, job_id, flush_interval=FLUSH_INTERVAL):
+        self.db_path = db_path
+        self.job_id = job_id
+        self.flush_interval = flush_interval
+        self.stages = {}
+        self._started = {}
+        self._last_flush = 0.0
+        self._lock = threading.Lock()
+
+    def start(self, stage, total=None):
+        with self._lock:
+            self.stages[stage] = {'done': 0, 'total': total, 'started_at': utc_now(),
+                                  'seconds': 0.0, 'finished': False}
+            self._started[stage] = time.perf_counter()
+        self.flush(force=True)
+
+    def advance(self, stage, count=1):
+        with self._lock:
+            entry = self.stages[stage]
+            entry['done'] += count
+            entry['seconds'] = round(time.perf_counter() - self._started[stage], 3)
+        self.flush()
+
+    def finish(self, stage):
+        with self._lock:
+            entry = self.stages[stage]
+            entry['seconds'] = round(time.perf_counter() - self._started[stage], 3)
+            entry['finished'] = True
+        self.flush(force=True)
+
+    def to_json(self):
+        with self._lock:
+            return json.dumps(self.stages)
+
+    def flush(self, force=False):
+        """Write the counters unless the last write was under flush_interval ago"""
+        now = time.perf_counter()
+        if not force and now - self._last_flush < self.flush_interval:
+            return
+        self._last_flush = now
+        try:
+            with write_transaction(self.db_path) as conn:
+                conn.execute("""
+                    UPDATE jobs SET progress = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?
+                """, (self.to_json(), self.job_id))
+        except sqlite3.Error as e:
+            # Progress is informational; failing to record it must not fail the job
+            print(f"⚠️  Could not record progress for job {self.job_id}: {e}")
+
+
+class JobRunner:
+    """Queues jobs in the jobs table and runs them one at a time on a background thread"""
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or default_db_path()
+        self._queue = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+        # Jobs this runner has queued and not yet finished; they are alive however long they wait
+        self._pending = set()
+
+    def submit(self, kind, season, target, params=None):
+        """Queue target(progress, **params) as a job; returns (job id, created).
+
+        If the kind and season already have a queued or running job, that job's id is
+        returned with created=False and nothing new is queued.
+        """
+        params = params or {}
+        with self._lock:
+            pending = list(self._pending)
+        with write_transaction(self.db_path) as conn:
+            # A job whose worker died would otherwise block this kind and season forever. This
+            # runner's own jobs are skipped: one queued behind a long job is waiting, not dead
+            conn.execute(f"""
+                UPDATE jobs
+                SET status = 'failed', error = 'abandoned: no progress recorded',
+                    finished_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+                WHERE status IN ('queued', 'running') AND updated_at < datetime('now', ?)
+                  AND id NOT IN ({', '.join('?' * len(pending))})
+            """, [f'-{STALE_AFTER_MINUTES} minutes'] + pending)
+            row = conn.execute("""
+                SELECT id FROM jobs WHERE kind = ? AND season = ? AND status IN ('queued', 'running')
+            """, (kind, season)).fetchone()
+            if row:
+                return row[0], False
+            job_id = conn.execute("""
+                INSERT INTO jobs (kind, season, params) VALUES (?, ?, ?)
+            """, (kind, season, json.dumps(params))).lastrowid
+
+        with self._lock:
+            self._pending.add(job_id)
+        self._queue.put((job_id, target, params))
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._work, name='job-runner', daemon=True)
+                self._worker.start()
+        print(f"📋 Queued {kind} job {job_id} for {season}")
+        return job_id, True
+
+    def _work(self):
+        while True:
+            job_id, target, params = self._queue.get()
+            try:
+                self.run(job_id, target, params)
+            finally:
+                with self._lock:
+                    self._pending.discard(job_id)
+                self._queue.task_done()
+
+    def run(self, job_id, target, params):
+        """Run one job on the calling thread and record how it ended"""
+        with write_transaction(self.db_path) as conn:
+            started_job = conn.execute("""
+                UPDATE jobs SET status = 'running', started_at = CURRENT_TIMESTAMP,
+                                updated_at = CURRENT_TIMESTAMP
+                WHERE id = ? AND status = 'queued'
+            """, (job_id,)).rowcount
+        # Another process gave up on it (and may have queued a replacement)
+        if not started_job:
+            print(f"⚠️  Job {job_id} is no longer queued; skipping it")
+            return
+
+        progress = JobProgress(self.db_path, job_id)
+        started = time.perf_counter()
+        status, error = 'succeeded', None
+        try:
+            if not target(progress, **params):
+                status, error = 'failed', 'job reported failure'
+        except Exception as e:
+            status, error = 'failed', f"{type(e).__name__}: {e}"
+
+        with write_transaction(self.db_path) as conn:
+            conn.execute("""
+                UPDATE jobs SET status = ?, error = ?, progress = ?,
+                                finished_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            """, (status, error, progress.to_json(), job_id))
+        icon = '✅' if status == 'succeeded' else '❌'
+        print(f"{icon} Job {job_id} {status} in {time.perf_counter() - started:.1f}s" + (f": {error}" if error else ""))
+
+    def join(self):
+        """Block until every queued job has finished"""
+        self._queue.join()
+
+    def get(self, job_id):
+        """A job as a dict with parsed params and progress, or None"""
+        conn = connect_readonly(self.db_path)
+        try:
+            row = conn.execute(f"""
+                SELECT {', '.join(JOB_COLUMNS)},
+                       (julianday(COALESCE(finished_at, CURRENT_TIMESTAMP)) - julianday(started_at)) * 86400
+                FROM jobs WHERE id = ?
+            """, (job_id,)).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+
+        job = dict(zip(JOB_COLUMNS, row))
+        job['params'] = json.loads(job['params'] or '{}')
+        job['progress'] = json.loads(job['progress'] or '{}')
+        job['seconds'] = round(row[-1]) if row[-1] is not None else None
+        return job
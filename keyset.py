@@ -0,0 +1,60 @@
+"""
+Keyset Pagination Helpers
+Opaque page cursors and the WHERE/ORDER BY clauses that seek straight to the row after
+(or before) the cursor through an index, instead of skipping OFFSET rows on every page.
+"""
+
+import base64
+import hashlib
+import json
+
+
+def cursor_signature(*parts):
+    """Short fingerprint of the ordering and filters a cursor was issued for"""
+    return hashlib.sha1(json.dumps(parts, default=str).encode('utf-8')).hexdigest()[:12]
+
+
+def encode_cursor(values, page, direction, signature):
+    """Opaque token for the page after/before a row's ordering key"""
+    payload = json.dumps({'v': list(values), 'p': page, 'd': direction, 's': signature},
+                         separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token, signature):
+    """(values, page, direction) from a token, or None if it is malformed or for another ordering"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if payload['s'] != signature or payload['d'] not in ('next', 'prev'):
+            return None
+        return payload['v'], int(payload['p']), payload['d']
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def keyset_clause(columns, values, direction='next', prefix='k'):
+    """SQL condition, ORDER BY and params for rows strictly after (next) or before (prev) a key.
+
+    columns is a list of (expression, 'ASC' | 'DESC') giving a total order. 'prev' flips every
+    comparison and sort direction; reverse the fetched rows to restore display order.
+    """
+    params = {f'{prefix}{i}': value for i, value in enumerate(values)}
+    ascending = []
+    for _, order in columns:
+        is_asc = order.upper() == 'ASC'
+        ascending.append(is_asc if direction == 'next' else not is_asc)
+
+    # (c0 > k0) OR (c0 = k0 AND c1 > k1) OR ... with each > flipped for descending columns
+    terms = []
+    for i, (expression, _) in enumerate(columns):
+        equal = [f"{columns[j][0]} = :{prefix}{j}" for j in range(i)]
+        compare = f"{expression} {'>' if ascending[i] else '<'} :{prefix}{i}"
+        terms.append('(' + ' AND '.join(equal + [compare]) + ')')
+
+    # The inclusive bound on the leading column lets SQLite seek its index
+    leading = f"{columns[0][0]} {'>=' if ascending[0] else '<='} :{prefix}0"
+    condition = f"{leading} AND ({' OR '.join(terms)})"
+    order_by = ', '.join(f"{expression} {'ASC' if is_asc else 'DESC'}"
+                         for (expression, _), is_asc in zip(columns, ascending))
+    return condition, order_by, params
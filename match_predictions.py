@@ -0,0 +1,189 @@
+"""
+Match Prediction Engine for NCAA Soccer Dashboard
+Poisson scoreline model on team ATT/DEF ratings, vectorized with NumPy so a whole league of
+fixtures is priced in one pass. Team ratings come from the materialized team_standings table
+and predictions are memoized per data version, so repeat requests skip the model entirely.
+"""
+
+import math
+
+import numpy as np
+
+from app_state import VersionedCache
+
+# Home advantage factor (typically 1.1-1.3 in soccer)
+HOME_ADVANTAGE = 1.2
+# Typical college soccer average goals per team per game
+LEAGUE_AVG_GOALS = 1.5
+MIN_EXPECTED_GOALS = 0.1
+MAX_EXPECTED_GOALS = 5.0
+
+# Scorelines are modelled on a 0-5 goals grid for each side
+MAX_GOALS = 6
+GOALS = np.arange(MAX_GOALS)
+FACTORIALS = np.array([math.factorial(k) for k in range(MAX_GOALS)], dtype=float)
+# Grid cells where the home side (row) outscores the away side (column), and vice versa
+HOME_WIN_CELLS = np.tril(np.ones((MAX_GOALS, MAX_GOALS)), -1)
+AWAY_WIN_CELLS = np.triu(np.ones((MAX_GOALS, MAX_GOALS)), 1)
+
+# Ratings of every team in the newest standings snapshot
+TEAM_RATINGS_SQL = """
+    WITH latest AS (
+        SELECT season, snapshot_date FROM team_standings
+        ORDER BY season DESC, snapshot_date DESC
+        LIMIT 1
+    )
+    SELECT team, att_rating, def_rating, max_rating
+    FROM team_standings
+    JOIN latest USING (season, snapshot_date)
+    WHERE max_rating IS NOT NULL
+    ORDER BY team
+"""
+
+
+class TeamRatings:
+    """Team ATT/DEF/MAX ratings as aligned arrays plus a name -> position index"""
+
+    def __init__(self, rows):
+        rows = list(rows)
+        self.teams = [row[0] for row in rows]
+        self.index = {team: i for i, team in enumerate(self.teams)}
+        self.att = np.array([row[1] for row in rows], dtype=float)
+        self.def_ = np.array([row[2] for row in rows], dtype=float)
+        self.max = np.array([row[3] for row in rows], dtype=float)
+
+    def get_team(self, team_name):
+        """One team's ratings as a {'Team', 'ATT', 'DEF', 'MAX'} record, or None"""
+        i = self.index.get(team_name)
+        if i is None:
+            return None
+        return {'Team': team_name, 'ATT': float(self.att[i]), 'DEF': float(self.def_[i]), 'MAX': float(self.max[i])}
+
+
+def expected_goals(home_att, home_def, away_att, away_def):
+    """Home and away expected goals; accepts scalars or broadcastable arrays"""
+    # Expected goals = (Team ATT / League Avg ATT) * (Opponent DEF / League Avg DEF) * League Avg Goals * Home Advantage
+    home = np.clip(np.multiply(home_att, away_def) * LEAGUE_AVG_GOALS * HOME_ADVANTAGE,
+                   MIN_EXPECTED_GOALS, MAX_EXPECTED_GOALS)
+    away = np.clip(np.multiply(away_att, home_def) * LEAGUE_AVG_GOALS,
+                   MIN_EXPECTED_GOALS, MAX_EXPECTED_GOALS)
+    return home, away
+
+
+def poisson_pmf(lam):
+    """P(k goals) for k in 0..MAX_GOALS-1 along a new last axis"""
+    lam = np.asarray(lam, dtype=float)[..., None]
+    return np.exp(-lam) * lam ** GOALS / FACTORIALS
+
+
+def outcome_probabilities(home_lam, away_lam):
+    """Home win, draw and away win probabilities for arrays of fixtures.
+
+    Each fixture's scoreline grid is the outer product of the two PMFs; the outcome sums are
+    taken without materializing the grids and renormalized to the truncated grid's total.
+    """
+    home_pmf = poisson_pmf(home_lam)
+    away_pmf = poisson_pmf(away_lam)
+    home_win = ((home_pmf @ HOME_WIN_CELLS) * away_pmf).sum(axis=-1)
+    away_win = ((home_pmf @ AWAY_WIN_CELLS) * away_pmf).sum(axis=-1)
+    draw = (home_pmf * away_pmf).sum(axis=-1)
+    total = home_win + draw + away_win
+    return home_win / total, draw / total, away_win / total
+
+
+def prediction_matrix(ratings, home_teams=None, away_teams=None):
+    """Win/draw/loss probabilities for every home x away pairing as (home_win, draw, away_win) arrays"""
+    home = np.arange(len(ratings.teams)) if home_teams is None else np.array([ratings.index[t] for t in home_teams], dtype=int)
+    away = np.arange(len(ratings.teams)) if away_teams is None else np.array([ratings.index[t] for t in away_teams], dtype=int)
+    home_lam, away_lam = expected_goals(
+        ratings.att[home][:, None], ratings.def_[home][:, None],
+        ratings.att[away][None, :], ratings.def_[away][None, :],
+    )
+    return outcome_probabilities(home_lam, away_lam)
+
+
+def calculate_match_prediction(home_team, away_team):
+    """Calculate match prediction probabilities and expected scoreline"""
+    home_att = home_team['ATT']
+    home_def = home_team['DEF']
+    away_att = away_team['ATT']
+    away_def = away_team['DEF']
+
+    home_lam, away_lam = expected_goals(home_att, home_def, away_att, away_def)
+    home_expected_goals, away_expected_goals = float(home_lam), float(away_lam)
+
+    # Scoreline probabilities (0-5 goals each), normalized to the truncated grid
+    scoreline_matrix = np.outer(poisson_pmf(home_lam), poisson_pmf(away_lam))
+    scoreline_matrix /= scoreline_matrix.sum()
+
+    home_win_prob = float((scoreline_matrix * HOME_WIN_CELLS).sum())
+    away_win_prob = float((scoreline_matrix * AWAY_WIN_CELLS).sum())
+    draw_prob = float(np.trace(scoreline_matrix))
+
+    home_goals, away_goals = np.unravel_index(np.argmax(scoreline_matrix), scoreline_matrix.shape)
+    max_prob = float(scoreline_matrix[home_goals, away_goals])
+
+    # Under 2.5 is every scoreline with at most two goals in total
+    under_2_5 = float(scoreline_matrix[np.add.outer(GOALS, GOALS) <= 2].sum())
+    over_2_5 = 1 - under_2_5
+
+    return {
+        'home_team': home_team['Team'],
+        'away_team': away_team['Team'],
+        'home_team_rating': {
+            'att': round(home_att, 2),
+            'def': round(home_def, 2),
+            'max': round(home_team['MAX'], 1)
+        },
+        'away_team_rating': {
+            'att': round(away_att, 2),
+            'def': round(away_def, 2),
+            'max': round(away_team['MAX'], 1)
+        },
+        'probabilities': {
+            'home_win': round(home_win_prob * 100, 1),
+            'draw': round(draw_prob * 100, 1),
+            'away_win': round(away_win_prob * 100, 1)
+        },
+        'expected_goals': {
+            'home': round(home_expected_goals, 2),
+            'away': round(away_expected_goals, 2)
+        },
+        'most_likely_score': {
+            'home': int(home_goals),
+            'away': int(away_goals),
+            'probability': round(max_prob * 100, 1)
+        },
+        'over_under': {
+            'over_2_5': round(over_2_5 * 100, 1),
+            'under_2_5': round(under_2_5 * 100, 1)
+        },
+        'scoreline_matrix': [[round(prob * 100, 2) for prob in row] for row in scoreline_matrix.tolist()]
+    }
+
+
+class PredictionEngine:
+    """Team ratings and single-match predictions memoized for the current data version"""
+
+    def __init__(self, max_predictions=4096):
+        self._ratings = VersionedCache(max_entries=1)
+        self._predictions = VersionedCache(max_predictions)
+
+    def ratings(self, version, load_rows):
+        """TeamRatings for this data version; load_rows() returns TEAM_RATINGS_SQL rows on a miss"""
+        return self._ratings.get('ratings', version, lambda: TeamRatings(load_rows()))
+
+    def predict(self, version, load_rows, home_team, away_team):
+        """Prediction for one fixture, or None when either team has no ratings"""
+        def compute():
+            ratings = self.ratings(version, load_rows)
+            home, away = ratings.get_team(home_team), ratings.get_team(away_team)
+            if home is None or away is None:
+                return None
+            return calculate_match_prediction(home, away)
+
+        return self._predictions.get((home_team, away_team), version, compute)
+
+    def clear(self):
+        self._ratings.clear()
+        self._predictions.clear()
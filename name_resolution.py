@@ -0,0 +1,206 @@
+"""
+Fuzzy Name Resolution for NCAA player names
+Replaces the all-pairs extractOne loop with blocked candidate generation: only names
+sharing a token or a prefix key are scored, in batches with rapidfuzz cpdist.
+Resolved names are memoized in the name_resolutions table across collection runs.
+"""
+
+import os
+import re
+import sqlite3
+from bisect import bisect_left
+from collections import defaultdict
+
+import numpy as np
+import unidecode
+from rapidfuzz import process, fuzz
+
+from db_access import connect
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+
+def preprocess_name(name):
+    """Preprocess names for fuzzy matching (ASCII, stripped, lower case)"""
+    if not name:
+        return ""
+    return unidecode.unidecode(name).strip().lower()
+
+
+def blocking_keys(name):
+    """Candidate keys for a preprocessed name.
+
+    WRatio only exceeds 90 for names of similar length that are near-identical
+    strings or share their tokens, so nearly all such pairs have a whole token,
+    the first three letters (ignoring spaces and punctuation) or the first three
+    letters of the last token in common. The keys are a heuristic, not a proof:
+    a pair with a typo in every one of those places is never compared.
+    """
+    tokens = TOKEN_PATTERN.findall(name)
+    keys = {f"t:{token}" for token in tokens if len(token) > 1}
+    compact = ''.join(tokens)
+    if compact:
+        keys.add(f"p:{compact[:3]}")
+    # Catches a typo in the first letter ("xhristopher williamsom")
+    if len(tokens) > 1:
+        keys.add(f"l:{tokens[-1][:3]}")
+    return keys
+
+
+class NameResolver:
+    """Greedy fuzzy name resolution over blocked candidates.
+
+    Names are resolved in first-seen order. Each new name maps to the canonical
+    name of its best-scoring earlier name (WRatio above the threshold, ties going
+    to the earliest), the rule create_name_mapping applied against every earlier
+    name, but only earlier names sharing a blocking key are scored, so a match
+    the keys miss is resolved as a new name. Earlier names include all names
+    memoized by previous runs.
+    """
+
+    def __init__(self, db_path=None, similarity_threshold=90, batch_size=100000, use_db=True):
+        self.db_path = db_path or os.getenv('NCAA_DB_PATH', 'data/ncaa_soccer.db')
+        self.similarity_threshold = similarity_threshold
+        self.batch_size = batch_size
+        self.use_db = use_db
+        self.names = []
+        self.position = {}
+        self.canonical = {}
+        self.blocks = defaultdict(list)
+        self._loaded = False
+
+    def _append(self, name, canonical=None):
+        """Register a name at the next position and index it under its blocking keys"""
+        position = len(self.names)
+        self.names.append(name)
+        self.position[name] = position
+        if canonical is not None:
+            self.canonical[name] = canonical
+        for key in blocking_keys(name):
+            self.blocks[key].append(position)
+        return position
+
+    def _connect(self):
+        """Connection to the memo table, or None when there is no migrated database"""
+        if not self.use_db or not os.path.exists(self.db_path):
+            return None
+        conn = connect(self.db_path)
+        try:
+            conn.execute("SELECT 1 FROM name_resolutions LIMIT 1")
+        except sqlite3.OperationalError:
+            conn.close()
+            return None
+        return conn
+
+    def load(self):
+        """Load names resolved by earlier runs, in the order they were first seen"""
+        if self._loaded:
+            return
+        self._loaded = True
+        conn = self._connect()
+        if conn is None:
+            return
+        try:
+            for variant, canonical in conn.execute("SELECT variant, canonical FROM name_resolutions ORDER BY id"):
+                if variant not in self.position:
+                    self._append(variant, canonical)
+        finally:
+            conn.close()
+
+    def candidate_pairs(self, start):
+        """(row, col) position pairs with col < row sharing a blocking key, for rows >= start"""
+        rows = []
+        cols = []
+        for row in range(start, len(self.names)):
+            earlier = set()
+            for key in blocking_keys(self.names[row]):
+                block = self.blocks[key]
+                earlier.update(block[:bisect_left(block, row)])
+            rows.extend([row] * len(earlier))
+            cols.extend(earlier)
+        return np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64)
+
+    def best_earlier_matches(self, start):
+        """Best earlier match for each row >= start scoring above the threshold; -1 / 0.0 when none does"""
+        count = len(self.names) - start
+        best_position = np.full(count, -1, dtype=np.int64)
+        best_score = np.zeros(count)
+        rows, cols = self.candidate_pairs(start)
+
+        # WRatio caps at 90 when one name is 1.5x longer than the other, so those pairs can never match
+        lengths = np.fromiter((len(name) for name in self.names), dtype=np.int64, count=len(self.names))
+        longer = np.maximum(lengths[rows], lengths[cols])
+        shorter = np.minimum(lengths[rows], lengths[cols])
+        keep = longer < 1.5 * shorter
+        rows, cols = rows[keep], cols[keep]
+        if len(rows) == 0:
+            return best_position, best_score
+
+        # Scores below the cutoff come back as 0, which is all the greedy rule needs to know
+        names = np.array(self.names, dtype=object)
+        scores = np.empty(len(rows))
+        for offset in range(0, len(rows), self.batch_size):
+            chunk = slice(offset, offset + self.batch_size)
+            scores[chunk] = process.cpdist(
+                names[rows[chunk]], names[cols[chunk]],
+                scorer=fuzz.WRatio, score_cutoff=self.similarity_threshold,
+                workers=-1, dtype=np.float64
+            )
+
+        # Only scores above the threshold can decide a mapping
+        matched = scores > self.similarity_threshold
+        rows, cols, scores = rows[matched], cols[matched], scores[matched]
+
+        # Per row: highest score first, earliest position among ties
+        order = np.lexsort((cols, -scores, rows))
+        unique_rows, first = np.unique(rows[order], return_index=True)
+        best_position[unique_rows - start] = cols[order][first]
+        best_score[unique_rows - start] = scores[order][first]
+        return best_position, best_score
+
+    def resolve(self, *name_lists):
+        """Mapping of every preprocessed name to its standardized name"""
+        self.load()
+        processed = [preprocess_name(name) for names in name_lists for name in names]
+
+        start = len(self.names)
+        for name in dict.fromkeys(processed):
+            if name not in self.position:
+                self._append(name)
+
+        if len(self.names) > start:
+            best_position, best_score = self.best_earlier_matches(start)
+            new_entries = []
+            for offset, (position, score) in enumerate(zip(best_position, best_score)):
+                name = self.names[start + offset]
+                if position >= 0 and score > self.similarity_threshold:
+                    self.canonical[name] = self.canonical[self.names[position]]
+                    new_entries.append((name, self.canonical[name], self.names[position], float(score)))
+                else:
+                    self.canonical[name] = name
+                    new_entries.append((name, name, None, None))
+            self.save(new_entries)
+
+        return {name: self.canonical[name] for name in processed}
+
+    def save(self, entries):
+        """Memoize newly resolved names for later runs"""
+        conn = self._connect()
+        if conn is None:
+            return
+        try:
+            conn.executemany("""
+                INSERT OR IGNORE INTO name_resolutions (variant, canonical, matched_name, score)
+                VALUES (?, ?, ?, ?)
+            """, entries)
+            conn.commit()
+        except sqlite3.OperationalError as e:
+            # A locked database only costs re-resolving these names next run
+            print(f"⚠️  Could not memoize name resolutions: {e}")
+        finally:
+            conn.close()
+
+
+def build_name_mapping(*name_lists, similarity_threshold=90):
+    """One-off mapping without the database memo"""
+    return NameResolver(similarity_threshold=similarity_threshold, use_db=False).resolve(*name_lists)
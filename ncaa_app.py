@@ -1,30 +1,93 @@
-from flask import Flask, jsonify, render_template, request
+from flask import Flask, jsonify, render_template, request, url_for
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+import importlib.util
 import os
+from functools import partial
+import threading
 from urllib.parse import unquote
 import math
 
-# Try to import player ratings - handle gracefully if it fails
-try:
-    from player_ratings import get_player_rating_data, get_team_max_ratings
-    RATINGS_AVAILABLE = True
-except ImportError as e:
-    print(f"Warning: Player ratings module not available: {e}")
-    RATINGS_AVAILABLE = False
-    
-    # Create dummy functions
-    def get_player_rating_data(player_name):
+import numpy as np
+
+from app_state import DATA_VERSION_SQL, VersionedCache
+from keyset import cursor_signature, decode_cursor, encode_cursor, keyset_clause
+from match_predictions import TEAM_RATINGS_SQL, PredictionEngine, prediction_matrix
+from player_history import AS_OF_SQL
+from player_search import PLAYER_SEARCH_SQL, build_match_query
+from response_cache import ResponseCache, create_backend
+from db_access import read_pool_options
+from jobs import JobRunner
+
+# player_ratings pulls in pandas (and matplotlib for PNG radars), so it is imported on first
+# use; the SQL-only pages never load it
+RATINGS_AVAILABLE = all(importlib.util.find_spec(name) is not None for name in ('pandas', 'numpy'))
+if not RATINGS_AVAILABLE:
+    print("Warning: Player ratings not available: pandas/numpy are not installed")
+
+def get_player_rating_data(player_name, generate_chart=True, team=None):
+    """Player rating row and radar chart, loading the ratings pipeline on first call"""
+    if not RATINGS_AVAILABLE:
         return None
-    
-    def get_team_max_ratings():
-        return []
+    from player_ratings import get_player_rating_data as load_player_rating_data
+    return load_player_rating_data(player_name, generate_chart=generate_chart, team=team)
+
+def get_ratings_store():
+    from ratings_store import get_ratings_store as load_ratings_store
+    return load_ratings_store()
 
 app = Flask(__name__)
 
 # Create necessary directories
 os.makedirs('static/radars', exist_ok=True)
 
+# Build the player ratings table in the background once the first response has gone out, so
+# the first profile view is fast without holding up a cold start (RATINGS_WARMUP=0 disables)
+ratings_warmup = threading.Event()
+
+@app.after_request
+def warm_ratings_after_first_response(response):
+    if RATINGS_AVAILABLE and os.getenv('RATINGS_WARMUP', '1') != '0' and not ratings_warmup.is_set():
+        ratings_warmup.set()
+        response.call_on_close(
+            lambda: threading.Thread(target=lambda: get_ratings_store().warm(), daemon=True).start()
+        )
+    return response
+
+# Filtered COUNT(*) results; every ingest bumps the data version and empties this
+count_cache = VersionedCache()
+
+def get_data_version(conn):
+    """Data version counter from app_state (None on a database without it)"""
+    try:
+        row = conn.execute(text(DATA_VERSION_SQL)).fetchone()
+    except OperationalError:
+        return None
+    return row[0] if row else None
+
+def get_cached_count(conn, count_query, params):
+    """Run a COUNT(*) query once per filter combination and data version"""
+    def count():
+        return conn.execute(text(count_query), params).fetchone()[0]
+    
+    version = get_data_version(conn)
+    if version is None:
+        return count()
+    key = (' '.join(count_query.split()), tuple(sorted(params.items())))
+    return count_cache.get(key, version, count)
+
+def current_data_version():
+    """Data version for the response cache (None disables caching for the request)"""
+    with db.engine.connect() as conn:
+        return get_data_version(conn)
+
+# Rendered pages for the read-heavy routes, reused until the next ingest bumps the data version
+response_cache = ResponseCache(current_data_version, create_backend())
+
+# Team ratings and match predictions, rebuilt after each ingest
+prediction_engine = PredictionEngine()
+
 def get_team_logo_url(team_name):
     """Generate logo URL for a team name, handling various name formats"""
     if not team_name:
@@ -54,35 +117,85 @@ db_path = os.getenv('NCAA_DB_PATH', os.path.join(basedir, 'data', 'ncaa_soccer.d
 db_uri = 'sqlite:///' + db_path.replace('\\', '/')
 app.config['SQLALCHEMY_DATABASE_URI'] = db_uri
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# Pages only read: pooled read-only WAL connections never wait on the cron job's import
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = read_pool_options(db_path)
 
 db = SQLAlchemy(app)
 
-# Optional: admin endpoint to trigger data collection on the same service/disk
-@app.route('/admin/run-weekly', methods=['GET', 'POST'])
-def admin_run_weekly():
+# Bring the schema (indexes, new tables) up to date before serving requests
+try:
+    from db_migrations import run_migrations
+    run_migrations(db_path)
+except Exception as e:
+    print(f"Warning: database migrations failed: {e}")
+
+# Rate any players snapshot imported before the player_ratings table existed
+try:
+    from ratings_table import ensure_player_ratings
+    ensure_player_ratings(db_path)
+except Exception as e:
+    print(f"Warning: player ratings refresh failed: {e}")
+
+# Materialize standings for the current snapshot and any matches changed since the last run
+try:
+    from team_standings import ensure_team_standings
+    ensure_team_standings(db_path)
+except Exception as e:
+    print(f"Warning: team standings refresh failed: {e}")
+
+# Optional: admin endpoints to trigger data collection on the same service/disk
+def is_admin_request():
     token = request.args.get('token') or request.headers.get('X-Admin-Token')
     expected = os.getenv('ADMIN_TOKEN')
-    if not expected or token != expected:
+    return bool(expected) and token == expected
+
+# Collections run on a background thread; their status lives in the jobs table
+job_runner = JobRunner(db_path)
+
+def run_weekly_job(progress, season, force=False):
+    from weekly_data_manager import SeasonDataManager
+    mgr = SeasonDataManager()
+    if force:
+        try:
+            mgr.activate_season(season)
+        except Exception as e:
+            print(f"Admin force activate failed: {e}")
+    ok = mgr.run_weekly_collection(season, progress=progress)
+    if ok and RATINGS_AVAILABLE:
+        get_ratings_store().invalidate()
+    return ok
+
+@app.route('/admin/run-weekly', methods=['GET', 'POST'])
+def admin_run_weekly():
+    if not is_admin_request():
         return jsonify({"ok": False, "error": "unauthorized"}), 401
 
     season = request.args.get('season', os.getenv('SEASON', '2025'))
     force = request.args.get('force', 'false').lower() in ('1', 'true', 'yes')
 
     try:
-        from weekly_data_manager import SeasonDataManager
-        mgr = SeasonDataManager()
-        if force:
-            try:
-                mgr.activate_season(season)
-            except Exception as e:
-                print(f"Admin force activate failed: {e}")
-        ok = mgr.run_weekly_collection(season)
-        return jsonify({"ok": bool(ok), "season": season})
+        # A second trigger for the same season while one is queued or running joins that job
+        job_id, created = job_runner.submit('weekly', season, run_weekly_job, {'season': season, 'force': force})
     except Exception as e:
         print(f"Admin run-weekly failed: {e}")
         return jsonify({"ok": False, "error": str(e)}), 500
+    return jsonify({
+        "ok": True, "season": season, "job_id": job_id, "coalesced": not created,
+        "status_url": url_for('admin_job', job_id=job_id),
+    }), 202
+
+@app.route('/admin/jobs/<int:job_id>')
+def admin_job(job_id):
+    if not is_admin_request():
+        return jsonify({"ok": False, "error": "unauthorized"}), 401
+
+    job = job_runner.get(job_id)
+    if job is None:
+        return jsonify({"ok": False, "error": "job not found"}), 404
+    return jsonify({"ok": True, "job": job})
 
 @app.route('/')
+@response_cache
 def home():
     # Get summary statistics for the home page
     with db.engine.connect() as conn:
@@ -144,6 +257,24 @@ def home():
 
 @app.route('/players')
 def show_players():
+    return render_players_page()
+
+def render_players_page(snapshot=None):
+    """The players listing over the live players table, or over a (season, snapshot_date)
+    rebuilt from player_history, with the same filters, sorting and pagination"""
+    if snapshot is None:
+        players_source = "players"
+        source_params = {}
+        search_condition = "players.rowid IN (SELECT rowid FROM players_fts WHERE players_fts MATCH :search)"
+        players_url = partial(url_for, 'show_players')
+    else:
+        season, snapshot_date = snapshot
+        players_source = AS_OF_SQL
+        source_params = {'history_season': season, 'history_date': snapshot_date}
+        # players_fts indexes the live table, so historical rows match on name and team
+        search_condition = "(players.name, players.team) IN (SELECT name, team FROM players_fts WHERE players_fts MATCH :search)"
+        players_url = partial(url_for, 'show_players_historical', season=season, date=snapshot_date)
+
     page = request.args.get('page', 1, type=int)
     per_page = 100
     offset = (page - 1) * per_page
@@ -157,15 +288,17 @@ def show_players():
     sort_order = request.args.get('order', 'desc')
     
     # Build WHERE clause
-    where_conditions = ["name IS NOT NULL", "team IS NOT NULL", "minutes_played >= 250"]
-    params = {"limit": per_page, "offset": offset}
+    where_conditions = ["players.name IS NOT NULL", "players.team IS NOT NULL", "players.minutes_played >= 250"]
+    params = {"limit": per_page, "offset": offset, **source_params}
     
-    if search_term:
-        where_conditions.append("LOWER(name) LIKE :search")
-        params['search'] = f"%{search_term.lower()}%"
+    # Full-text search: prefix, accent-insensitive match on name, team and conference
+    match_query = build_match_query(search_term)
+    if match_query:
+        where_conditions.append(search_condition)
+        params['search'] = match_query
     
     if team_filter:
-        where_conditions.append("team = :team")
+        where_conditions.append("players.team = :team")
         params['team'] = team_filter
     
     # Map position abbreviations to full names
@@ -179,11 +312,11 @@ def show_players():
     if position_filter:
         # Convert abbreviation to full name if needed
         mapped_position = position_mapping.get(position_filter, position_filter)
-        where_conditions.append("position = :position")
+        where_conditions.append("players.position = :position")
         params['position'] = mapped_position
     
     if conference_filter:
-        where_conditions.append("conference = :conference")
+        where_conditions.append("players.conference = :conference")
         params['conference'] = conference_filter
     
     where_clause = " AND ".join(where_conditions)
@@ -196,162 +329,105 @@ def show_players():
     
     # Get distinct teams for filter dropdown (needed for all cases)
     with db.engine.connect() as conn:
-        result = conn.execute(text("""
+        result = conn.execute(text(f"""
             SELECT DISTINCT team
-            FROM players
+            FROM {players_source}
             WHERE team IS NOT NULL
             ORDER BY team
-        """))
+        """), source_params)
         teams = [row[0] for row in result]
         
         # Get distinct conferences for filter dropdown
-        result = conn.execute(text("""
+        result = conn.execute(text(f"""
             SELECT DISTINCT conference
-            FROM players
+            FROM {players_source}
             WHERE conference IS NOT NULL
             ORDER BY conference
-        """))
+        """), source_params)
         conferences = [row[0] for row in result]
     
-    if sort_by == 'max':
-        # We need to get all players first, calculate MAX ratings, then sort and paginate
-        try:
-            if RATINGS_AVAILABLE:
-                # Load the corrected player ratings data from CSV
-                import pandas as pd
-                df = pd.read_csv('data/d1_player_stats.csv')
-                
-                # Create a lookup dictionary for MAX ratings from the corrected CSV
-                max_ratings_dict = dict(zip(df['Name'], df['MAX']))
-                
-                # Get all players that match the filters (without pagination first)
-                with db.engine.connect() as conn:
-                    all_players_query = f"""
-                        SELECT 
-                            name,
-                            team,
-                            position,
-                            minutes_played,
-                            goals,
-                            assists,
-                            shots,
-                            shots_on_target,
-                            fouls_won,
-                            CASE 
-                                WHEN shots > 0 THEN ROUND(CAST(shots_on_target AS FLOAT) / shots * 100, 1)
-                                ELSE 0
-                            END as shot_accuracy,
-                            CASE 
-                                WHEN minutes_played > 0 THEN ROUND(CAST(goals AS FLOAT) / (minutes_played / 90.0), 2)
-                                ELSE 0
-                            END as goals_per_90
-                        FROM players
-                        WHERE {where_clause}
-                        ORDER BY name ASC
-                    """
-                    result = conn.execute(text(all_players_query), {k: v for k, v in params.items() if k not in ['limit', 'offset']})
-                    all_players = [dict(row._mapping) for row in result]
-                
-                # Add MAX ratings and sort
-                for player in all_players:
-                    player['max_rating'] = max_ratings_dict.get(player['name'], 0)
-                
-                # Sort by MAX rating
-                all_players.sort(key=lambda x: x['max_rating'], reverse=(sort_order == 'desc'))
-                
-                # Apply pagination manually
-                total_players = len(all_players)
-                total_pages = math.ceil(total_players / per_page) if total_players > 0 else 1
-                start_idx = offset
-                end_idx = offset + per_page
-                players = all_players[start_idx:end_idx]
-                
-            else:
-                # Fallback if ratings not available
-                raise Exception("Ratings not available")
-                
-        except Exception as e:
-            print(f"Error with MAX rating sort: {e}")
-            # Fallback to regular sorting - continue to else block below
-            sort_by = 'goals'  # Change sort type for fallback
-            
-    if sort_by != 'max':  # Regular sorting (including fallback from MAX rating error)
-        # Build ORDER BY clause
-        valid_sort_columns = {
-            'name': 'name',
-            'team': 'team', 
-            'position': 'position',
-            'goals': 'goals',
-            'assists': 'assists',
-            'shots': 'shots',
-            'goals_per_90': 'CASE WHEN minutes_played > 0 THEN CAST(goals AS FLOAT) / (minutes_played / 90.0) ELSE 0 END',
-        }
-        
-        sort_column = valid_sort_columns.get(sort_by, 'goals')
-        sort_direction = 'DESC' if sort_order == 'desc' else 'ASC'
-        order_clause = f"ORDER BY {sort_column} {sort_direction}, name ASC"
+    # Build ORDER BY clause; MAX comes from the stored player_ratings of the same snapshot
+    valid_sort_columns = {
+        'name': 'players.name',
+        'team': 'players.team', 
+        'position': "COALESCE(players.position, '')",
+        'goals': 'players.goals',
+        'assists': 'players.assists',
+        'shots': 'players.shots',
+        'goals_per_90': 'CASE WHEN players.minutes_played > 0 THEN CAST(players.goals AS FLOAT) / (players.minutes_played / 90.0) ELSE 0 END',
+        'max': 'COALESCE(player_ratings.max_rating, 0)',
+    }
+    
+    sort_column = valid_sort_columns.get(sort_by, 'players.goals')
+    sort_direction = 'DESC' if sort_order == 'desc' else 'ASC'
+    # name then rowid make the order total, which keyset cursors rely on
+    order_columns = [(sort_column, sort_direction), ('players.name', 'ASC'), ('players.rowid', 'ASC')]
+    filter_params = {k: v for k, v in params.items() if k not in ['limit', 'offset']}
+    
+    # Opt-in keyset mode (?paging=keyset or a cursor from a previous page) seeks past the
+    # cursor row instead of skipping OFFSET rows; page numbers keep using offsets
+    signature = cursor_signature('players', sort_column, sort_direction, where_clause, filter_params)
+    cursor_token = request.args.get('cursor', '').strip()
+    cursor = decode_cursor(cursor_token, signature) if cursor_token else None
+    keyset_mode = cursor is not None or request.args.get('paging') == 'keyset'
+    if cursor is not None:
+        cursor_values, page, cursor_direction = cursor
+        offset = (page - 1) * per_page
+        condition, order_by, page_params = keyset_clause(order_columns, cursor_values, cursor_direction)
+        page_where = f"{where_clause} AND {condition}"
+        page_params.update(filter_params, limit=per_page)
+        page_limit = "LIMIT :limit"
+    else:
+        page_where = where_clause
+        order_by = ', '.join(f"{expression} {direction}" for expression, direction in order_columns)
+        page_params = params
+        page_limit = "LIMIT :limit OFFSET :offset"
+    
+    with db.engine.connect() as conn:
+        # Total count for pagination (with filters), cached until the next ingest
+        count_query = f"""
+            SELECT COUNT(*) 
+            FROM {players_source}
+            WHERE {where_clause}
+        """
+        total_players = get_cached_count(conn, count_query, filter_params)
+        total_pages = math.ceil(total_players / per_page) if total_players > 0 else 1
         
-        with db.engine.connect() as conn:
-            # Get total count for pagination (with filters)
-            count_query = f"""
-                SELECT COUNT(*) 
-                FROM players
-                WHERE {where_clause}
-            """
-            result = conn.execute(text(count_query), {k: v for k, v in params.items() if k not in ['limit', 'offset']})
-            total_players = result.fetchone()[0]
-            total_pages = math.ceil(total_players / per_page) if total_players > 0 else 1
-            
-            # Get players data with pagination, search, and sorting
-            main_query = f"""
-                SELECT 
-                    name,
-                    team,
-                    position,
-                    minutes_played,
-                    goals,
-                    assists,
-                    shots,
-                    shots_on_target,
-                    fouls_won,
-                    CASE 
-                        WHEN shots > 0 THEN ROUND(CAST(shots_on_target AS FLOAT) / shots * 100, 1)
-                        ELSE 0
-                    END as shot_accuracy,
-                    CASE 
-                        WHEN minutes_played > 0 THEN ROUND(CAST(goals AS FLOAT) / (minutes_played / 90.0), 2)
-                        ELSE 0
-                    END as goals_per_90
-                FROM players
-                WHERE {where_clause}
-                {order_clause}
-                LIMIT :limit OFFSET :offset
-            """
-            result = conn.execute(text(main_query), params)
-            players = [dict(row._mapping) for row in result]
-            
-            # Add MAX ratings (with error handling for deployment)
-            try:
-                if RATINGS_AVAILABLE:
-                    # Load the corrected player ratings data from CSV
-                    import pandas as pd
-                    df = pd.read_csv('data/d1_player_stats.csv')
-                    
-                    # Create a lookup dictionary for MAX ratings from the corrected CSV
-                    max_ratings_dict = dict(zip(df['Name'], df['MAX']))
-                    
-                    # Add MAX ratings to players
-                    for player in players:
-                        player['max_rating'] = max_ratings_dict.get(player['name'], 0)
-                else:
-                    # Ratings not available, set to N/A
-                    for player in players:
-                        player['max_rating'] = 'N/A'
-                        
-            except Exception as e:
-                print(f"Error loading MAX ratings: {e}")
-                for player in players:
-                    player['max_rating'] = 'N/A'
+        # Get players data with pagination, search, and sorting
+        main_query = f"""
+            SELECT 
+                players.name,
+                players.team,
+                players.position,
+                players.minutes_played,
+                players.goals,
+                players.assists,
+                players.shots,
+                players.shots_on_target,
+                players.fouls_won,
+                CASE 
+                    WHEN players.shots > 0 THEN ROUND(CAST(players.shots_on_target AS FLOAT) / players.shots * 100, 1)
+                    ELSE 0
+                END as shot_accuracy,
+                CASE 
+                    WHEN players.minutes_played > 0 THEN ROUND(CAST(players.goals AS FLOAT) / (players.minutes_played / 90.0), 2)
+                    ELSE 0
+                END as goals_per_90,
+                COALESCE(player_ratings.max_rating, 0) as max_rating,
+                {sort_column} as sort_key,
+                players.rowid as row_id
+            FROM {players_source}
+            LEFT JOIN player_ratings
+                ON player_ratings.name = players.name AND player_ratings.team = players.team
+                AND player_ratings.season = players.season AND player_ratings.data_date = players.data_date
+            WHERE {page_where}
+            ORDER BY {order_by}
+            {page_limit}
+        """
+        result = conn.execute(text(main_query), page_params)
+        players = [dict(row._mapping) for row in result]
+        if cursor is not None and cursor_direction == 'prev':
+            players.reverse()
         
     # Calculate pagination info
     has_prev = page > 1
@@ -359,6 +435,15 @@ def show_players():
     prev_num = page - 1 if has_prev else None
     next_num = page + 1 if has_next else None
     
+    prev_cursor = next_cursor = None
+    if keyset_mode and players:
+        if has_prev:
+            first = players[0]
+            prev_cursor = encode_cursor([first['sort_key'], first['name'], first['row_id']], prev_num, 'prev', signature)
+        if has_next:
+            last = players[-1]
+            next_cursor = encode_cursor([last['sort_key'], last['name'], last['row_id']], next_num, 'next', signature)
+    
     # Generate page numbers for pagination display
     start_page = max(1, page - 2)
     end_page = min(total_pages, page + 2)
@@ -378,7 +463,9 @@ def show_players():
                              'next_num': next_num,
                              'page_numbers': page_numbers,
                              'start_item': offset + 1 if total_players > 0 else 0,
-                             'end_item': min(offset + per_page, total_players)
+                             'end_item': min(offset + per_page, total_players),
+                             'prev_cursor': prev_cursor,
+                             'next_cursor': next_cursor
                          },
                          current_filters={
                              'search': search_term,
@@ -388,82 +475,75 @@ def show_players():
                              'sort': sort_by,
                              'order': sort_order
                          },
-                         conferences=conferences)
+                         conferences=conferences,
+                         players_url=players_url,
+                         snapshot={'season': snapshot[0], 'date': snapshot[1]} if snapshot else None)
 
 @app.route('/teams')
+@response_cache
 def show_teams():
     with db.engine.connect() as conn:
-        # Team standings based on match results
+        # Standings are materialized at ingest time; read the newest snapshot in table order
         result = conn.execute(text("""
+            WITH latest AS (
+                SELECT season, snapshot_date FROM team_standings
+                ORDER BY season DESC, snapshot_date DESC
+                LIMIT 1
+            )
             SELECT 
                 team,
-                COUNT(*) as games_played,
-                SUM(goals_for) as goals_for,
-                SUM(goals_against) as goals_against,
-                (SUM(goals_for) - SUM(goals_against)) as goal_difference,
-                SUM(wins) as wins,
-                SUM(draws) as draws,
-                SUM(losses) as losses,
-                (SUM(wins) * 3 + SUM(draws)) as points
-            FROM (
-                SELECT 
-                    home_team as team,
-                    home_team_score as goals_for,
-                    away_team_score as goals_against,
-                    CASE WHEN home_team_score > away_team_score THEN 1 ELSE 0 END as wins,
-                    CASE WHEN home_team_score = away_team_score THEN 1 ELSE 0 END as draws,
-                    CASE WHEN home_team_score < away_team_score THEN 1 ELSE 0 END as losses
-                FROM matches
-                UNION ALL
-                SELECT 
-                    away_team as team,
-                    away_team_score as goals_for,
-                    home_team_score as goals_against,
-                    CASE WHEN away_team_score > home_team_score THEN 1 ELSE 0 END as wins,
-                    CASE WHEN away_team_score = home_team_score THEN 1 ELSE 0 END as draws,
-                    CASE WHEN away_team_score < home_team_score THEN 1 ELSE 0 END as losses
-                FROM matches
-            ) team_results
-            GROUP BY team
-            HAVING COUNT(*) >= 5  -- Only teams with at least 5 games
+                games_played,
+                goals_for,
+                goals_against,
+                goal_difference,
+                wins,
+                draws,
+                losses,
+                points,
+                COALESCE(max_rating, 'N/A') as max_rating,
+                COALESCE(att_rating, 'N/A') as att_rating,
+                COALESCE(def_rating, 'N/A') as def_rating
+            FROM team_standings
+            JOIN latest USING (season, snapshot_date)
+            WHERE games_played >= 5  -- Only teams with at least 5 games
             ORDER BY points DESC, goal_difference DESC, goals_for DESC
         """))
         team_standings = [dict(row._mapping) for row in result]
 
-    # Get team MAX ratings (with error handling)
-    try:
-        if RATINGS_AVAILABLE:
-            team_max_ratings = get_team_max_ratings()
-            max_ratings_dict = {team['Team']: {'MAX': team['MAX'], 'ATT': team['ATT'], 'DEF': team['DEF']} for team in team_max_ratings}
-        else:
-            max_ratings_dict = {}
-    except Exception as e:
-        print(f"Error loading team ratings: {e}")
-        max_ratings_dict = {}
-    
-    # Add MAX ratings to team standings
-    for team in team_standings:
-        ratings = max_ratings_dict.get(team['team'], {'MAX': 'N/A', 'ATT': 'N/A', 'DEF': 'N/A'})
-        team['max_rating'] = ratings['MAX']
-        team['att_rating'] = ratings['ATT']
-        team['def_rating'] = ratings['DEF']
-
     return render_template("ncaa_teams.html", team_standings=team_standings)
 
 @app.route('/matches')
+@response_cache
 def show_matches():
     page = request.args.get('page', 1, type=int)
     per_page = 50
     offset = (page - 1) * per_page
     
+    # Opt-in keyset mode: seek by ROWID from the cursor instead of skipping OFFSET rows
+    signature = cursor_signature('matches')
+    cursor_token = request.args.get('cursor', '').strip()
+    cursor = decode_cursor(cursor_token, signature) if cursor_token else None
+    keyset_mode = cursor is not None or request.args.get('paging') == 'keyset'
+    if cursor is not None:
+        cursor_values, page, cursor_direction = cursor
+        offset = (page - 1) * per_page
+        condition, order_by, page_params = keyset_clause([('ROWID', 'DESC')], cursor_values, cursor_direction)
+        page_where = f"WHERE {condition}"
+        page_params['limit'] = per_page
+        page_limit = "LIMIT :limit"
+    else:
+        page_where = ""
+        order_by = "ROWID DESC"
+        page_params = {"limit": per_page, "offset": offset}
+        page_limit = "LIMIT :limit OFFSET :offset"
+    
     with db.engine.connect() as conn:
-        # Get total count for pagination
-        result = conn.execute(text("SELECT COUNT(*) FROM matches"))
-        total_matches = result.fetchone()[0]
+        # Get total count for pagination, cached until the next ingest
+        total_matches = get_cached_count(conn, "SELECT COUNT(*) FROM matches", {})
         total_pages = math.ceil(total_matches / per_page) if total_matches > 0 else 1
         
         # Get matches data with pagination, sorted by date (most recent first)
-        result = conn.execute(text("""
+        result = conn.execute(text(f"""
             SELECT 
                 home_team,
                 home_team_score,
@@ -476,12 +556,16 @@ def show_matches():
                     WHEN home_team_score > away_team_score THEN home_team
                     WHEN away_team_score > home_team_score THEN away_team
                     ELSE 'Draw'
-                END as winner
+                END as winner,
+                ROWID as row_id
             FROM matches
-            ORDER BY ROWID DESC
-            LIMIT :limit OFFSET :offset
-        """), {"limit": per_page, "offset": offset})
+            {page_where}
+            ORDER BY {order_by}
+            {page_limit}
+        """), page_params)
         matches = [dict(row._mapping) for row in result]
+        if cursor is not None and cursor_direction == 'prev':
+            matches.reverse()
         
     # Calculate pagination info
     has_prev = page > 1
@@ -489,6 +573,13 @@ def show_matches():
     prev_num = page - 1 if has_prev else None
     next_num = page + 1 if has_next else None
     
+    prev_cursor = next_cursor = None
+    if keyset_mode and matches:
+        if has_prev:
+            prev_cursor = encode_cursor([matches[0]['row_id']], prev_num, 'prev', signature)
+        if has_next:
+            next_cursor = encode_cursor([matches[-1]['row_id']], next_num, 'next', signature)
+    
     # Generate page numbers for pagination display
     start_page = max(1, page - 2)
     end_page = min(total_pages, page + 2)
@@ -507,7 +598,9 @@ def show_matches():
                              'next_num': next_num,
                              'page_numbers': page_numbers,
                              'start_item': offset + 1 if total_matches > 0 else 0,
-                             'end_item': min(offset + per_page, total_matches)
+                             'end_item': min(offset + per_page, total_matches),
+                             'prev_cursor': prev_cursor,
+                             'next_cursor': next_cursor
                          })
 
 @app.route('/player/<player_name>')
@@ -552,17 +645,20 @@ def player_profile(player_name):
         
         # Get MAX rating and radar chart data with timeout protection
         try:
-            rating_data = get_player_rating_data(player_name)
+            rating_data = get_player_rating_data(player_name, team=player_data['team'])
             if rating_data:
                 player_data['max_rating'] = rating_data.get('MAX', 'N/A')
                 player_data['radar_chart'] = rating_data.get('radar_chart', None)
+                player_data['radar_svg'] = rating_data.get('radar_svg', None)
             else:
                 player_data['max_rating'] = 'N/A'
                 player_data['radar_chart'] = None
+                player_data['radar_svg'] = None
         except Exception as e:
             print(f"Error loading rating data for {player_name}: {e}")
             player_data['max_rating'] = 'N/A'
             player_data['radar_chart'] = None
+            player_data['radar_svg'] = None
         
         # Get team matches to show team context
         result = conn.execute(text("""
@@ -587,44 +683,72 @@ def player_profile(player_name):
                          player=player_data, 
                          team_matches=team_matches)
 
+@app.route('/api/radar/<player_name>')
+def api_radar_status(player_name):
+    """Poll for a radar chart that is still rendering in the background"""
+    player_name = unquote(player_name)
+    rating_data = get_player_rating_data(player_name, team=request.args.get('team'))
+    if not rating_data:
+        return jsonify({'ready': False, 'error': 'Player not found'}), 404
+    
+    chart = rating_data.get('radar_chart')
+    return jsonify({
+        'ready': chart is not None,
+        'url': url_for('static', filename='radars/' + chart) if chart else None
+    })
+
+@app.route('/api/search')
+def api_search():
+    """Typeahead: best player matches for a partial search box entry"""
+    query = build_match_query(request.args.get('q', ''))
+    limit = max(1, min(request.args.get('limit', 10, type=int), 50))
+    if query is None:
+        return jsonify([])
+    
+    with db.engine.connect() as conn:
+        result = conn.execute(text(PLAYER_SEARCH_SQL), {'query': query, 'limit': limit})
+        players = [dict(row._mapping) for row in result]
+    
+    return jsonify([
+        {
+            'name': player['name'],
+            'team': player['team'],
+            'position': player['position'],
+            'conference': player['conference'],
+            'url': url_for('player_profile', player_name=player['name'])
+        }
+        for player in players
+    ])
+
 @app.route('/team/<team_name>')
+@response_cache
 def team_profile(team_name):
     team_name = unquote(team_name)
     
     with db.engine.connect() as conn:
-        # Team record and stats
+        # Team record and ratings from the newest materialized standings
         result = conn.execute(text("""
+            WITH latest AS (
+                SELECT season, snapshot_date FROM team_standings
+                ORDER BY season DESC, snapshot_date DESC
+                LIMIT 1
+            )
             SELECT 
                 team,
-                COUNT(*) as games_played,
-                SUM(goals_for) as goals_for,
-                SUM(goals_against) as goals_against,
-                (SUM(goals_for) - SUM(goals_against)) as goal_difference,
-                SUM(wins) as wins,
-                SUM(draws) as draws,
-                SUM(losses) as losses,
-                (SUM(wins) * 3 + SUM(draws)) as points
-            FROM (
-                SELECT 
-                    home_team as team,
-                    home_team_score as goals_for,
-                    away_team_score as goals_against,
-                    CASE WHEN home_team_score > away_team_score THEN 1 ELSE 0 END as wins,
-                    CASE WHEN home_team_score = away_team_score THEN 1 ELSE 0 END as draws,
-                    CASE WHEN home_team_score < away_team_score THEN 1 ELSE 0 END as losses
-                FROM matches WHERE home_team = :team_name
-                UNION ALL
-                SELECT 
-                    away_team as team,
-                    away_team_score as goals_for,
-                    home_team_score as goals_against,
-                    CASE WHEN away_team_score > home_team_score THEN 1 ELSE 0 END as wins,
-                    CASE WHEN away_team_score = home_team_score THEN 1 ELSE 0 END as draws,
-                    CASE WHEN away_team_score < home_team_score THEN 1 ELSE 0 END as losses
-                FROM matches WHERE away_team = :team_name
-            ) team_results
+                games_played,
+                goals_for,
+                goals_against,
+                goal_difference,
+                wins,
+                draws,
+                losses,
+                points,
+                att_rating,
+                def_rating,
+                max_rating
+            FROM team_standings
+            JOIN latest USING (season, snapshot_date)
             WHERE team = :team_name
-            GROUP BY team
         """), {'team_name': team_name})
         
         team_stats = result.fetchone()
@@ -693,25 +817,14 @@ def team_profile(team_name):
         """), {'team_name': team_name})
         recent_matches = [dict(row._mapping) for row in result]
         
-        # Get team MAX rating (with error handling)
-        try:
-            if RATINGS_AVAILABLE:
-                team_max_ratings = get_team_max_ratings()
-                team_rating_data = next((team for team in team_max_ratings if team['Team'] == team_name), {'MAX': 'N/A', 'ATT': 'N/A', 'DEF': 'N/A'})
-            else:
-                team_rating_data = {'MAX': 'N/A', 'ATT': 'N/A', 'DEF': 'N/A'}
-        except Exception as e:
-            print(f"Error loading team ratings: {e}")
-            team_rating_data = {'MAX': 'N/A', 'ATT': 'N/A', 'DEF': 'N/A'}
-        
         # Calculate additional team stats
         team_stats['avg_goals_per_game'] = round(team_stats['goals_for'] / max(team_stats['games_played'], 1), 2)
         team_stats['avg_goals_against_per_game'] = round(team_stats['goals_against'] / max(team_stats['games_played'], 1), 2)
         team_stats['total_players'] = len(roster)
         team_stats['active_players'] = len([p for p in roster if p['minutes_played'] >= 250])
-        team_stats['max_rating'] = team_rating_data['MAX']
-        team_stats['att_rating'] = team_rating_data['ATT']
-        team_stats['def_rating'] = team_rating_data['DEF']
+        for rating in ('max_rating', 'att_rating', 'def_rating'):
+            if team_stats.get(rating) is None:
+                team_stats[rating] = 'N/A'
         
         return render_template("ncaa_team_profile.html", 
                              team_stats=team_stats,
@@ -725,6 +838,7 @@ def team_profile(team_name):
 
 # Season and Date Management API Endpoints
 @app.route('/api/seasons')
+@response_cache
 def get_available_seasons():
     """Get list of available seasons"""
     try:
@@ -754,9 +868,9 @@ def get_available_dates(season):
             result = conn.execute(text("""
                 SELECT snapshot_date, description, total_players, is_current
                 FROM data_snapshots 
-                WHERE season = ?
+                WHERE season = :season
                 ORDER BY snapshot_date DESC
-            """), (season,))
+            """), {'season': season})
             dates = [dict(row._mapping) for row in result]
             return jsonify(dates)
     except Exception as e:
@@ -786,6 +900,11 @@ def match_odds():
     
     return render_template("match_odds.html", teams=teams)
 
+def load_prediction_ratings():
+    """Team rating rows for the prediction engine"""
+    with db.engine.connect() as conn:
+        return conn.execute(text(TEAM_RATINGS_SQL)).fetchall()
+
 @app.route('/api/predict-match')
 def predict_match():
     """API endpoint to predict match outcome between two teams"""
@@ -799,144 +918,43 @@ def predict_match():
         return jsonify({'error': 'Home and away teams must be different'}), 400
     
     try:
-        # Get team ratings
-        if RATINGS_AVAILABLE:
-            team_ratings = get_team_max_ratings()
-            team_ratings_dict = {team['Team']: team for team in team_ratings}
-            
-            home_team_data = team_ratings_dict.get(home_team)
-            away_team_data = team_ratings_dict.get(away_team)
-            
-            if not home_team_data or not away_team_data:
-                return jsonify({'error': 'Team ratings not found for one or both teams'}), 404
-            
-            # Calculate match predictions using team ATT and DEF ratings
-            prediction = calculate_match_prediction(home_team_data, away_team_data)
-            
-            return jsonify(prediction)
-        else:
-            return jsonify({'error': 'Rating system not available'}), 503
+        # Memoized per data version; ratings come from the materialized standings
+        prediction = prediction_engine.predict(current_data_version(), load_prediction_ratings, home_team, away_team)
+        if prediction is None:
+            return jsonify({'error': 'Team ratings not found for one or both teams'}), 404
+        
+        return jsonify(prediction)
             
     except Exception as e:
         print(f"Error predicting match: {e}")
         return jsonify({'error': 'Internal server error'}), 500
 
-def calculate_match_prediction(home_team, away_team):
-    """Calculate match prediction probabilities and expected scoreline"""
-    import math
-    import numpy as np
-    
-    # Get team ratings
-    home_att = home_team['ATT']
-    home_def = home_team['DEF'] 
-    away_att = away_team['ATT']
-    away_def = away_team['DEF']
-    
-    # Calculate expected goals using Poisson model
-    # Home advantage factor (typically 1.1-1.3 in soccer)
-    home_advantage = 1.2
-    
-    # Expected goals = (Team ATT / League Avg ATT) * (Opponent DEF / League Avg DEF) * League Avg Goals * Home Advantage
-    league_avg_goals = 1.5  # Typical college soccer average
-    
-    # Calculate expected goals for each team
-    home_expected_goals = (home_att / 1.0) * (away_def / 1.0) * league_avg_goals * home_advantage
-    away_expected_goals = (away_att / 1.0) * (home_def / 1.0) * league_avg_goals
-    
-    # Ensure reasonable bounds
-    home_expected_goals = max(0.1, min(5.0, home_expected_goals))
-    away_expected_goals = max(0.1, min(5.0, away_expected_goals))
-    
-    # Calculate probabilities using Poisson distribution
-    def poisson_prob(k, lam):
-        return (math.e ** (-lam)) * (lam ** k) / math.factorial(k)
-    
-    # Calculate scoreline probabilities matrix (0-5 goals each)
-    max_goals = 6
-    scoreline_matrix = []
-    total_prob = 0
-    
-    home_win_prob = 0
-    away_win_prob = 0
-    draw_prob = 0
-    
-    for home_goals in range(max_goals):
-        row = []
-        for away_goals in range(max_goals):
-            prob = poisson_prob(home_goals, home_expected_goals) * poisson_prob(away_goals, away_expected_goals)
-            row.append(prob)
-            total_prob += prob
-            
-            if home_goals > away_goals:
-                home_win_prob += prob
-            elif away_goals > home_goals:
-                away_win_prob += prob
-            else:
-                draw_prob += prob
-        scoreline_matrix.append(row)
-    
-    # Normalize probabilities to ensure they sum to 1
-    if total_prob > 0:
-        scoreline_matrix = [[prob/total_prob for prob in row] for row in scoreline_matrix]
-        home_win_prob /= total_prob
-        away_win_prob /= total_prob
-        draw_prob /= total_prob
-    
-    # Find most likely scoreline
-    max_prob = 0
-    most_likely_score = (1, 1)
-    for i, row in enumerate(scoreline_matrix):
-        for j, prob in enumerate(row):
-            if prob > max_prob:
-                max_prob = prob
-                most_likely_score = (i, j)
-    
-    # Calculate over/under probabilities
-    total_goals_prob = {}
-    for total_goals in range(0, 8):
-        prob = 0
-        for home_goals in range(max_goals):
-            for away_goals in range(max_goals):
-                if home_goals + away_goals == total_goals:
-                    prob += scoreline_matrix[home_goals][away_goals]
-        total_goals_prob[total_goals] = prob
-    
-    over_2_5 = sum(total_goals_prob.get(i, 0) for i in range(3, 8))
-    under_2_5 = 1 - over_2_5
-    
-    return {
-        'home_team': home_team['Team'],
-        'away_team': away_team['Team'],
-        'home_team_rating': {
-            'att': round(home_att, 2),
-            'def': round(home_def, 2),
-            'max': round(home_team['MAX'], 1)
-        },
-        'away_team_rating': {
-            'att': round(away_att, 2),
-            'def': round(away_def, 2),
-            'max': round(away_team['MAX'], 1)
-        },
-        'probabilities': {
-            'home_win': round(home_win_prob * 100, 1),
-            'draw': round(draw_prob * 100, 1),
-            'away_win': round(away_win_prob * 100, 1)
-        },
-        'expected_goals': {
-            'home': round(home_expected_goals, 2),
-            'away': round(away_expected_goals, 2)
-        },
-        'most_likely_score': {
-            'home': most_likely_score[0],
-            'away': most_likely_score[1],
-            'probability': round(max_prob * 100, 1)
-        },
-        'over_under': {
-            'over_2_5': round(over_2_5 * 100, 1),
-            'under_2_5': round(under_2_5 * 100, 1)
-        },
-        'scoreline_matrix': [[round(prob * 100, 2) for prob in row] for row in scoreline_matrix]
-    }
+@app.route('/api/predict-matrix')
+@response_cache
+def predict_matrix():
+    """Win/draw/loss percentages for every home x away pairing (optionally ?teams=A,B,C)"""
+    try:
+        ratings = prediction_engine.ratings(current_data_version(), load_prediction_ratings)
+        teams = [team for team in request.args.get('teams', '').split(',') if team]
+        missing = [team for team in teams if team not in ratings.index]
+        if missing:
+            return jsonify({'error': 'Team ratings not found', 'teams': missing}), 404
+        teams = teams or ratings.teams
+        
+        home_win, draw, away_win = prediction_matrix(ratings, teams, teams)
+        tables = {}
+        for name, probabilities in (('home_win', home_win), ('draw', draw), ('away_win', away_win)):
+            table = np.round(probabilities * 100, 1).tolist()
+            # A team never plays itself
+            for i, row in enumerate(table):
+                row[i] = None
+            tables[name] = table
+        
+        return jsonify({'teams': teams, **tables})
+    
+    except Exception as e:
+        print(f"Error building prediction matrix: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
 
 @app.route('/api/season-status')
 def get_season_status():
@@ -966,9 +984,9 @@ def get_season_status():
             result = conn.execute(text("""
                 SELECT snapshot_date, total_players, description
                 FROM data_snapshots 
-                WHERE season = ? AND is_current = TRUE
+                WHERE season = :season AND is_current = TRUE
                 LIMIT 1
-            """), (current_season['season'],))
+            """), {'season': current_season['season']})
             latest_snapshot = result.fetchone()
             
             if latest_snapshot:
@@ -991,14 +1009,22 @@ def get_season_status():
 @app.route('/players/<season>')
 @app.route('/players/<season>/<date>')
 def show_players_historical(season, date='current'):
-    """Show players for specific season/date"""
-    # For now, redirect to regular players page for 2024 season
-    # When 2025 data becomes available, this will handle historical views
-    if season == '2024':
-        return show_players()  # Use existing function for 2024 data
-    else:
-        # Future: Handle 2025 and other seasons
-        # For now, show message that season data isn't available yet
+    """Show players as they stood at a season's snapshot (its latest one for 'current')"""
+    with db.engine.connect() as conn:
+        if date == 'current':
+            snapshot_date = conn.execute(text("""
+                SELECT MAX(snapshot_date) FROM data_snapshots WHERE season = :season
+            """), {"season": season}).scalar()
+        else:
+            snapshot_date = conn.execute(text("""
+                SELECT snapshot_date FROM data_snapshots WHERE season = :season AND snapshot_date = :date
+            """), {"season": season, "date": date}).scalar()
+
+    if snapshot_date is None:
+        if date == 'current':
+            message = f"Data for {season} season is not yet available. Data collection will begin when the season starts."
+        else:
+            message = f"No {season} snapshot was taken on {date}."
         return render_template("ncaa_players.html", 
                              players=[], 
                              teams=[],
@@ -1007,7 +1033,10 @@ def show_players_historical(season, date='current'):
                                        'has_prev': False, 'has_next': False, 'prev_num': None, 
                                        'next_num': None, 'page_numbers': [1], 'start_item': 0, 'end_item': 0},
                              current_filters={'search': '', 'team': '', 'position': '', 'conference': '', 'sort': 'goals', 'order': 'desc'},
-                             season_message=f"Data for {season} season is not yet available. Data collection will begin when the season starts.")
+                             players_url=partial(url_for, 'show_players'),
+                             season_message=message)
+
+    return render_players_page(snapshot=(season, snapshot_date))
 
 if __name__ == '__main__':
     app.run(debug=True)
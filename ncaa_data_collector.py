@@ -10,37 +10,210 @@ import numpy as np
 import json
 import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
-import re
+import threading
+import time
 import unidecode
-from rapidfuzz import process, fuzz
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
 from datetime import datetime, timedelta
 import sqlite3
 from collections import Counter
+from http_cache import HTTPResponseCache
+from name_resolution import NameResolver, build_name_mapping, preprocess_name
+from pbp_events import EVENT_LABELS, EVENT_TYPES, PLAYER_PATTERN, flatten_pbp, fouls_won, parse_events
+
+# Endpoints can be pointed at a local stub server for tests and benchmarks
+NCAA_SCOREBOARD_URL = os.getenv('NCAA_SCOREBOARD_URL', 'https://www.ncaa.com/scoreboard/soccer-men')
+NCAA_GAME_DATA_URL = os.getenv('NCAA_GAME_DATA_URL', 'https://data.ncaa.com/casablanca/game')
+
+# Per-game JSON documents fetched for every game
+GAME_ENDPOINTS = ('boxscore', 'pbp')
+
+# Output columns of a player stats table (season totals or per-game lines)
+PLAYER_STAT_COLUMNS = ['Name', 'Team', 'Position', 'Minutes Played', 'Goals', 'Assists',
+                       'Shots', 'Shots On Target', 'Fouls Won']
 
 class NCAADataCollector:
-    def __init__(self, season='2025', division='d1'):
+    def __init__(self, season='2025', division='d1', max_workers=8, per_host_limit=8,
+                 timeout=15, retries=3, backoff_factor=0.5,
+                 scoreboard_url=None, game_data_url=None,
+                 use_cache=True, cache=None, live_ttl=300, name_resolver=None):
         self.season = season
         self.division = division
         self.base_data_dir = f'data/{season}'
         os.makedirs(f'{self.base_data_dir}/weekly_updates', exist_ok=True)
         
+        # HTTP settings for the concurrent fetch layer
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self.scoreboard_url = scoreboard_url or NCAA_SCOREBOARD_URL
+        self.game_data_url = game_data_url or NCAA_GAME_DATA_URL
+        self.session = self.create_session(retries, backoff_factor)
+        self._host_limits = {}
+        self._host_limits_lock = threading.Lock()
+        
+        # On-disk response cache: final games are kept forever, live data for live_ttl seconds
+        self.cache = cache if cache is not None else (HTTPResponseCache() if use_cache else None)
+        self.live_ttl = live_ttl
+        self.stats = Counter()
+        self.collected_events = []
+        self._stats_lock = threading.Lock()
+        
+        # Blocked fuzzy matching, memoized in the database across runs
+        self.name_resolver = name_resolver or NameResolver()
+        
+    def create_session(self, retries, backoff_factor):
+        """Shared session with a connection pool sized for the worker pool and retry with backoff"""
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=['GET'],
+            respect_retry_after_header=True
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.max_workers, max_retries=retry)
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+    
+    def host_limit(self, url):
+        """Semaphore that caps concurrent requests to one host"""
+        host = urlparse(url).netloc
+        with self._host_limits_lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return self._host_limits[host]
+    
+    def http_get(self, url, headers=None):
+        """GET through the shared session, respecting the per-host concurrency limit"""
+        with self.host_limit(url):
+            return self.session.get(url, timeout=self.timeout, headers=headers)
+    
+    def count(self, stat):
+        """Thread-safe request statistics"""
+        with self._stats_lock:
+            self.stats[stat] += 1
+    
+    def game_url(self, game_id, endpoint):
+        """URL of a per-game JSON document (boxscore or pbp)"""
+        return f"{self.game_data_url}/{game_id}/{endpoint}.json"
+    
+    def game_status(self, data):
+        """Lower-cased game status from a document's meta block ('' when not reported)"""
+        if not data or 'meta' not in data:
+            return ''
+        meta = data['meta']
+        return str(meta.get('status') or meta.get('gameState') or '').strip().lower()
+    
+    def is_final_game(self, data):
+        """Finished games never change, so their documents can be cached permanently"""
+        return self.game_status(data) in ('f', 'final')
+    
+    def is_past_day(self, day, settle_days=2):
+        """Scoreboards for days safely in the past no longer change"""
+        try:
+            month, day_of_month = (int(part) for part in day.split('/'))
+            game_date = datetime(int(self.season), month, day_of_month)
+        except ValueError:
+            return False
+        return game_date < datetime.now() - timedelta(days=settle_days)
+    
+    def fetch(self, url, cache_key=None, final=False, as_json=True):
+        """Fetch a document through the response cache.
+        
+        final is a bool or a callable(body) deciding whether the payload can be kept permanently.
+        Expired entries are revalidated with If-None-Match / If-Modified-Since.
+        """
+        entry = self.cache.get(cache_key) if self.cache and cache_key else None
+        if entry and self.cache.is_fresh(entry, self.live_ttl):
+            self.count('cache_hits')
+            return entry['body']
+        
+        try:
+            headers = self.cache.validators(entry) if entry else None
+            response = self.http_get(url, headers=headers)
+            self.count('network')
+            if response.status_code == 304 and entry:
+                self.count('revalidated')
+                self.cache.touch(entry)
+                return entry['body']
+            response.raise_for_status()
+            body = response.json() if as_json else response.text
+            
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"Error fetching {url} via requests: {e}")
+            if not as_json:
+                return None
+
+            try:
+                result = os.popen(f'curl -s --max-time {int(self.timeout)} {url}').read()
+                body = json.loads(result)
+                response = None
+
+            except Exception as e:
+                print(f"Error fetching {url} using curl: {e}")
+                return None
+        
+        if self.cache and cache_key:
+            is_final = final(body) if callable(final) else final
+            self.cache.put(
+                cache_key, url, body, final=is_final,
+                etag=response.headers.get('ETag') if response is not None else None,
+                last_modified=response.headers.get('Last-Modified') if response is not None else None
+            )
+        return body
+    
+    def fetch_json(self, url, cache_key=None, final=False):
+        """Fetch a JSON document, falling back to curl if requests fails"""
+        return self.fetch(url, cache_key=cache_key, final=final, as_json=True)
+    
+    def fetch_game_documents(self, game_ids, endpoints=GAME_ENDPOINTS):
+        """Fetch every endpoint for every game in parallel; returns {game_id: {endpoint: data}}"""
+        documents = {game_id: {} for game_id in game_ids}
+        jobs = [(game_id, endpoint) for game_id in game_ids for endpoint in endpoints]
+        if not jobs:
+            return documents
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = executor.map(
+                lambda job: self.fetch_json(
+                    self.game_url(*job),
+                    cache_key=f"game:{job[0]}:{job[1]}",
+                    final=self.is_final_game
+                ),
+                jobs
+            )
+            for (game_id, endpoint), data in zip(jobs, results):
+                documents[game_id][endpoint] = data
+        
+        return documents
+        
     def get_game_ids(self, day):
         """Get game IDs for a specific day"""
-        url = f"https://www.ncaa.com/scoreboard/soccer-men/{self.division}/{self.season}/{day}"
+        url = f"{self.scoreboard_url}/{self.division}/{self.season}/{day}"
         print(f"Fetching games for {day}: {url}")
 
         try:
-            response = requests.get(url)
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
+            html = self.fetch(
+                url,
+                cache_key=f"scoreboard:{self.division}/{self.season}/{day}",
+                final=self.is_past_day(day),
+                as_json=False
+            )
+            if html is not None:
+                soup = BeautifulSoup(html, 'html.parser')
                 game_links = soup.find_all('a', class_='gamePod-link')
                 hrefs = [link['href'] for link in game_links]
                 game_ids = [href.split('/')[2] for href in hrefs]
                 print(f"Found {len(game_ids)} games")
                 return game_ids
             else:
-                print(f"Failed to retrieve webpage. Status code: {response.status_code}")
+                print(f"Failed to retrieve webpage: {url}")
                 return []
         except Exception as e:
             print(f"Error fetching game IDs for {day}: {e}")
@@ -102,30 +275,15 @@ class NCAADataCollector:
                 
         return players_list
 
-    def collect_data(self, game_ids):
+    def collect_data(self, game_ids, documents=None):
         """Collect player data from multiple games"""
+        if documents is None:
+            documents = self.fetch_game_documents(game_ids, endpoints=('boxscore',))
+        
         players_data = []
 
         for game_id in game_ids:
-            data = None
-
-            try:
-                response = requests.get(f'https://data.ncaa.com/casablanca/game/{game_id}/boxscore.json')
-                response.raise_for_status()
-                data = response.json()
-
-            except requests.exceptions.RequestException as e:
-                print(f"Error fetching data via requests for game ID {game_id}: {e}")
-
-                try:
-                    result = os.popen(
-                        f'curl https://data.ncaa.com/casablanca/game/{game_id}/boxscore.json'
-                    ).read()
-                    data = json.loads(result)
-
-                except Exception as e:
-                    print(f"Error fetching data for game ID {game_id} using curl: {e}")
-                    continue
+            data = documents.get(game_id, {}).get('boxscore')
 
             if data is None or 'meta' not in data:
                 print(f"Error: 'meta' key not found in data for game ID {game_id}")
@@ -138,120 +296,37 @@ class NCAADataCollector:
 
     def categorize_event(self, event):
         """Categorize play-by-play events"""
-        if 'Goal by' in event:
-            return 'Goal'
-        elif 'Shot by' in event:
-            return 'Shot'
-        elif 'Foul on' in event:
-            return 'Foul'
-        elif 'Corner kick' in event:
-            return 'Corner Kick'
-        elif 'Offside' in event:
-            return 'Offside'
-        else:
-            return 'Other'
+        for event_type, pattern in EVENT_TYPES:
+            if pattern.search(event):
+                return EVENT_LABELS[event_type]
+        return 'Other'
 
     def extract_player(self, event):
         """Extract player name from play-by-play event"""
-        pattern = r'\b[A-Z][a-z]+,?\s*[A-Z][a-z]+'
-        matches = re.findall(pattern, event)
-        return matches[0] if matches else None
+        match = PLAYER_PATTERN.search(event)
+        return match.group(1) if match else None
 
-    def collect_fouls_won(self, game_ids):
-        """Collect fouls won data from play-by-play"""
-        foul_data = []
-        
-        for game_id in game_ids:
-            data = None
-
-            try:
-                response = requests.get(f'https://data.ncaa.com/casablanca/game/{game_id}/pbp.json')
-                response.raise_for_status()
-                data = response.json()
-
-            except requests.exceptions.RequestException as e:
-                print(f"Error fetching PBP data via requests for game ID {game_id}: {e}")
-
-                try:
-                    result = os.popen(
-                        f'curl https://data.ncaa.com/casablanca/game/{game_id}/pbp.json'
-                    ).read()
-                    data = json.loads(result)
-
-                except Exception as e:
-                    print(f"Error fetching PBP data for game ID {game_id} using curl: {e}")
-                    continue
+    def collect_events(self, game_ids, documents=None):
+        """Typed play-by-play events for all games at once (see pbp_events)"""
+        if documents is None:
+            documents = self.fetch_game_documents(game_ids, endpoints=('pbp',))
+        return parse_events(flatten_pbp(game_ids, documents))
 
-            if not data or 'meta' not in data or 'periods' not in data:
-                print(f"Invalid PBP data for game ID {game_id}")
-                continue
-
-            home = data['meta']['teams'][0]['shortName']
-            away = data['meta']['teams'][1]['shortName']
-
-            events = []
-            score = '0-0'
-            for period in data['periods']:
-                for play in period['playStats']:
-                    score = play['score'] if play['score'] else score
-                    time = play['time']
-
-                    if play['visitorText']:
-                        team = 1
-                        event = play['visitorText']
-                    else:
-                        team = 0
-                        event = play['homeText']
-
-                    event_details = {
-                        'Score': score,
-                        'Time': time,
-                        'Event': event,
-                        'Team': team
-                    }
-                    events.append(event_details)
-
-            df = pd.DataFrame(events)
-            df['Name'] = df['Event'].apply(self.extract_player)
-            df['Name'] = df['Name'].apply(self.clean_name)
-            df['Event_Type'] = df['Event'].apply(self.categorize_event)
-            df['Team'] = df['Team'].apply(lambda x: home if x == 0 else away)
-            df['IsFoul'] = df['Event'].str.contains('Foul', case=False)
-
-            foul_df = df[df['IsFoul']]
-            foul_summary = foul_df.groupby(['Name', 'Team']).size().reset_index(name='Fouls')
-            foul_data.append(foul_summary)
-
-        if foul_data:
-            all_fouls = pd.concat(foul_data, ignore_index=True)
-            return all_fouls
-        else:
-            return pd.DataFrame(columns=['Name', 'Team', 'Fouls'])
+    def collect_fouls_won(self, game_ids, documents=None, events=None):
+        """Collect fouls won data from play-by-play"""
+        if events is None:
+            events = self.collect_events(game_ids, documents)
+        return fouls_won(events)
 
     def preprocess_name(self, name):
         """Preprocess names for fuzzy matching"""
-        if not name:
-            return ""
-        name = unidecode.unidecode(name).strip().lower()
-        return name
+        return preprocess_name(name)
 
     def create_name_mapping(self, *name_lists, similarity_threshold=90):
         """Create unified name mapping for consistency"""
-        all_names = set()
-        for names in name_lists:
-            all_names.update(self.preprocess_name(name) for name in names)
-        
-        standardized_names = {}
-        unique_processed_names = list(all_names)
-
-        for name in unique_processed_names:
-            match = process.extractOne(name, standardized_names.keys(), scorer=fuzz.WRatio)
-            if match and match[1] > similarity_threshold:
-                standardized_names[name] = standardized_names[match[0]]
-            else:
-                standardized_names[name] = name
-
-        return standardized_names
+        if similarity_threshold != self.name_resolver.similarity_threshold:
+            return build_name_mapping(*name_lists, similarity_threshold=similarity_threshold)
+        return self.name_resolver.resolve(*name_lists)
 
     def apply_name_mapping(self, names, name_mapping):
         """Apply name mapping to standardize names"""
@@ -281,21 +356,118 @@ class NCAADataCollector:
         return dominant_position
 
     def update_fouls_for_subset_names(self, df, fouls):
-        """Update fouls for players with partial name matches"""
+        """Update fouls for players with partial name matches.
+        
+        Each player without fouls gets the summed fouls of every same-team name that
+        contains, or is contained in, their name. Names are compared per team with
+        broadcast substring searches instead of scanning all fouls for every player.
+        """
         df = df.copy()
-        for idx, row in df.iterrows():
-            if row['Fouls Won'] == 0:
-                matching_fouls = fouls[
-                    (fouls['Team'] == row['Team']) &
-                    (fouls['Name'].apply(lambda x: row['Name'] in x or x in row['Name']))
-                ]
-                if not matching_fouls.empty:
-                    total_fouls = matching_fouls['Fouls'].sum()
-                    df.at[idx, 'Fouls Won'] = total_fouls
+        missing = df[df['Fouls Won'] == 0]
+        if missing.empty or fouls.empty:
+            return df
+        
+        fouls_by_team = {
+            team: (np.asarray(group['Name'], dtype=str), group['Fouls'].to_numpy())
+            for team, group in fouls.groupby('Team', sort=False)
+        }
+        
+        for team, players in missing.groupby('Team', sort=False):
+            if team not in fouls_by_team:
+                continue
+            foul_names, foul_counts = fouls_by_team[team]
+            player_names = np.asarray(players['Name'], dtype=str)[:, None]
+            
+            # players x foul names: either name is a substring of the other
+            matches = (np.char.find(foul_names, player_names) >= 0) | (np.char.find(player_names, foul_names) >= 0)
+            matched = matches.any(axis=1)
+            if matched.any():
+                df.loc[players.index[matched], 'Fouls Won'] = matches[matched] @ foul_counts
         return df
 
-    def collect_season_data(self, start_date, end_date, description=""):
-        """Collect data for a date range (main collection method)"""
+    def aggregate_player_stats(self, dfs, fouls, resolve_positions=True):
+        """Merge box score rows and fouls won into one row per player and team.
+        
+        With resolve_positions=False the concatenated raw position codes are kept,
+        so per-game lines can be re-aggregated into season totals later.
+        """
+        # Clean and standardize names
+        dfs['Name'] = dfs['Name'].apply(self.clean_name)
+        fouls['Name'] = fouls['Name'].apply(self.clean_name)
+
+        # Create unified name mapping
+        all_names = list(dfs['Name']) + list(fouls['Name'])
+        name_mapping = self.create_name_mapping(all_names)
+
+        # Apply name standardization
+        dfs['Name'] = self.apply_name_mapping(dfs['Name'], name_mapping)
+        fouls['Name'] = self.apply_name_mapping(fouls['Name'], name_mapping)
+
+        # Group and aggregate data
+        final_df = dfs.groupby(['Name', 'Team'], as_index=False).sum()
+        fouls = fouls.groupby(['Name', 'Team'], as_index=False).sum()
+
+        # Filter valid names
+        player_stats = final_df[final_df['Name'].notnull() & (final_df['Name'].str.strip() != '')]
+
+        # Merge fouls data
+        player_stats = pd.merge(player_stats, fouls, on=['Name', 'Team'], how='left', suffixes=('', '_fouls'))
+        player_stats['Fouls Won'] = player_stats['Fouls'].fillna(0)
+
+        # Update fouls for subset name matches
+        player_stats = self.update_fouls_for_subset_names(player_stats, fouls)
+
+        # Standardize positions
+        if resolve_positions:
+            player_stats['Position'] = player_stats['Position'].apply(self.dominant_position)
+        player_stats['Name'] = player_stats['Name'].apply(lambda x: x.title())
+
+        # Final column selection
+        return player_stats[PLAYER_STAT_COLUMNS]
+
+    def collect_game_lines(self, game_ids, documents=None, events=None):
+        """Per-game player lines (box score plus fouls won) for finished games.
+        
+        Returns one row per player per game with a leading 'Game ID' column. Games
+        reporting a non-final status are skipped so they are picked up once final.
+        """
+        if documents is None:
+            documents = self.fetch_game_documents(game_ids)
+        if events is None:
+            events = self.collect_events(game_ids, documents)
+        events_by_game = dict(tuple(events.groupby('game_id', sort=False)))
+        
+        lines = []
+        for game_id in game_ids:
+            data = documents.get(game_id, {}).get('boxscore')
+
+            if data is None or 'meta' not in data:
+                print(f"Error: 'meta' key not found in data for game ID {game_id}")
+                continue
+
+            status = self.game_status(data)
+            if status and not self.is_final_game(data):
+                print(f"⏳ Skipping game {game_id} (status '{status}') until it is final")
+                continue
+
+            players = pd.DataFrame(self.clean_data(data))
+            if players.empty:
+                continue
+
+            fouls = fouls_won(events_by_game.get(game_id, events.iloc[:0]))
+            game_lines = self.aggregate_player_stats(players, fouls, resolve_positions=False)
+            game_lines.insert(0, 'Game ID', game_id)
+            lines.append(game_lines)
+
+        if lines:
+            return pd.concat(lines, ignore_index=True)
+        return pd.DataFrame(columns=['Game ID'] + PLAYER_STAT_COLUMNS)
+
+    def collect_season_data(self, start_date, end_date, description="", progress=None):
+        """Collect data for a date range (main collection method).
+
+        `progress` (a jobs.JobProgress) is told about days scanned and games fetched.
+        """
         print(f"🏈 Starting data collection for {self.season} season")
         print(f"📅 Date range: {start_date} to {end_date}")
         
@@ -306,19 +478,33 @@ class NCAADataCollector:
         # Initialize storage
         dfs = []
         fouls = []
+        # Parsed play-by-play for the whole range, for the caller to store in match_events
+        self.collected_events = []
         
         print(f"🔄 Processing {len(time_range)} days...")
+        if progress:
+            progress.start('scan', total=len(time_range))
+            progress.start('fetch')
         
         # Collect data for each day
-        for day in time_range:
+        for date, day in zip(date_range, time_range):
             try:
                 game_ids = self.get_game_ids(day)
                 if not game_ids:
                     print(f"No games found for {day}")
                     continue
                     
-                players_data = self.collect_data(game_ids)
-                fouls_won = self.collect_fouls_won(game_ids)
+                # Fetch boxscore and play-by-play for all of the day's games concurrently
+                started = time.time()
+                documents = self.fetch_game_documents(game_ids)
+                print(f"⬇️  Fetched {len(game_ids)} games in {time.time() - started:.1f}s")
+                if progress:
+                    progress.advance('fetch', len(game_ids))
+                
+                players_data = self.collect_data(game_ids, documents)
+                events = self.collect_events(game_ids, documents)
+                fouls_won = self.collect_fouls_won(game_ids, events=events)
+                self.collected_events.append(events.assign(game_date=date.strftime('%Y-%m-%d')))
 
                 flattened_data = [player for game in players_data for player in game]
                 
@@ -330,6 +516,13 @@ class NCAADataCollector:
             except Exception as e:
                 print(f"❌ Error processing {day}: {e}")
                 continue
+            finally:
+                if progress:
+                    progress.advance('scan')
+
+        if progress:
+            progress.finish('scan')
+            progress.finish('fetch')
 
         if not dfs:
             print("❌ No data collected")
@@ -339,41 +532,10 @@ class NCAADataCollector:
         print("🔄 Consolidating data...")
         dfs = pd.concat(dfs, ignore_index=True)
         fouls = pd.concat(fouls, ignore_index=True)
-
-        # Clean and standardize names
-        dfs['Name'] = dfs['Name'].apply(self.clean_name)
-        fouls['Name'] = fouls['Name'].apply(self.clean_name)
-
-        # Create unified name mapping
-        all_names = list(dfs['Name']) + list(fouls['Name'])
-        name_mapping = self.create_name_mapping(all_names)
-
-        # Apply name standardization
-        dfs['Name'] = self.apply_name_mapping(dfs['Name'], name_mapping)
-        fouls['Name'] = self.apply_name_mapping(fouls['Name'], name_mapping)
-
-        # Group and aggregate data
-        final_df = dfs.groupby(['Name', 'Team'], as_index=False).sum()
-        fouls = fouls.groupby(['Name', 'Team'], as_index=False).sum()
-
-        # Filter valid names
-        player_stats = final_df[final_df['Name'].notnull() & (final_df['Name'].str.strip() != '')]
-
-        # Merge fouls data
-        player_stats = pd.merge(player_stats, fouls, on=['Name', 'Team'], how='left', suffixes=('', '_fouls'))
-        player_stats['Fouls Won'] = player_stats['Fouls'].fillna(0)
-
-        # Update fouls for subset name matches
-        player_stats = self.update_fouls_for_subset_names(player_stats, fouls)
-
-        # Standardize positions
-        player_stats['Position'] = player_stats['Position'].apply(self.dominant_position)
-        player_stats['Name'] = player_stats['Name'].apply(lambda x: x.title())
-
-        # Final column selection
-        player_stats = player_stats[['Name', 'Team', 'Position', 'Minutes Played', 'Goals', 'Assists', 'Shots', 'Shots On Target', 'Fouls Won']]
+        player_stats = self.aggregate_player_stats(dfs, fouls)
 
         print(f"✅ Data collection completed!")
+        print(f"🌐 Network requests: {self.stats['network']} | Cache hits: {self.stats['cache_hits']} | Revalidated: {self.stats['revalidated']}")
         print(f"📊 Total players: {len(player_stats)}")
         print(f"🏟️  Total teams: {player_stats['Team'].nunique()}")
         
@@ -0,0 +1,166 @@
+"""
+Delta-Encoded Player History for NCAA Soccer Dashboard
+player_history stores one row per version of a player's season line. A snapshot only adds
+rows for the players whose line changed (or who are new) and closes the versions they
+replace, instead of copying every player every week. Each version is valid from its
+valid_from snapshot up to (not including) valid_to, so the players at any (season,
+snapshot_date) are one indexed range read: valid_to > date AND valid_from <= date.
+player_stats_history is a view over it with the old one-row-per-player-per-snapshot shape.
+"""
+
+# A new version is stored only when one of these changed since the previous snapshot
+HISTORY_COLUMNS = ['position', 'minutes_played', 'goals', 'assists', 'shots',
+                   'shots_on_target', 'fouls_won', 'conference']
+
+# valid_to of versions that are still current; a date rather than NULL keeps
+# "valid_to > date" a single index range
+OPEN_ENDED = '9999-12-31'
+
+# The players table's columns as they stood at :history_season / :history_date, for use in
+# place of `players` in a FROM clause (SQLite flattens it onto idx_player_history_asof)
+AS_OF_SQL = f"""(
+    SELECT player_history.rowid AS rowid, player_name AS name, team, {', '.join(HISTORY_COLUMNS)},
+           season, :history_date AS data_date
+    FROM player_history
+    WHERE season = :history_season AND valid_to > :history_date AND valid_from <= :history_date
+) AS players"""
+
+_COLUMNS = ', '.join(HISTORY_COLUMNS)
+_SAME_LINE = ' AND '.join(f"history_incoming.{column} IS player_history.{column}" for column in HISTORY_COLUMNS)
+
+
+def snapshot_rows(conn, season, snapshot_date):
+    """(player_name, team, *HISTORY_COLUMNS) for every player in a snapshot"""
+    return conn.execute(f"""
+        SELECT player_name, team, {_COLUMNS}
+        FROM player_history
+        WHERE season = ? AND valid_to > ? AND valid_from <= ?
+        ORDER BY player_name, team
+    """, (season, snapshot_date, snapshot_date)).fetchall()
+
+
+def players_snapshot_rows(conn, season, snapshot_date):
+    """(player_name, team, *HISTORY_COLUMNS) for a snapshot as the players table holds it"""
+    return conn.execute(f"""
+        SELECT name, team, {_COLUMNS} FROM players
+        WHERE season = ? AND data_date = ? AND name IS NOT NULL AND team IS NOT NULL
+        ORDER BY rowid
+    """, (season, snapshot_date)).fetchall()
+
+
+def append_history_snapshot(conn, season, snapshot_date, rows):
+    """Record a snapshot newer than every stored one; returns the number of versions written.
+
+    rows are (player_name, team, *HISTORY_COLUMNS); a repeated (player_name, team) keeps the last.
+    """
+    # Typed like player_history so 4.0 fouls compare equal to a stored 4
+    conn.execute("""
+        CREATE TEMP TABLE IF NOT EXISTS history_incoming (
+            player_name TEXT NOT NULL,
+            team TEXT NOT NULL,
+            position TEXT,
+            minutes_played INTEGER,
+            goals INTEGER,
+            assists INTEGER,
+            shots INTEGER,
+            shots_on_target INTEGER,
+            fouls_won INTEGER,
+            conference TEXT,
+            PRIMARY KEY (player_name, team)
+        )
+    """)
+    conn.execute("DELETE FROM history_incoming")
+    conn.executemany(f"""
+        INSERT OR REPLACE INTO history_incoming (player_name, team, {_COLUMNS})
+        VALUES (?, ?, {', '.join('?' * len(HISTORY_COLUMNS))})
+    """, rows)
+
+    # OPEN_ENDED is spelled out rather than bound so SQLite can use idx_player_history_open
+    params = {'season': season, 'date': snapshot_date}
+    # Close the versions whose line changed or whose player is no longer listed
+    conn.execute(f"""
+        UPDATE player_history SET valid_to = :date
+        WHERE season = :season AND valid_to = '{OPEN_ENDED}' AND NOT EXISTS (
+            SELECT 1 FROM history_incoming
+            WHERE history_incoming.player_name = player_history.player_name
+              AND history_incoming.team = player_history.team
+              AND {_SAME_LINE}
+        )
+    """, params)
+    # Every line left without an open version is new or changed
+    written = conn.execute(f"""
+        INSERT INTO player_history (season, player_name, team, valid_from, valid_to, {_COLUMNS})
+        SELECT :season, player_name, team, :date, '{OPEN_ENDED}', {_COLUMNS}
+        FROM history_incoming
+        WHERE NOT EXISTS (
+            SELECT 1 FROM player_history
+            WHERE player_history.season = :season
+              AND player_history.player_name = history_incoming.player_name
+              AND player_history.team = history_incoming.team
+              AND player_history.valid_to = '{OPEN_ENDED}'
+        )
+    """, params).rowcount
+    conn.execute("DELETE FROM history_incoming")
+    return written
+
+
+def store_history_snapshot(conn, season, snapshot_date, rows):
+    """Record (or replace) a snapshot at any date; call inside the writer's transaction.
+
+    The usual case appends after the newest snapshot. An older date rewinds the season to
+    just before it and replays the later snapshots (listed in data_snapshots) on top.
+    """
+    later = [row[0] for row in conn.execute("""
+        SELECT snapshot_date FROM data_snapshots
+        WHERE season = ? AND snapshot_date > ?
+        ORDER BY snapshot_date
+    """, (season, snapshot_date))]
+    replay = [(date, snapshot_rows(conn, season, date)) for date in later]
+
+    # valid_to > valid_from, so the valid_to bound only lets the delete use the as-of index
+    conn.execute("""
+        DELETE FROM player_history WHERE season = ? AND valid_to > ? AND valid_from >= ?
+    """, (season, snapshot_date, snapshot_date))
+    conn.execute("""
+        UPDATE player_history SET valid_to = ?
+        WHERE season = ? AND valid_to >= ? AND valid_to != ?
+    """, (OPEN_ENDED, season, snapshot_date, OPEN_ENDED))
+
+    written = append_history_snapshot(conn, season, snapshot_date, rows)
+    for date, date_rows in replay:
+        append_history_snapshot(conn, season, date, date_rows)
+    return written
+
+
+def rebuild_season_history(conn, season):
+    """Re-encode a season's history from the players table; call inside the writer's transaction.
+
+    For changes that rewrite players across snapshots (conference updates). Snapshots whose
+    players rows are gone keep the lines history already had for them.
+    """
+    dates = [row[0] for row in conn.execute("""
+        SELECT snapshot_date FROM data_snapshots WHERE season = ? ORDER BY snapshot_date
+    """, (season,))]
+    snapshots = [(date, players_snapshot_rows(conn, season, date) or snapshot_rows(conn, season, date))
+                 for date in dates]
+
+    conn.execute("DELETE FROM player_history WHERE season = ?", (season,))
+    return sum(append_history_snapshot(conn, season, date, rows) for date, rows in snapshots)
+
+
+def player_conferences(conn):
+    """{players rowid: conference}, taken before a conference update for rebuild_changed_conferences"""
+    return dict(conn.execute("SELECT rowid, conference FROM players"))
+
+
+def rebuild_changed_conferences(conn, before):
+    """Re-encode only the snapshotted seasons where a player's conference differs from `before`;
+    returns those seasons. Call inside the same writer transaction as the update."""
+    snapshotted = {row[0] for row in conn.execute("SELECT DISTINCT season FROM data_snapshots")}
+    changed = sorted({
+        season for rowid, season, conference in conn.execute("SELECT rowid, season, conference FROM players")
+        if season in snapshotted and before.get(rowid) != conference
+    })
+    for season in changed:
+        rebuild_season_history(conn, season)
+    return changed
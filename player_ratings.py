@@ -1,8 +1,5 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
-from matplotlib.patches import Circle
 import sqlite3
 import os
 import warnings
@@ -18,6 +15,10 @@ def load_data():
     player_df = pd.read_csv('data/d1_player_stats.csv')
     team_df = pd.read_csv('data/ncaa_ratings.csv')
 
+    return prepare_player_data(player_df, team_df), mls_2025_drafted_players
+
+def prepare_player_data(player_df, team_df):
+    """Filter rateable players and merge in their team's ATT/DEF ratings"""
     # Clean up data - drop Unnamed columns if they exist
     if 'Unnamed: 0' in player_df.columns:
         player_df = player_df.drop(columns=['Unnamed: 0'])
@@ -30,15 +31,16 @@ def load_data():
     player_df['Team'] = player_df['Team'].str.strip()
     team_df['Team'] = team_df['Team'].str.strip()
 
-    player_df['Shot Accuracy'] = player_df.apply(
-        lambda row: row['Shots On Target'] / row['Shots'] if row['Shots'] > 0 else 0,
-        axis=1
+    shots = player_df['Shots'].to_numpy(dtype=float)
+    shots_on_target = player_df['Shots On Target'].to_numpy(dtype=float)
+    player_df['Shot Accuracy'] = np.divide(
+        shots_on_target, shots, out=np.zeros(len(player_df)), where=shots > 0
     )
 
     # Merge player and team data
     merged_df = player_df.merge(team_df, on='Team', suffixes=('_player', '_team'))
     
-    return merged_df, mls_2025_drafted_players
+    return merged_df
 
 def calculate_per90_stats(df):
     """Calculate per-90 statistics"""
@@ -60,10 +62,8 @@ def normalize_stats(df):
     df['Norm_DEF'] = (df['DEF'].max() - df['DEF']) / (df['DEF'].max() - df['DEF'].min())
     
     # Calculate team minutes played percentage
-    team_minutes = df.groupby('Team')['Minutes Played'].sum()
-    df['Team_Minutes_Played_Percentage'] = df.apply(
-        lambda row: row['Minutes Played'] / team_minutes[row['Team']], axis=1
-    )
+    team_minutes = df.groupby('Team')['Minutes Played'].transform('sum')
+    df['Team_Minutes_Played_Percentage'] = df['Minutes Played'] / team_minutes
     
     # FIXED: Create a proper weighting factor for team contributions
     # Use a sigmoid curve that rewards significant playing time
@@ -112,6 +112,78 @@ def get_position_weights():
         }
     }
 
+# Row order of the position weight matrix; anything else is rated as Unknown
+RATING_POSITIONS = ['Forward', 'Midfielder', 'Defender', 'Unknown']
+
+# Column order of the position weight matrix, matching the summation order in calculate_rating
+RATING_COMPONENTS = ['Goals', 'Assists', 'Shots', 'Fouls_Won', 'Team']
+
+# Which team weight each position uses for the team component
+TEAM_WEIGHT_KEYS = {
+    'Forward': 'Team_Att',
+    'Midfielder': 'Team_Att_Def',
+    'Defender': 'Team_Def',
+    'Unknown': 'Team_Att_Def'
+}
+
+def get_position_weight_matrix(weights=None):
+    """Express the position weights as a (positions x components) NumPy matrix"""
+    if weights is None:
+        weights = get_position_weights()
+    
+    return np.array([
+        [
+            weights[position]['Goals'],
+            weights[position]['Assists'],
+            weights[position]['Shots'],
+            weights[position]['Fouls_Won'],
+            weights[position][TEAM_WEIGHT_KEYS[position]]
+        ]
+        for position in RATING_POSITIONS
+    ])
+
+def get_position_codes(positions):
+    """Map position names to rows of the position weight matrix"""
+    positions = np.asarray(positions, dtype=object)
+    return np.select(
+        [positions == 'Forward', positions == 'Midfielder', positions == 'Defender'],
+        [0, 1, 2],
+        default=3
+    )
+
+def calculate_ratings_vectorized(df, weights=None):
+    """Calculate Overall_Rating for every player at once (same arithmetic as calculate_rating)"""
+    weight_matrix = get_position_weight_matrix(weights)
+    codes = get_position_codes(df['Position'])
+    
+    norm_att = df['Norm_ATT'].to_numpy(dtype=float)
+    norm_def = df['Norm_DEF'].to_numpy(dtype=float)
+    
+    # Forwards use team attack, defenders team defense, everyone else the average of both
+    team_input = np.select(
+        [codes == 0, codes == 2],
+        [norm_att, norm_def],
+        default=(norm_att + norm_def) / 2
+    )
+    
+    features = np.column_stack([
+        df['Norm_Goals'].to_numpy(dtype=float),
+        df['Norm_Assists'].to_numpy(dtype=float),
+        df['Norm_Shots'].to_numpy(dtype=float),
+        df['Norm_Fouls_Won'].to_numpy(dtype=float),
+        team_input * df['Team_Impact_Factor'].to_numpy(dtype=float)
+    ])
+    
+    # Per-player weights picked from the matrix in one shot
+    contributions = features * weight_matrix[codes]
+    
+    # Sum the components left to right so results match the row-wise formula bit for bit
+    rating = contributions[:, 0]
+    for component in range(1, len(RATING_COMPONENTS)):
+        rating = rating + contributions[:, component]
+    
+    return rating * 100
+
 def calculate_rating(row, weights):
     """Calculate player rating based on position"""
     if row['Position'] == 'Forward':
@@ -152,8 +224,8 @@ def calculate_max_ratings(df):
     """Calculate MAX ratings for all players using optimized weights"""
     weights = get_position_weights()
     
-    # Apply the rating calculation
-    df['Overall_Rating'] = df.apply(lambda row: calculate_rating(row, weights), axis=1)
+    # Apply the rating calculation to all players at once
+    df['Overall_Rating'] = calculate_ratings_vectorized(df, weights)
     
     # Separate known and unknown position players for different scaling
     known_positions = df[df['Position'].isin(['Forward', 'Midfielder', 'Defender'])]
@@ -192,31 +264,76 @@ def calculate_max_ratings(df):
     
     return df
 
-def calculate_percentiles_by_position(df):
+PERCENTILE_METRICS = ['Goals_per90', 'Assists_per90', 'Shots_per90', 'Shots On Target_per90', 'Fouls Won_per90']
+PERCENTILE_POSITIONS = ['Forward', 'Midfielder', 'Defender', 'Unknown']
+
+class PercentileIndex:
+    """Sorted per-position arrays of each per-90 metric for O(log n) percentile lookups
+
+    Matches pandas rank(pct=True) * 100 rounded to one decimal: tied values share the
+    average rank, i.e. (count below + 1 + count at or below) / 2 out of the position's n.
+    """
+
+    def __init__(self, df, metrics=None, positions=None):
+        self.metrics = list(metrics or PERCENTILE_METRICS)
+        self.positions = list(positions or PERCENTILE_POSITIONS)
+        self.sorted_values = {}
+        for position in self.positions:
+            position_df = df[df['Position'] == position]
+            for metric in self.metrics:
+                values = position_df[metric].to_numpy(dtype=float)
+                self.sorted_values[(position, metric)] = np.sort(values[~np.isnan(values)])
+
+    def percentiles(self, position, metric, values):
+        """Percentile of each value among players at the position (NaN stays NaN)"""
+        values = np.asarray(values, dtype=float)
+        sorted_values = self.sorted_values.get((position, metric))
+        if sorted_values is None or len(sorted_values) == 0:
+            return np.zeros(values.shape)
+        below = np.searchsorted(sorted_values, values, side='left')
+        at_or_below = np.searchsorted(sorted_values, values, side='right')
+        result = ((below + 1 + at_or_below) / 2 / len(sorted_values) * 100).round(1)
+        return np.where(np.isnan(values), np.nan, result)
+
+    def percentile(self, position, metric, value):
+        """Percentile of a single value among players at the position"""
+        return float(self.percentiles(position, metric, [value])[0])
+
+    def player_percentiles(self, player_data):
+        """The {metric}_percentile_{position} columns for one player's own position"""
+        position = player_data.get('Position')
+        if position not in self.positions:
+            return {}
+        return {
+            f'{metric}_percentile_{position}': self.percentile(position, metric, player_data.get(metric, np.nan))
+            for metric in self.metrics
+        }
+
+def calculate_percentiles_by_position(df, index=None):
     """Calculate percentile rankings for radar charts"""
-    metrics = ['Goals_per90', 'Assists_per90', 'Shots_per90', 'Shots On Target_per90', 'Fouls Won_per90']
+    index = index or PercentileIndex(df)
     
-    for position in ['Forward', 'Midfielder', 'Defender', 'Unknown']:
-        position_df = df[df['Position'] == position]
-        for metric in metrics:
+    for position in index.positions:
+        in_position = df['Position'] == position
+        for metric in index.metrics:
             percentile_col = f'{metric}_percentile_{position}'
-            df[percentile_col] = 0
-            if not position_df.empty:
-                df.loc[df['Position'] == position, percentile_col] = (
-                    position_df[metric].rank(pct=True) * 100
-                ).round(1)
+            df[percentile_col] = 0.0
+            if in_position.any():
+                df.loc[in_position, percentile_col] = index.percentiles(position, metric, df.loc[in_position, metric])
     
     return df
 
-def create_radar_chart(player_name, player_data, output_dir='static/radars', force_regenerate=False):
+def create_radar_chart(player_name, player_data, output_dir='static/radars', force_regenerate=False, filename=None):
     """Create a professional-looking radar chart for a player"""
+    # matplotlib is only loaded by the processes that actually draw charts
     import matplotlib
     matplotlib.use('Agg')  # Use non-interactive backend for faster generation
+    import matplotlib.pyplot as plt
     
     os.makedirs(output_dir, exist_ok=True)
     
     # Generate filename
-    filename = f"{player_name.replace(' ', '_').replace('.', '')}_radar.png"
+    filename = filename or f"{player_name.replace(' ', '_').replace('.', '')}_radar.png"
     filepath = os.path.join(output_dir, filename)
     
     # Check if chart already exists and is recent (unless forced to regenerate)
@@ -364,40 +481,31 @@ def create_radar_chart(player_name, player_data, output_dir='static/radars', for
         plt.close('all')  # Close any open figures
         return None
 
-def get_player_rating_data(player_name, generate_chart=True):
-    """Get rating data for a specific player with optimized loading"""
+def get_player_rating_data(player_name, generate_chart=True, team=None):
+    """Get rating data for a specific player from the precomputed ratings store"""
     try:
-        print(f"Loading rating data for {player_name}...")
+        from ratings_store import get_ratings_store
         
-        # Load and process data with minimal operations
-        merged_df, _ = load_data()
-        
-        # Find the specific player first to avoid processing all data
-        player_row = merged_df[merged_df['Name'] == player_name]
-        if player_row.empty:
+        # The store computes the whole league once and serves lookups from memory
+        player_data = get_ratings_store().get_player(player_name, team=team)
+        if player_data is None:
             print(f"Player {player_name} not found in data")
             return None
         
-        # Only calculate stats for this player if found
-        merged_df = calculate_per90_stats(merged_df)
-        merged_df = normalize_stats(merged_df)
-        merged_df = calculate_max_ratings(merged_df)
-        merged_df = calculate_percentiles_by_position(merged_df)
-        
-        # Get the updated player data
-        player_row = merged_df[merged_df['Name'] == player_name]
-        player_data = player_row.iloc[0].to_dict()
-        
-        # Generate radar chart on demand with error protection
+        # RADAR_BACKEND=svg draws an inline SVG; png serves cached images rendered in the background pool
+        player_data['radar_chart'] = None
+        player_data['radar_svg'] = None
         if generate_chart:
             try:
-                radar_filename = create_radar_chart(player_name, player_data)
-                player_data['radar_chart'] = radar_filename
+                if os.getenv('RADAR_BACKEND', 'svg').lower() == 'png':
+                    from radar_service import get_radar_service
+                    wait = float(os.getenv('RADAR_RENDER_WAIT', '0'))
+                    player_data['radar_chart'] = get_radar_service().get_chart(player_name, player_data, wait=wait)
+                else:
+                    from radar_svg import render_radar_svg
+                    player_data['radar_svg'] = render_radar_svg(player_name, player_data)
             except Exception as e:
                 print(f"Error generating chart for {player_name}: {e}")
-                player_data['radar_chart'] = None
-        else:
-            player_data['radar_chart'] = None
         
         return player_data
         
@@ -405,111 +513,82 @@ def get_player_rating_data(player_name, generate_chart=True):
         print(f"Error processing player {player_name}: {e}")
         return None
 
-def get_team_max_ratings():
-    """Calculate team MAX ratings using the original ncaaMatchPredictor method"""
-    try:
-        import sqlite3
-        
-        # Connect to database and get match data
-        conn = sqlite3.connect('data/ncaa_soccer.db')
-        
-        # Get NCAA averages
-        df = pd.read_sql_query("SELECT * FROM matches", conn)
-        ncaa_avg_home_goals = df['home_team_score'].mean()
-        ncaa_avg_away_goals = df['away_team_score'].mean()
-        
-        # Cap goal differences at maximum of 5 goals
-        df['capped_home_team_score'] = df.apply(
-            lambda row: min(row['home_team_score'], row['away_team_score'] + 5), axis=1
-        )
-        df['capped_away_team_score'] = df.apply(
-            lambda row: min(row['away_team_score'], row['home_team_score'] + 5), axis=1
-        )
+def calculate_team_max_ratings(df):
+    """Calculate team ATT/DEF/STR/MAX from a matches DataFrame using the original ncaaMatchPredictor method"""
+    df = df.copy()
+    
+    # Get NCAA averages
+    ncaa_avg_home_goals = df['home_team_score'].mean()
+    ncaa_avg_away_goals = df['away_team_score'].mean()
+    
+    # Cap goal differences at maximum of 5 goals
+    df['capped_home_team_score'] = np.minimum(df['home_team_score'], df['away_team_score'] + 5)
+    df['capped_away_team_score'] = np.minimum(df['away_team_score'], df['home_team_score'] + 5)
+    
+    def side_ratings(side, other, avg_for, avg_against):
+        """Aggregate one side (home or away) with single groupby passes"""
+        team_col = f'{side}_team'
+        conf_col = f'{side}_team_conference'
+        capped_for = f'capped_{side}_team_score'
+        capped_against = f'capped_{other}_team_score'
         
         # Get unique teams and conferences (excluding non-D1)
-        teams = df[df['home_team_conference'] != 'Not D1'][['home_team', 'home_team_conference']].drop_duplicates()
-        home_df = teams.copy()
-        home_df.columns = ['Team', 'Conference']
-        
-        # Calculate home stats using capped scores
-        home_df['MP'] = home_df['Team'].apply(lambda team: len(df[df['home_team'] == team]))
-        home_df['GF'] = home_df['Team'].apply(lambda team: df[df['home_team'] == team]['capped_home_team_score'].sum())
-        home_df['GA'] = home_df['Team'].apply(lambda team: df[df['home_team'] == team]['capped_away_team_score'].sum())
-        
-        # Calculate conference averages for home games
-        conf_home_avg = df[df['home_team_conference'] != 'Not D1'].groupby('home_team_conference')['capped_home_team_score'].mean()
-        conf_away_avg_vs_home = df[df['home_team_conference'] != 'Not D1'].groupby('home_team_conference')['capped_away_team_score'].mean()
-        
-        home_df['ATT'] = home_df.apply(
-            lambda row: ((row['GF'] / row['MP']) / ncaa_avg_home_goals) * 
-                        (conf_home_avg[row['Conference']] / ncaa_avg_home_goals) if row['MP'] > 0 else 0,
-            axis=1
-        )
-        
-        home_df['DEF'] = home_df.apply(
-            lambda row: ((row['GA'] / row['MP']) / ncaa_avg_away_goals) * 
-                        (conf_away_avg_vs_home[row['Conference']] / ncaa_avg_away_goals) if row['MP'] > 0 else 0,
-            axis=1
+        d1 = df[df[conf_col] != 'Not D1']
+        side_df = d1[[team_col, conf_col]].drop_duplicates()
+        side_df.columns = ['Team', 'Conference']
+        
+        # Calculate per-team totals using capped scores
+        totals = df.groupby(team_col).agg(
+            MP=(capped_for, 'size'),
+            GF=(capped_for, 'sum'),
+            GA=(capped_against, 'sum')
         )
-        
-        # Get away stats
-        teams_away = df[df['away_team_conference'] != 'Not D1'][['away_team', 'away_team_conference']].drop_duplicates()
-        away_df = teams_away.copy()
-        away_df.columns = ['Team', 'Conference']
-        
-        away_df['MP'] = away_df['Team'].apply(lambda team: len(df[df['away_team'] == team]))
-        away_df['GF'] = away_df['Team'].apply(lambda team: df[df['away_team'] == team]['capped_away_team_score'].sum())
-        away_df['GA'] = away_df['Team'].apply(lambda team: df[df['away_team'] == team]['capped_home_team_score'].sum())
-        
-        # Calculate conference averages for away games
-        conf_away_avg = df[df['away_team_conference'] != 'Not D1'].groupby('away_team_conference')['capped_away_team_score'].mean()
-        conf_home_avg_vs_away = df[df['away_team_conference'] != 'Not D1'].groupby('away_team_conference')['capped_home_team_score'].mean()
-        
-        away_df['ATT'] = away_df.apply(
-            lambda row: ((row['GF'] / row['MP']) / ncaa_avg_away_goals) * 
-                        (conf_away_avg[row['Conference']] / ncaa_avg_away_goals) if row['MP'] > 0 else 0,
-            axis=1
+        side_df['MP'] = side_df['Team'].map(totals['MP']).fillna(0).astype(int)
+        side_df['GF'] = side_df['Team'].map(totals['GF']).fillna(0).astype(int)
+        side_df['GA'] = side_df['Team'].map(totals['GA']).fillna(0).astype(int)
+        
+        # Calculate conference averages for this side
+        conf_for_avg = d1.groupby(conf_col)[capped_for].mean()
+        conf_against_avg = d1.groupby(conf_col)[capped_against].mean()
+        
+        played = side_df['MP'] > 0
+        side_df['ATT'] = np.where(
+            played,
+            ((side_df['GF'] / side_df['MP']) / avg_for) * (side_df['Conference'].map(conf_for_avg) / avg_for),
+            0
         )
-        
-        away_df['DEF'] = away_df.apply(
-            lambda row: ((row['GA'] / row['MP']) / ncaa_avg_home_goals) * 
-                        (conf_home_avg_vs_away[row['Conference']] / ncaa_avg_home_goals) if row['MP'] > 0 else 0,
-            axis=1
+        side_df['DEF'] = np.where(
+            played,
+            ((side_df['GA'] / side_df['MP']) / avg_against) * (side_df['Conference'].map(conf_against_avg) / avg_against),
+            0
         )
-        
-        # Merge home and away dataframes
-        overall_df = pd.merge(home_df, away_df, on=['Team', 'Conference'], how='inner')
-        
-        # Combine metrics
-        metrics = ['MP', 'GF', 'GA', 'ATT', 'DEF']
-        for metric in metrics:
-            overall_df[metric] = overall_df[f'{metric}_x'] + overall_df[f'{metric}_y']
-        
-        # Drop _x and _y columns
-        columns_to_drop = [f'{metric}_x' for metric in metrics] + [f'{metric}_y' for metric in metrics]
-        overall_df = overall_df.drop(columns=columns_to_drop)
-        
-        # Average ATT and DEF metrics
-        overall_df['ATT'] = overall_df['ATT'] / 2
-        overall_df['DEF'] = overall_df['DEF'] / 2
-        
-        # Calculate STR using linear defense scaling (Option 2)
-        max_def = overall_df['DEF'].max()
-        overall_df['STR'] = (overall_df['ATT'] * 0.5 + (max_def - overall_df['DEF']) * 0.5)
-        overall_df['MAX'] = (overall_df['STR'] - overall_df['STR'].min()) / (overall_df['STR'].max() - overall_df['STR'].min()) * 100
-        
-        conn.close()
-        return overall_df[['Team', 'ATT', 'DEF', 'MAX']].to_dict('records')
-        
-    except Exception as e:
-        print(f"Error calculating team ratings: {e}")
-        # Fallback to CSV file if calculation fails
-        try:
-            team_df = pd.read_csv('data/ncaa_ratings.csv')
-            team_df = team_df.drop(columns=['Unnamed: 0'])
-            return team_df[['Team', 'ATT', 'DEF', 'MAX']].to_dict('records')
-        except:
-            return []
+        return side_df
+    
+    home_df = side_ratings('home', 'away', ncaa_avg_home_goals, ncaa_avg_away_goals)
+    away_df = side_ratings('away', 'home', ncaa_avg_away_goals, ncaa_avg_home_goals)
+    
+    # Merge home and away dataframes
+    overall_df = pd.merge(home_df, away_df, on=['Team', 'Conference'], how='inner')
+    
+    # Combine metrics
+    metrics = ['MP', 'GF', 'GA', 'ATT', 'DEF']
+    for metric in metrics:
+        overall_df[metric] = overall_df[f'{metric}_x'] + overall_df[f'{metric}_y']
+    
+    # Drop _x and _y columns
+    columns_to_drop = [f'{metric}_x' for metric in metrics] + [f'{metric}_y' for metric in metrics]
+    overall_df = overall_df.drop(columns=columns_to_drop)
+    
+    # Average ATT and DEF metrics
+    overall_df['ATT'] = overall_df['ATT'] / 2
+    overall_df['DEF'] = overall_df['DEF'] / 2
+    
+    # Calculate STR using linear defense scaling (Option 2)
+    max_def = overall_df['DEF'].max()
+    overall_df['STR'] = (overall_df['ATT'] * 0.5 + (max_def - overall_df['DEF']) * 0.5)
+    overall_df['MAX'] = (overall_df['STR'] - overall_df['STR'].min()) / (overall_df['STR'].max() - overall_df['STR'].min()) * 100
+    
+    return overall_df
 
 if __name__ == "__main__":
     # Test the system
@@ -0,0 +1,58 @@
+"""
+Player Search for NCAA Soccer Dashboard
+FTS5 index over player names, teams and conferences (players_fts, an external-content table
+on players). Matching is per-token prefix and accent-insensitive, so "jaas" finds
+"Jääskeläinen" and "emil akr" finds Emil at Akron.
+"""
+
+import re
+import sqlite3
+
+# Rank name hits above team hits above conference hits
+SEARCH_RANK = "bm25(players_fts, 10.0, 2.0, 1.0)"
+
+PLAYER_SEARCH_SQL = f"""
+    WITH hits AS MATERIALIZED (
+        SELECT rowid, {SEARCH_RANK} AS rank
+        FROM players_fts
+        WHERE players_fts MATCH :query
+    )
+    SELECT players.name, players.team, players.position, players.conference, MIN(hits.rank) AS rank
+    FROM hits
+    JOIN players ON players.rowid = hits.rowid
+    WHERE players.name IS NOT NULL AND players.team IS NOT NULL
+    GROUP BY players.name, players.team
+    ORDER BY rank, players.name
+    LIMIT :limit
+"""
+
+
+def build_match_query(term):
+    """FTS5 query that prefix-matches every word of free-text input (None if it has no words)"""
+    tokens = re.findall(r'\w+', term or '')
+    if not tokens:
+        return None
+    # Quote each token so input can never be read as FTS5 syntax
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def rebuild_player_search(conn):
+    """Re-index players_fts from the players table; call in the writer's transaction"""
+    try:
+        conn.execute("INSERT INTO players_fts(players_fts) VALUES('rebuild')")
+    except sqlite3.OperationalError as e:
+        # Legacy scripts may run against a database the migrations haven't reached yet
+        if "no such table" not in str(e):
+            raise e
+
+
+def search_players(conn, term, limit=10):
+    """Ranked (name, team, position, conference) matches for a search box entry"""
+    query = build_match_query(term)
+    if query is None:
+        return []
+    rows = conn.execute(PLAYER_SEARCH_SQL, {'query': query, 'limit': limit}).fetchall()
+    return [
+        {'name': name, 'team': team, 'position': position, 'conference': conference}
+        for name, team, position, conference, _ in rows
+    ]
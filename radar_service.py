@@ -0,0 +1,159 @@
+"""
+Radar Chart Render Service
+Renders player radar charts in a background process pool and caches them on disk under
+a hash of what is drawn (name, position, percentiles, MAX and minutes), so a chart is
+redrawn exactly when its data changes and never inside a web request.
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+RADAR_DIR = 'static/radars'
+RADAR_METRICS = ['Goals_per90', 'Assists_per90', 'Shots_per90', 'Shots On Target_per90', 'Fouls Won_per90']
+
+# Bump when the chart styling changes so every cached image is redrawn
+RENDER_VERSION = 1
+
+
+def _plain(value):
+    """numpy scalars -> Python values so keys hash the same however the row was built"""
+    return value.item() if hasattr(value, 'item') else value
+
+
+def radar_chart_data(player_data):
+    """The fields of a player's rating row that the radar chart draws"""
+    position = player_data.get('Position')
+    chart_data = {
+        'Position': position,
+        'MAX': _plain(player_data.get('MAX', 'N/A')),
+        'Minutes Played': _plain(player_data.get('Minutes Played', 'N/A')),
+    }
+    for metric in RADAR_METRICS:
+        column = f'{metric}_percentile_{position}'
+        chart_data[column] = _plain(player_data.get(column, 0))
+    return chart_data
+
+
+def radar_filename(player_name, chart_data):
+    """Content-addressed image name: <player>_<hash of the chart inputs>.png"""
+    payload = json.dumps([RENDER_VERSION, player_name, chart_data], sort_keys=True, default=str)
+    digest = hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+    return f"{player_name.replace(' ', '_').replace('.', '')}_{digest}.png"
+
+
+def render_radar_chart(player_name, chart_data, output_dir, filename):
+    """Process-pool entry point: draw to a temp file, then publish it atomically"""
+    from player_ratings import create_radar_chart
+
+    tmp_filename = f".{filename}.{os.getpid()}.tmp.png"
+    if create_radar_chart(player_name, chart_data, output_dir, force_regenerate=True, filename=tmp_filename) is None:
+        return None
+    os.replace(os.path.join(output_dir, tmp_filename), os.path.join(output_dir, filename))
+    return filename
+
+
+class RadarRenderService:
+    """Serves cached radar images and renders missing ones in worker processes"""
+
+    def __init__(self, output_dir=RADAR_DIR, max_workers=None):
+        self.output_dir = output_dir
+        self.max_workers = max_workers or int(os.getenv('RADAR_RENDER_WORKERS', '2'))
+        self._executor = None
+        self._pending = {}
+        self._lock = threading.RLock()
+        os.makedirs(output_dir, exist_ok=True)
+
+    def _get_executor(self):
+        # spawn: forking a threaded web worker can deadlock inside the child
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context('spawn')
+            )
+        return self._executor
+
+    def _finished(self, filename, future, executor):
+        with self._lock:
+            self._pending.pop(filename, None)
+            # A worker that died takes the whole pool down; start a fresh one on the next submit
+            broken = not future.cancelled() and isinstance(future.exception(), BrokenProcessPool)
+            if broken and self._executor is executor:
+                executor.shutdown(wait=False)
+                self._executor = None
+
+    def submit(self, player_name, player_data):
+        """Image filename and the in-flight render (None when the image is already on disk)"""
+        chart_data = radar_chart_data(player_data)
+        filename = radar_filename(player_name, chart_data)
+        if os.path.exists(os.path.join(self.output_dir, filename)):
+            return filename, None
+
+        with self._lock:
+            future = self._pending.get(filename)
+            if future is None:
+                executor = self._get_executor()
+                future = executor.submit(render_radar_chart, player_name, chart_data, self.output_dir, filename)
+                self._pending[filename] = future
+                future.add_done_callback(lambda f, name=filename: self._finished(name, f, executor))
+        return filename, future
+
+    def get_chart(self, player_name, player_data, wait=0):
+        """Filename of the chart if ready (waiting up to `wait` seconds), else None while it renders"""
+        filename, future = self.submit(player_name, player_data)
+        if future is None:
+            return filename
+        if not wait:
+            return None
+        try:
+            return future.result(timeout=wait)
+        except TimeoutError:
+            return None
+        except Exception as e:
+            print(f"Error rendering radar chart for {player_name}: {e}")
+            return None
+
+    def prerender(self, players):
+        """Render every missing chart for an iterable of (player_name, player_data); returns counts"""
+        counts = {'cached': 0, 'rendered': 0, 'failed': 0}
+        futures = []
+        for player_name, player_data in players:
+            filename, future = self.submit(player_name, player_data)
+            if future is None:
+                counts['cached'] += 1
+            else:
+                futures.append((player_name, future))
+
+        for done, (player_name, future) in enumerate(futures, 1):
+            try:
+                ok = future.result() is not None
+            except Exception as e:
+                print(f"Error rendering radar chart for {player_name}: {e}")
+                ok = False
+            counts['rendered' if ok else 'failed'] += 1
+            if done % 100 == 0 or done == len(futures):
+                print(f"🖼️  Rendered {done}/{len(futures)} radar charts")
+        return counts
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_radar_service():
+    """Process-wide radar render service"""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = RadarRenderService()
+    return _service
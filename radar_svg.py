@@ -0,0 +1,121 @@
+"""
+SVG Radar Chart Renderer
+Draws the same five-metric percentile radar as create_radar_chart (same colors per
+position, same point labels) as an inline SVG string from plain geometry. No matplotlib,
+renders in microseconds, and a few KB per chart so results are memoized in memory.
+"""
+
+import math
+from functools import lru_cache
+from html import escape
+
+from radar_service import RADAR_METRICS, radar_chart_data
+
+RADAR_LABELS = ['Goals', 'Assists', 'Shots', 'Shots on Target', 'Fouls Won']
+
+# Position -> (primary color, subtitle description, legend text)
+POSITION_STYLES = {
+    'Forward': ('#4a90a4', 'Forward', '● Attacking'),
+    'Midfielder': ('#c7b299', 'Midfielder', '● Possession'),
+    'Defender': ('#c85a5a', 'Defender', '● Defending'),
+}
+UNKNOWN_STYLE = ('#7f8c8d', 'Unknown Position', '● Unknown Position')
+
+WIDTH, HEIGHT = 600, 560
+CENTER_X, CENTER_Y, RADIUS = 300, 290, 190
+
+
+def _point(angle, value):
+    """Polar (angle from east, counterclockwise; value 0-100) -> SVG coordinates"""
+    r = RADIUS * value / 100.0
+    return CENTER_X + r * math.cos(angle), CENTER_Y - r * math.sin(angle)
+
+
+def _number(value):
+    """Numeric percentile, treating missing values as 0 like the PNG renderer"""
+    try:
+        return float(value) if value != 'N/A' and value is not None else 0.0
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _render(player_name, chart_items):
+    chart_data = dict(chart_items)
+    position = chart_data.get('Position')
+    color, description, legend = POSITION_STYLES.get(position, UNKNOWN_STYLE)
+    values = [_number(chart_data.get(f'{metric}_percentile_{position}', 0)) for metric in RADAR_METRICS]
+    angles = [2 * math.pi * i / len(values) for i in range(len(values))]
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {WIDTH} {HEIGHT}" '
+        f'class="radar-svg" role="img" aria-label="{escape(player_name)} radar chart" '
+        f'font-family="Helvetica, Arial, sans-serif">',
+        f'<rect width="{WIDTH}" height="{HEIGHT}" fill="#ffffff"/>',
+        f'<circle cx="{CENTER_X}" cy="{CENTER_Y}" r="{RADIUS}" fill="#f8f9fa"/>',
+    ]
+
+    # Grid rings and spokes
+    for ring in (20, 40, 60, 80, 100):
+        parts.append(f'<circle cx="{CENTER_X}" cy="{CENTER_Y}" r="{RADIUS * ring / 100:.1f}" '
+                     f'fill="none" stroke="#e0e0e0" stroke-opacity="0.7"/>')
+    for angle in angles:
+        x, y = _point(angle, 100)
+        parts.append(f'<line x1="{CENTER_X}" y1="{CENTER_Y}" x2="{x:.1f}" y2="{y:.1f}" '
+                     f'stroke="#e0e0e0" stroke-opacity="0.7"/>')
+
+    # Player area, outline and points
+    polygon = ' '.join(f'{x:.1f},{y:.1f}' for x, y in (_point(a, v) for a, v in zip(angles, values)))
+    parts.append(f'<polygon points="{polygon}" fill="{color}" fill-opacity="0.25" '
+                 f'stroke="{color}" stroke-width="3" stroke-linejoin="round"/>')
+    for angle, value in zip(angles, values):
+        x, y = _point(angle, value)
+        parts.append(f'<circle cx="{x:.1f}" cy="{y:.1f}" r="5" fill="{color}" stroke="#ffffff" stroke-width="2"/>')
+
+    # Metric labels outside the outer ring
+    for angle, label in zip(angles, RADAR_LABELS):
+        x, y = _point(angle, 114)
+        anchor = 'middle' if abs(math.cos(angle)) < 0.3 else ('start' if math.cos(angle) > 0 else 'end')
+        parts.append(f'<text x="{x:.1f}" y="{y:.1f}" text-anchor="{anchor}" dominant-baseline="middle" '
+                     f'font-size="13" font-weight="bold" fill="#333333">{label}</text>')
+
+    # Percentile labels, inside the area for high values and outside for low ones
+    for angle, value in zip(angles, values):
+        if value >= 85:
+            distance, opacity = value - 15, 0.9
+        elif value >= 70:
+            distance, opacity = value - 8, 0.8
+        else:
+            distance, opacity = value + 12, 0.8
+        x, y = _point(angle, distance)
+        text = str(int(value))
+        box_width = 12 + 8 * len(text)
+        parts.append(f'<rect x="{x - box_width / 2:.1f}" y="{y - 10:.1f}" width="{box_width}" height="20" rx="6" '
+                     f'fill="{color}" fill-opacity="{opacity}"/>')
+        parts.append(f'<text x="{x:.1f}" y="{y:.1f}" text-anchor="middle" dominant-baseline="central" '
+                     f'font-size="12" font-weight="bold" fill="#ffffff">{text}</text>')
+
+    # Title, subtitle and legend
+    max_rating = chart_data.get('MAX', 'N/A')
+    if max_rating != 'N/A':
+        max_rating = round(float(max_rating))
+    subtitle = (f"Percentile rank vs. {description} | {chart_data.get('Minutes Played', 'N/A')} minutes | "
+                f"MAX Rating: {max_rating}")
+    parts.append(f'<text x="{WIDTH / 2}" y="32" text-anchor="middle" font-size="26" font-weight="bold" '
+                  f'fill="#2c3e50">{escape(player_name)}</text>')
+    parts.append(f'<text x="{WIDTH / 2}" y="56" text-anchor="middle" font-size="13" '
+                  f'fill="#7f8c8d">{escape(subtitle)}</text>')
+    parts.append(f'<text x="{WIDTH / 2}" y="{HEIGHT - 14}" text-anchor="middle" font-size="13" '
+                  f'font-weight="600" fill="{color}">{legend}</text>')
+    parts.append('</svg>')
+    return ''.join(parts)
+
+
+@lru_cache(maxsize=4096)
+def _render_cached(player_name, chart_items):
+    return _render(player_name, chart_items)
+
+
+def render_radar_svg(player_name, player_data):
+    """Inline SVG radar chart for a player's rating row, memoized on the values drawn"""
+    chart_items = tuple(sorted(radar_chart_data(player_data).items()))
+    return _render_cached(player_name, chart_items)
@@ -0,0 +1,179 @@
+"""
+In-process Ratings Store for NCAA Soccer Dashboard
+Computes the full league player ratings once and serves lookups from memory
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+from db_access import connect_readonly
+from player_ratings import (
+    load_data, calculate_per90_stats, normalize_stats,
+    calculate_max_ratings, PercentileIndex
+)
+
+# Files the ratings pipeline reads; any change to these invalidates the store
+RATINGS_SOURCE_FILES = [
+    'data/d1_player_stats.csv',
+    'data/ncaa_ratings.csv',
+    'data/mls_2025_drafted_players.txt',
+]
+
+
+class RatingsSnapshot:
+    """Immutable, fully computed ratings table with hash indexes and a percentile index"""
+
+    def __init__(self, version, df):
+        self.version = version
+        self.df = df
+        self.built_at = time.time()
+        # Percentiles are looked up per player instead of materializing 20 dense columns
+        self.percentiles = PercentileIndex(df)
+        self._player_percentiles = {}
+        self.by_name = {}
+        self.by_name_team = {}
+
+        for record in df.to_dict('records'):
+            # Keep the first row per name, matching the old iloc[0] lookup
+            self.by_name.setdefault(record['Name'], record)
+            self.by_name_team[(record['Name'], record['Team'])] = record
+
+    def __len__(self):
+        return len(self.by_name_team)
+
+    def with_percentiles(self, record):
+        """Copy of a rating row with the player's position percentiles attached"""
+        key = (record['Name'], record['Team'])
+        percentiles = self._player_percentiles.get(key)
+        if percentiles is None:
+            percentiles = self.percentiles.player_percentiles(record)
+            self._player_percentiles[key] = percentiles
+        player_data = dict(record)
+        player_data.update(percentiles)
+        return player_data
+
+    def records(self):
+        """Every rating row with its position percentiles, in table order"""
+        return [self.with_percentiles(record) for record in self.df.to_dict('records')]
+
+
+class PlayerRatingsStore:
+    """Keeps the computed ratings table in memory and rebuilds it when the data changes"""
+
+    def __init__(self, source_files=None, db_path=None, check_interval=5.0):
+        self.source_files = source_files or RATINGS_SOURCE_FILES
+        self.db_path = db_path or os.getenv('NCAA_DB_PATH', 'data/ncaa_soccer.db')
+        self.check_interval = check_interval
+        self._snapshot = None
+        self._last_check = 0.0
+        self._build_lock = threading.Lock()
+
+    def get_data_version(self):
+        """Fingerprint the CSV inputs and the current DB snapshot"""
+        version = []
+        for path in self.source_files:
+            try:
+                stat = os.stat(path)
+                version.append((path, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                version.append((path, None, None))
+
+        try:
+            conn = connect_readonly(self.db_path)
+            try:
+                rows = conn.execute("""
+                    SELECT season, snapshot_date, total_players, created_at
+                    FROM data_snapshots
+                    WHERE is_current = TRUE
+                    ORDER BY season
+                """).fetchall()
+            finally:
+                conn.close()
+            version.append(('snapshots', tuple(rows)))
+        except sqlite3.Error:
+            version.append(('snapshots', None))
+
+        return tuple(version)
+
+    def build(self, version=None):
+        """Run the full ratings pipeline and return a new snapshot"""
+        if version is None:
+            version = self.get_data_version()
+
+        merged_df, _ = load_data()
+        merged_df = calculate_per90_stats(merged_df)
+        merged_df = normalize_stats(merged_df)
+        merged_df = calculate_max_ratings(merged_df)
+
+        return RatingsSnapshot(version, merged_df)
+
+    def refresh(self, force=False):
+        """Rebuild the snapshot if the underlying data changed; returns the current snapshot"""
+        snapshot = self._snapshot
+        now = time.time()
+        if not force and snapshot is not None and now - self._last_check < self.check_interval:
+            return snapshot
+
+        with self._build_lock:
+            snapshot = self._snapshot
+            version = self.get_data_version()
+            self._last_check = time.time()
+            if force or snapshot is None or snapshot.version != version:
+                started = time.time()
+                snapshot = self.build(version)
+                # Swap in the new snapshot in one assignment so readers never see a partial table
+                self._snapshot = snapshot
+                print(f"✓ Ratings store built: {len(snapshot)} players in {time.time() - started:.2f}s")
+            return snapshot
+
+    def invalidate(self):
+        """Force the next lookup to re-check the data version"""
+        self._last_check = 0.0
+
+    def warm(self):
+        """Build the snapshot ahead of the first request"""
+        try:
+            self.refresh()
+        except Exception as e:
+            print(f"Error warming ratings store: {e}")
+
+    def get_player(self, player_name, team=None):
+        """Look up a player's computed rating row; returns a copy or None"""
+        snapshot = self.refresh()
+        record = None
+        if team is not None:
+            record = snapshot.by_name_team.get((player_name, team))
+        if record is None:
+            record = snapshot.by_name.get(player_name)
+        return snapshot.with_percentiles(record) if record is not None else None
+
+    def get_percentiles(self, position, metric, values):
+        """Batch percentile lookup of per-90 values against the current position tables"""
+        return self.refresh().percentiles.percentiles(position, metric, values)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_ratings_store():
+    """Get the process-wide player ratings store"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = PlayerRatingsStore()
+    return _store
+
+
+if __name__ == "__main__":
+    store = get_ratings_store()
+    store.refresh(force=True)
+
+    started = time.perf_counter()
+    for _ in range(10000):
+        store.get_player("A.J. Schuetz")
+    elapsed = time.perf_counter() - started
+    print(f"10000 lookups in {elapsed:.3f}s ({elapsed / 10000 * 1e6:.1f} µs per lookup)")
@@ -0,0 +1,110 @@
+"""
+Persisted Player Ratings
+Runs the ratings pipeline over each players snapshot in the database and stores MAX and the
+overall rating in player_ratings, keyed like the players table (name, team, season, data_date),
+so listings can join and sort by rating in SQL instead of loading the CSV on every request.
+"""
+
+import os
+import time
+
+from app_state import bump_data_version
+from db_access import connect_readonly, write_transaction
+
+TEAM_RATINGS_FILE = 'data/ncaa_ratings.csv'
+
+# players column -> pipeline column
+PLAYER_COLUMNS = {
+    'name': 'Name',
+    'team': 'Team',
+    'position': 'Position',
+    'minutes_played': 'Minutes Played',
+    'goals': 'Goals',
+    'assists': 'Assists',
+    'shots': 'Shots',
+    'shots_on_target': 'Shots On Target',
+    'fouls_won': 'Fouls Won',
+}
+
+
+def compute_snapshot_ratings(conn, season, data_date, team_df=None):
+    """Rating rows (name, team, season, data_date, max_rating, overall_rating) for one snapshot"""
+    import pandas as pd
+    from player_ratings import (
+        prepare_player_data, calculate_per90_stats, normalize_stats, calculate_max_ratings
+    )
+
+    player_df = pd.read_sql_query(
+        f"SELECT {', '.join(PLAYER_COLUMNS)} FROM players WHERE season = ? AND data_date = ?",
+        conn, params=(season, data_date)
+    ).rename(columns=PLAYER_COLUMNS)
+    if team_df is None:
+        team_df = pd.read_csv(TEAM_RATINGS_FILE)
+
+    # The pipeline strips team names; remember the stored spelling so rows join back to players
+    stored_team = {(name, team.strip()): team for name, team in zip(player_df['Name'], player_df['Team'])}
+
+    merged_df = prepare_player_data(player_df, team_df.copy())
+    if merged_df.empty:
+        return []
+    merged_df = calculate_per90_stats(merged_df)
+    merged_df = normalize_stats(merged_df)
+    merged_df = calculate_max_ratings(merged_df)
+
+    return [
+        (name, stored_team.get((name, team), team), season, data_date, float(max_rating), float(overall))
+        for name, team, max_rating, overall in zip(
+            merged_df['Name'], merged_df['Team'], merged_df['MAX'], merged_df['Overall_Rating']
+        )
+    ]
+
+
+def refresh_player_ratings(conn, season, data_date, team_df=None):
+    """Recompute the stored ratings of one snapshot; runs inside the caller's transaction"""
+    try:
+        rows = compute_snapshot_ratings(conn, season, data_date, team_df)
+    except Exception as e:
+        # Too few players to scale (early season) or no team ratings: leave the snapshot unrated
+        print(f"⚠️  Could not rate {season} - {data_date}: {e}")
+        rows = []
+
+    conn.execute("DELETE FROM player_ratings WHERE season = ? AND data_date = ?", (season, data_date))
+    conn.executemany("""
+        INSERT OR REPLACE INTO player_ratings
+        (name, team, season, data_date, max_rating, overall_rating)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, rows)
+    return len(rows)
+
+
+def ensure_player_ratings(db_path=None, rebuild=False):
+    """Rate every players snapshot that has no stored ratings yet (all of them with rebuild=True)"""
+    db_path = db_path or os.getenv('NCAA_DB_PATH', 'data/ncaa_soccer.db')
+    # Checking for unrated snapshots only reads, so it doesn't wait on an import's write lock
+    conn = connect_readonly(db_path)
+    try:
+        query = "SELECT DISTINCT season, data_date FROM players WHERE season IS NOT NULL"
+        if not rebuild:
+            query += " EXCEPT SELECT DISTINCT season, data_date FROM player_ratings"
+        snapshots = conn.execute(query).fetchall()
+    finally:
+        conn.close()
+    if not snapshots:
+        return 0
+
+    # pandas is only needed once there is something to rate
+    import pandas as pd
+    team_df = pd.read_csv(TEAM_RATINGS_FILE)
+    for season, data_date in snapshots:
+        started = time.perf_counter()
+        with write_transaction(db_path) as conn:
+            count = refresh_player_ratings(conn, season, data_date, team_df)
+            bump_data_version(conn)
+        print(f"✅ Rated {count} players for {season} - {data_date} in {time.perf_counter() - started:.2f}s")
+    return len(snapshots)
+
+
+if __name__ == "__main__":
+    import sys
+    path = sys.argv[1] if len(sys.argv) > 1 and not sys.argv[1].startswith('--') else None
+    ensure_player_ratings(path, rebuild='--rebuild' in sys.argv)
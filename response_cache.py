@@ -0,0 +1,201 @@
+"""
+Rendered Response Cache for the NCAA Soccer Dashboard
+Caches the bodies of read-heavy routes keyed by route, normalized query args and the
+app_state data version, so pages are rendered once per ingest instead of once per visitor.
+Responses carry a content ETag and Last-Modified so browsers and CDNs revalidate with 304s.
+
+RESPONSE_CACHE=memory (default) keeps an in-process LRU; RESPONSE_CACHE=sqlite shares one
+SQLite file (RESPONSE_CACHE_PATH) between gunicorn workers; RESPONSE_CACHE=off disables it.
+"""
+
+import functools
+import glob
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from flask import Response, make_response, request
+
+
+def default_cache_path():
+    """Keep the shared cache next to the database so every worker on the disk sees it"""
+    db_path = os.getenv('NCAA_DB_PATH', 'data/ncaa_soccer.db')
+    return os.getenv('RESPONSE_CACHE_PATH', os.path.join(os.path.dirname(db_path) or '.', 'response_cache.db'))
+
+
+def build_fingerprint(root=None):
+    """Changes whenever the app code or a template changes, so a deploy never serves old HTML"""
+    root = root or os.path.dirname(os.path.abspath(__file__))
+    paths = sorted(glob.glob(os.path.join(root, '*.py')) + glob.glob(os.path.join(root, 'templates', '*.html')))
+    stamp = [(os.path.basename(path), os.stat(path).st_mtime_ns) for path in paths]
+    return hashlib.sha1(json.dumps(stamp).encode('utf-8')).hexdigest()[:12]
+
+
+class MemoryBackend:
+    """In-process LRU of cached responses"""
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry['version'] != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteBackend:
+    """Response cache in a SQLite file shared by every worker process"""
+
+    def __init__(self, path=None, max_entries=5000):
+        self.path = path or default_cache_path()
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._last_version = None
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS response_cache (
+                key TEXT PRIMARY KEY,
+                version INTEGER NOT NULL,
+                status INTEGER NOT NULL,
+                mimetype TEXT,
+                etag TEXT NOT NULL,
+                last_modified REAL NOT NULL,
+                body BLOB NOT NULL,
+                stored_at REAL NOT NULL
+            )
+        """)
+
+    def _connect(self):
+        # One connection per thread; sqlite3 connections must not be shared across threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key, version):
+        row = self._connect().execute("""
+            SELECT status, mimetype, etag, last_modified, body FROM response_cache
+            WHERE key = ? AND version = ?
+        """, (key, version)).fetchone()
+        if row is None:
+            return None
+        status, mimetype, etag, last_modified, body = row
+        return {'version': version, 'status': status, 'mimetype': mimetype, 'etag': etag,
+                'last_modified': last_modified, 'body': bytes(body)}
+
+    def set(self, key, entry):
+        conn = self._connect()
+        try:
+            conn.execute("""
+                INSERT OR REPLACE INTO response_cache
+                (key, version, status, mimetype, etag, last_modified, body, stored_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (key, entry['version'], entry['status'], entry['mimetype'], entry['etag'],
+                  entry['last_modified'], entry['body'], time.time()))
+            # Entries for older data versions can never be served again
+            if entry['version'] != self._last_version:
+                conn.execute("DELETE FROM response_cache WHERE version != ?", (entry['version'],))
+                conn.execute("""
+                    DELETE FROM response_cache WHERE key IN (
+                        SELECT key FROM response_cache ORDER BY stored_at DESC LIMIT -1 OFFSET ?
+                    )
+                """, (self.max_entries,))
+                self._last_version = entry['version']
+        except sqlite3.OperationalError as e:
+            # Another worker holding the write lock just means this response isn't stored
+            print(f"⚠️  Response cache write skipped: {e}")
+
+    def clear(self):
+        self._connect().execute("DELETE FROM response_cache")
+
+
+def create_backend(kind=None):
+    """Backend selected by RESPONSE_CACHE (memory | sqlite | off)"""
+    kind = (kind or os.getenv('RESPONSE_CACHE', 'memory')).lower()
+    if kind == 'off':
+        return None
+    if kind == 'sqlite':
+        return SQLiteBackend()
+    return MemoryBackend(int(os.getenv('RESPONSE_CACHE_SIZE', '512')))
+
+
+class ResponseCache:
+    """Decorator factory for Flask views whose output only depends on the URL and the data"""
+
+    def __init__(self, version_getter, backend=None, namespace=None):
+        self.version_getter = version_getter
+        self.backend = backend
+        self.namespace = namespace or build_fingerprint()
+        self.hits = 0
+        self.misses = 0
+
+    def cache_key(self):
+        """Route path plus query args with empty values dropped and keys sorted"""
+        args = sorted((name, value) for name, values in request.args.lists()
+                      for value in values if value != '')
+        return json.dumps([self.namespace, request.path, args])
+
+    def __call__(self, view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            version = self.version_getter() if self.backend is not None else None
+            if version is None or request.method != 'GET':
+                return view(*args, **kwargs)
+
+            key = self.cache_key()
+            entry = self.backend.get(key, version)
+            if entry is None:
+                self.misses += 1
+                response = view(*args, **kwargs)
+                response = make_response(response)
+                # Only successful pages are cached
+                if response.status_code != 200 or response.direct_passthrough:
+                    return response
+                body = response.get_data()
+                entry = {
+                    'version': version,
+                    'status': response.status_code,
+                    'mimetype': response.mimetype,
+                    'etag': f"{version}-{hashlib.sha1(body).hexdigest()[:16]}",
+                    'last_modified': time.time(),
+                    'body': body,
+                }
+                self.backend.set(key, entry)
+            else:
+                self.hits += 1
+
+            response = Response(entry['body'], status=entry['status'], mimetype=entry['mimetype'])
+            response.set_etag(entry['etag'])
+            response.last_modified = datetime.fromtimestamp(int(entry['last_modified']), tz=timezone.utc)
+            # Let shared caches store it but always revalidate; the ETag makes that a cheap 304
+            response.headers['Cache-Control'] = 'public, no-cache'
+            return response.make_conditional(request)
+        return wrapper
+
+    def clear(self):
+        if self.backend is not None:
+            self.backend.clear()
@@ -0,0 +1,44 @@
+"""
+Benchmark boxscore + play-by-play fetching at different concurrency levels against the local stub server.
+Usage: python scripts/benchmark_fetch.py [games] [latency_ms]   (default: 150 games, 50 ms per request)
+"""
+import os
+import sys
+import tempfile
+import time
+
+# Ensure project root is on path when run from the scripts directory
+CUR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.abspath(os.path.join(CUR, '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from ncaa_data_collector import NCAADataCollector
+from stub_ncaa_server import StubNCAAServer
+
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 150
+    latency_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 50.0
+
+    # Keep the collector's data/<season> folder out of the repo
+    os.chdir(tempfile.mkdtemp())
+
+    print(f"{games} games, {latency_ms:.0f} ms simulated latency per request")
+    print(f"{'workers':>8} {'seconds':>9} {'games/s':>9} {'requests':>9}")
+    with StubNCAAServer(games_per_day=games, latency=latency_ms / 1000) as server:
+        game_ids = server.game_ids_for_day(11, 2)
+        for workers in (1, 4, 8, 16, 32):
+            collector = NCAADataCollector(
+                season='2024', max_workers=workers, per_host_limit=workers, use_cache=False,
+                scoreboard_url=server.scoreboard_url, game_data_url=server.game_data_url
+            )
+            before = server.requests
+            started = time.perf_counter()
+            collector.fetch_game_documents(game_ids)
+            elapsed = time.perf_counter() - started
+            print(f"{workers:>8} {elapsed:>9.2f} {games / elapsed:>9.1f} {server.requests - before:>9}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark the per-team fouls-won reconciliation against the old iterrows implementation
+on the 2024 season's players, with play-by-play style foul names.
+Usage: python scripts/benchmark_fouls.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+# Ensure project root is on path when run from the scripts directory
+CUR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.abspath(os.path.join(CUR, '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from ncaa_data_collector import NCAADataCollector
+
+
+def iterrows_reference(df, fouls):
+    """The original per-row implementation"""
+    df = df.copy()
+    for idx, row in df.iterrows():
+        if row['Fouls Won'] == 0:
+            matching_fouls = fouls[
+                (fouls['Team'] == row['Team']) &
+                (fouls['Name'].apply(lambda x: row['Name'] in x or x in row['Name']))
+            ]
+            if not matching_fouls.empty:
+                total_fouls = matching_fouls['Fouls'].sum()
+                df.at[idx, 'Fouls Won'] = total_fouls
+    return df
+
+
+def season_frames(seed=3):
+    """2024 players with some fouls missing, and play-by-play style foul names per team"""
+    rng = np.random.default_rng(seed)
+    players = pd.read_csv(os.path.join(ROOT, 'data', 'd1_player_stats.csv'))[['Name', 'Team', 'Fouls Won']]
+    players = players.assign(Name=players['Name'].str.lower())
+
+    foul_rows = []
+    for name, team, fouls_won in players.itertuples(index=False):
+        parts = name.split()
+        spellings = [name, parts[-1], f"{parts[-1]},{parts[0]}"] if len(parts) > 1 else [name]
+        for spelling in rng.choice(spellings, size=rng.integers(1, 3), replace=False):
+            foul_rows.append((spelling, team, int(rng.integers(1, 6))))
+    fouls = pd.DataFrame(foul_rows, columns=['Name', 'Team', 'Fouls'])
+    fouls = fouls.groupby(['Name', 'Team'], as_index=False).sum()
+
+    merged = pd.merge(players, fouls, on=['Name', 'Team'], how='left')
+    merged['Fouls Won'] = merged['Fouls'].fillna(0)
+    return merged, fouls
+
+
+def main():
+    # Keep the collector's data/<season> folder out of the repo
+    os.chdir(tempfile.mkdtemp())
+    collector = NCAADataCollector(season='2024', use_cache=False)
+    players, fouls = season_frames()
+    print(f"{len(players)} players ({(players['Fouls Won'] == 0).sum()} without fouls), {len(fouls)} foul names")
+
+    started = time.perf_counter()
+    expected = iterrows_reference(players, fouls)
+    legacy = time.perf_counter() - started
+
+    started = time.perf_counter()
+    result = collector.update_fouls_for_subset_names(players, fouls)
+    vectorized = time.perf_counter() - started
+
+    print(f"  iterrows: {legacy:8.3f}s")
+    print(f"  per-team: {vectorized:8.3f}s")
+    print(f"  speedup:  {legacy / vectorized:8.1f}x   identical: {result.equals(expected)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+"""
+Benchmark delta-encoded player_history against the old full copy per snapshot
+(player_stats_history as a table) over a simulated 16-week season: rows and bytes stored, and
+the time to serve a /players-style page (filtered count plus top 100 by goals) as of a week.
+Every reconstructed snapshot is checked against its full copy.
+Usage: python scripts/benchmark_history.py [players]   (default: 3000)
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+# Ensure project root is on path when run from the scripts directory
+CUR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.abspath(os.path.join(CUR, '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from db_access import connect, write_transaction
+from db_migrations import run_migrations
+from player_history import AS_OF_SQL, HISTORY_COLUMNS, snapshot_rows, store_history_snapshot
+
+WEEKS = 16
+SEASON = '2025'
+POSITIONS = ['F', 'M', 'D', 'GK']
+
+LEGACY_SCHEMA = """
+    CREATE TABLE legacy_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        player_name TEXT NOT NULL,
+        team TEXT NOT NULL,
+        season TEXT NOT NULL,
+        snapshot_date TEXT NOT NULL,
+        position TEXT,
+        minutes_played INTEGER,
+        goals INTEGER,
+        assists INTEGER,
+        shots INTEGER,
+        shots_on_target INTEGER,
+        fouls_won INTEGER,
+        conference TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE INDEX idx_legacy_snapshot ON legacy_history(season, snapshot_date);
+"""
+
+PAGE_WHERE = "minutes_played >= 250"
+PAGE_COLUMNS = "name, team, position, minutes_played, goals, assists"
+
+
+def simulate_season(n_players, seed=11):
+    """[(snapshot_date, rows)] with season-to-date lines; about 3 in 4 listed players play each week"""
+    rng = np.random.default_rng(seed)
+    players = [(f'Player {i}', f'Team {i % 200}', POSITIONS[i % 4], f'Conference {i % 20}')
+               for i in range(n_players)]
+    # A fifth of the roster first appears after week 1
+    debut = np.where(rng.random(n_players) < 0.2, rng.integers(2, WEEKS + 1, size=n_players), 1)
+    totals = np.zeros((n_players, 6), dtype=int)  # minutes, goals, assists, shots, on target, fouls
+
+    weeks = []
+    for week in range(1, WEEKS + 1):
+        listed = np.flatnonzero(debut <= week)
+        played = listed[rng.random(len(listed)) < 0.75]
+        shots = rng.poisson(2, size=len(played))
+        totals[played] += np.column_stack([
+            rng.integers(20, 91, size=len(played)), rng.poisson(0.2, size=len(played)),
+            rng.poisson(0.15, size=len(played)), shots, rng.binomial(shots, 0.4),
+            rng.poisson(1.2, size=len(played)),
+        ])
+        snapshot_date = (date(2025, 8, 25) + timedelta(weeks=week - 1)).isoformat()
+        rows = [(players[i][0], players[i][1], players[i][2], *map(int, totals[i]), players[i][3])
+                for i in listed]
+        weeks.append((snapshot_date, rows))
+    return weeks
+
+
+def table_bytes(conn, table):
+    """Pages used by a table and its indexes"""
+    return conn.execute("""
+        SELECT SUM(pgsize) FROM dbstat
+        WHERE name = ? OR name IN (SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ?)
+    """, (table, table)).fetchone()[0]
+
+
+def time_query(conn, sql, params, repeats=20):
+    """Median seconds for one page (count plus first 100 rows)"""
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        conn.execute(f"SELECT COUNT(*) FROM {sql} WHERE {PAGE_WHERE}", params).fetchone()
+        conn.execute(f"SELECT {PAGE_COLUMNS} FROM {sql} WHERE {PAGE_WHERE} "
+                     f"ORDER BY goals DESC, name LIMIT 100", params).fetchall()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main():
+    n_players = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    weeks = simulate_season(n_players)
+
+    db_path = os.path.join(tempfile.mkdtemp(), 'history.db')
+    run_migrations(db_path, verbose=False)
+    conn = connect(db_path)
+    conn.executescript(LEGACY_SCHEMA)
+    conn.close()
+
+    columns = ', '.join(HISTORY_COLUMNS)
+    write_seconds = {'legacy': 0.0, 'delta': 0.0}
+    for snapshot_date, rows in weeks:
+        with write_transaction(db_path) as conn:
+            conn.execute("""
+                INSERT INTO data_snapshots (season, snapshot_date, total_players) VALUES (?, ?, ?)
+            """, (SEASON, snapshot_date, len(rows)))
+            started = time.perf_counter()
+            conn.executemany(f"""
+                INSERT INTO legacy_history (player_name, team, season, snapshot_date, {columns})
+                VALUES (?, ?, '{SEASON}', '{snapshot_date}', {', '.join('?' * len(HISTORY_COLUMNS))})
+            """, rows)
+            write_seconds['legacy'] += time.perf_counter() - started
+            started = time.perf_counter()
+            store_history_snapshot(conn, SEASON, snapshot_date, rows)
+            write_seconds['delta'] += time.perf_counter() - started
+
+    conn = connect(db_path)
+    for snapshot_date, rows in weeks:
+        assert snapshot_rows(conn, SEASON, snapshot_date) == sorted(rows), snapshot_date
+
+    stored = {
+        'legacy': conn.execute("SELECT COUNT(*) FROM legacy_history").fetchone()[0],
+        'delta': conn.execute("SELECT COUNT(*) FROM player_history").fetchone()[0],
+    }
+    sizes = {'legacy': table_bytes(conn, 'legacy_history'), 'delta': table_bytes(conn, 'player_history')}
+
+    print(f"\n{n_players:,} players, {WEEKS} weekly snapshots "
+          f"({sum(len(rows) for _, rows in weeks):,} player-weeks)")
+    for label in ('legacy', 'delta'):
+        print(f"{label:>8}: {stored[label]:>8,} rows  {sizes[label] / 1024:>9,.0f} KiB  "
+              f"written in {write_seconds[label]:.2f}s")
+    print(f"storage: {sizes['legacy'] / sizes['delta']:.1f}x smaller")
+
+    legacy_sql = f"""(
+        SELECT player_name AS name, team, {columns} FROM legacy_history
+        WHERE season = :history_season AND snapshot_date = :history_date
+    )"""
+    print("\n/players page as of   legacy      delta")
+    for week in (1, WEEKS // 2, WEEKS):
+        params = {'history_season': SEASON, 'history_date': weeks[week - 1][0]}
+        legacy = time_query(conn, legacy_sql, params)
+        delta = time_query(conn, AS_OF_SQL, params)
+        print(f"week {week:>2} ({params['history_date']})  {legacy * 1000:6.1f}ms  {delta * 1000:6.1f}ms")
+    conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""
+Benchmark import_weekly_data's bulk executemany path against the old per-row iterrows inserts.
+Usage: python scripts/benchmark_import.py [rows]   (default: 100000 synthetic player rows)
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+# Ensure project root is on path when run from the scripts directory
+CUR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.abspath(os.path.join(CUR, '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from db_migrations import run_migrations
+from weekly_data_manager import SeasonDataManager
+
+
+def make_synthetic_stats(n_rows, n_teams=200, seed=7):
+    """Player stats frame shaped like collect_season_data() output"""
+    rng = np.random.default_rng(seed)
+    shots = rng.poisson(15, size=n_rows)
+    return pd.DataFrame({
+        'Name': [f'Player {i}' for i in range(n_rows)],
+        'Team': [f'Team {i}' for i in rng.integers(0, n_teams, size=n_rows)],
+        'Position': rng.choice(['Forward', 'Midfielder', 'Defender', 'Goalkeeper'], size=n_rows),
+        'Minutes Played': rng.integers(0, 2000, size=n_rows),
+        'Goals': rng.poisson(2, size=n_rows),
+        'Assists': rng.poisson(2, size=n_rows),
+        'Shots': shots,
+        'Shots On Target': rng.binomial(shots, 0.4),
+        'Fouls Won': rng.poisson(10, size=n_rows).astype(float),
+    })
+
+
+# player_stats_history as the table the previous implementation wrote to (it is now a view)
+LEGACY_HISTORY_SCHEMA = """
+    DROP VIEW player_stats_history;
+    CREATE TABLE player_stats_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        player_name TEXT NOT NULL,
+        team TEXT NOT NULL,
+        season TEXT NOT NULL,
+        snapshot_date TEXT NOT NULL,
+        position TEXT,
+        minutes_played INTEGER,
+        goals INTEGER,
+        assists INTEGER,
+        shots INTEGER,
+        shots_on_target INTEGER,
+        fouls_won INTEGER,
+        conference TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE INDEX idx_history_snapshot ON player_stats_history(season, snapshot_date);
+"""
+
+
+def legacy_import(db_path, player_stats, season, snapshot_date):
+    """The previous implementation: one execute per row per table, default journal settings"""
+    conn = sqlite3.connect(db_path)
+    conn.executescript(LEGACY_HISTORY_SCHEMA)
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM players WHERE season = ? AND data_date = ?", (season, snapshot_date))
+    for _, player in player_stats.iterrows():
+        cursor.execute("""
+            INSERT INTO players
+            (name, team, position, minutes_played, goals, assists, shots,
+             shots_on_target, fouls_won, season, data_date, conference)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            player['Name'], player['Team'], player['Position'],
+            player['Minutes Played'], player['Goals'], player['Assists'],
+            player['Shots'], player['Shots On Target'], player['Fouls Won'],
+            season, snapshot_date, None
+        ))
+    for _, player in player_stats.iterrows():
+        cursor.execute("""
+            INSERT OR REPLACE INTO player_stats_history
+            (player_name, team, season, snapshot_date, position,
+             minutes_played, goals, assists, shots, shots_on_target, fouls_won)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            player['Name'], player['Team'], season, snapshot_date,
+            player['Position'], player['Minutes Played'], player['Goals'],
+            player['Assists'], player['Shots'], player['Shots On Target'],
+            player['Fouls Won']
+        ))
+    conn.commit()
+    conn.close()
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    player_stats = make_synthetic_stats(n_rows)
+
+    workdir = tempfile.mkdtemp()
+    results = {}
+    for label in ('legacy', 'bulk'):
+        db_path = os.path.join(workdir, f'{label}.db')
+        run_migrations(db_path, verbose=False)
+
+        started = time.perf_counter()
+        if label == 'legacy':
+            legacy_import(db_path, player_stats, '2025', '2025-09-01')
+        else:
+            os.environ['NCAA_DB_PATH'] = db_path
+            SeasonDataManager().import_weekly_data(player_stats, '2025', '2025-09-01', 'benchmark')
+        results[label] = time.perf_counter() - started
+
+        conn = sqlite3.connect(db_path)
+        counts = [conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                  for table in ('players', 'player_stats_history')]
+        conn.close()
+        assert counts == [n_rows, n_rows], counts
+
+    print(f"\n{n_rows:,} players ({2 * n_rows:,} rows across players + history)")
+    for label, elapsed in results.items():
+        print(f"{label:>8}: {elapsed:7.2f}s  {2 * n_rows / elapsed:>10,.0f} rows/sec")
+    print(f"speedup: {results['legacy'] / results['bulk']:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
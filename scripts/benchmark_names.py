@@ -0,0 +1,80 @@
+"""
+Benchmark blocked name resolution against the original all-pairs create_name_mapping loop.
+Names are the 2024 player names plus scraper-style variants; larger scales recombine
+first and last names to simulate more players.
+Usage: python scripts/benchmark_names.py [scales...]   (default: 1 2 4 8; all-pairs runs for scale 1 only)
+"""
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+from rapidfuzz import process, fuzz
+
+# Ensure project root is on path when run from the scripts directory
+CUR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.abspath(os.path.join(CUR, '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from name_resolution import build_name_mapping, preprocess_name
+
+
+def make_names(scale, seed=1):
+    """2024 names recombined into `scale` times as many players, with scraper-style variants"""
+    rng = random.Random(seed)
+    base = [name.split() for name in pd.read_csv(os.path.join(ROOT, 'data', 'd1_player_stats.csv'))['Name']]
+    base = [parts for parts in base if len(parts) >= 2]
+    names = []
+    for copy in range(scale):
+        # Each extra copy pairs first names with a shuffled set of last names
+        last_names = [parts[-1] for parts in base]
+        if copy:
+            rng.shuffle(last_names)
+        for parts, last in zip(base, last_names):
+            first = ' '.join(parts[:-1])
+            name = f"{first} {last}"
+            names.append(name)
+            names.append(f"{last},{first}")
+            if rng.random() < 0.2:
+                i = rng.randrange(1, len(name) - 1)
+                names.append(name[:i] + name[i + 1:])
+    return names
+
+
+def all_pairs_mapping(names, similarity_threshold=90):
+    """The original create_name_mapping loop, over names in first-seen order"""
+    standardized_names = {}
+    for name in dict.fromkeys(preprocess_name(name) for name in names):
+        match = process.extractOne(name, standardized_names.keys(), scorer=fuzz.WRatio)
+        if match and match[1] > similarity_threshold:
+            standardized_names[name] = standardized_names[match[0]]
+        else:
+            standardized_names[name] = name
+    return standardized_names
+
+
+def main():
+    scales = [int(arg) for arg in sys.argv[1:]] or [1, 2, 4, 8]
+
+    print(f"{'names':>8} {'blocked s':>10} {'all-pairs s':>12} {'identical':>10}")
+    for scale in scales:
+        names = make_names(scale)
+        unique = len(set(preprocess_name(name) for name in names))
+
+        started = time.perf_counter()
+        mapping = build_name_mapping(names)
+        blocked = time.perf_counter() - started
+
+        if scale == 1:
+            started = time.perf_counter()
+            identical = mapping == all_pairs_mapping(names)
+            all_pairs = f"{time.perf_counter() - started:.2f}"
+        else:
+            identical, all_pairs = '-', '-'
+        print(f"{unique:>8} {blocked:>10.2f} {all_pairs:>12} {str(identical):>10}")
+
+
+if __name__ == '__main__':
+    main()
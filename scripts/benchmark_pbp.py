@@ -0,0 +1,76 @@
+"""
+Benchmark play-by-play parsing: the old per-game DataFrame with row-wise .apply passes against
+one vectorized parse of every game, on stub-server fixture games.
+Usage: python scripts/benchmark_pbp.py [games...]   (default: 500 2000 8000)
+"""
+import os
+import re
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+# Ensure project root is on path when run from the scripts directory
+CUR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.abspath(os.path.join(CUR, '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from ncaa_data_collector import NCAADataCollector
+from pbp_events import flatten_pbp, fouls_won, parse_events
+from stub_ncaa_server import make_game_fixtures
+
+
+def apply_reference(collector, game_ids, documents):
+    """The original collect_fouls_won: a DataFrame and three .apply passes per game"""
+    foul_data = []
+    for game_id in game_ids:
+        data = documents[game_id]['pbp']
+        home = data['meta']['teams'][0]['shortName']
+        away = data['meta']['teams'][1]['shortName']
+        events = []
+        score = '0-0'
+        for period in data['periods']:
+            for play in period['playStats']:
+                score = play['score'] if play['score'] else score
+                if play['visitorText']:
+                    events.append({'Score': score, 'Time': play['time'], 'Event': play['visitorText'], 'Team': 1})
+                else:
+                    events.append({'Score': score, 'Time': play['time'], 'Event': play['homeText'], 'Team': 0})
+        df = pd.DataFrame(events)
+        df['Name'] = df['Event'].apply(lambda event: (re.findall(r'\b[A-Z][a-z]+,?\s*[A-Z][a-z]+', event) or [None])[0])
+        df['Name'] = df['Name'].apply(collector.clean_name)
+        df['Event_Type'] = df['Event'].apply(collector.categorize_event)
+        df['Team'] = df['Team'].apply(lambda x: home if x == 0 else away)
+        df['IsFoul'] = df['Event'].str.contains('Foul', case=False)
+        foul_data.append(df[df['IsFoul']].groupby(['Name', 'Team']).size().reset_index(name='Fouls'))
+    return pd.concat(foul_data, ignore_index=True)
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [500, 2000, 8000]
+
+    # Keep the collector's data/<season> folder out of the repo
+    os.chdir(tempfile.mkdtemp())
+    collector = NCAADataCollector(season='2024', use_cache=False)
+
+    print(f"{'games':>7} {'events':>8} {'apply (s)':>10} {'vectorized (s)':>15} {'speedup':>8}  identical")
+    for size in sizes:
+        game_ids = [str(100000 + i) for i in range(size)]
+        documents = {game_id: {'pbp': make_game_fixtures(game_id)[1]} for game_id in game_ids}
+
+        started = time.perf_counter()
+        expected = apply_reference(collector, game_ids, documents)
+        legacy = time.perf_counter() - started
+
+        started = time.perf_counter()
+        events = parse_events(flatten_pbp(game_ids, documents))
+        result = fouls_won(events)
+        vectorized = time.perf_counter() - started
+
+        print(f"{size:>7} {len(events):>8} {legacy:>10.3f} {vectorized:>15.3f} {legacy / vectorized:>7.1f}x  {result.equals(expected)}")
+
+
+if __name__ == '__main__':
+    main()
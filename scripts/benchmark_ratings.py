@@ -0,0 +1,111 @@
+"""
+Benchmark the vectorized rating pipeline against the old row-wise DataFrame.apply path.
+Usage: python scripts/benchmark_ratings.py [sizes...]   (default: 6000 60000 600000)
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Ensure project root is on path when run from the scripts directory
+CUR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.abspath(os.path.join(CUR, '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from player_ratings import (
+    calculate_per90_stats, normalize_stats, calculate_max_ratings,
+    calculate_rating, get_position_weights
+)
+
+
+def make_synthetic_players(n_players, n_teams=200, seed=42):
+    """Build a merged player/team frame shaped like load_data() output"""
+    rng = np.random.default_rng(seed)
+    positions = rng.choice(['Forward', 'Midfielder', 'Defender', 'Unknown'], size=n_players, p=[0.25, 0.4, 0.33, 0.02])
+    teams = np.array([f'Team {i}' for i in range(n_teams)])
+    team_idx = rng.integers(0, n_teams, size=n_players)
+    shots = rng.poisson(15, size=n_players)
+
+    df = pd.DataFrame({
+        'Name': [f'Player {i}' for i in range(n_players)],
+        'Team': teams[team_idx],
+        'Position': positions,
+        'Minutes Played': rng.integers(300, 2000, size=n_players),
+        'Goals': rng.poisson(2, size=n_players),
+        'Assists': rng.poisson(2, size=n_players),
+        'Shots': shots,
+        'Shots On Target': rng.binomial(shots, 0.4),
+        'Fouls Won': rng.poisson(10, size=n_players),
+        'ATT': rng.uniform(0.3, 2.0, size=n_teams)[team_idx],
+        'DEF': rng.uniform(0.3, 2.0, size=n_teams)[team_idx],
+    })
+    return df
+
+
+def rowwise_pipeline(df):
+    """The pre-vectorization pipeline: row-wise apply for shot accuracy, team minutes and rating"""
+    df = df.copy()
+    df['Shot Accuracy'] = df.apply(
+        lambda row: row['Shots On Target'] / row['Shots'] if row['Shots'] > 0 else 0,
+        axis=1
+    )
+    df = calculate_per90_stats(df)
+    df = normalize_stats(df)
+    team_minutes = df.groupby('Team')['Minutes Played'].sum()
+    df['Team_Minutes_Played_Percentage'] = df.apply(
+        lambda row: row['Minutes Played'] / team_minutes[row['Team']], axis=1
+    )
+    weights = get_position_weights()
+    df['Overall_Rating'] = df.apply(lambda row: calculate_rating(row, weights), axis=1)
+    return df
+
+
+def vectorized_pipeline(df):
+    """The current pipeline"""
+    df = df.copy()
+    shots = df['Shots'].to_numpy(dtype=float)
+    df['Shot Accuracy'] = np.divide(
+        df['Shots On Target'].to_numpy(dtype=float), shots, out=np.zeros(len(df)), where=shots > 0
+    )
+    df = calculate_per90_stats(df)
+    df = normalize_stats(df)
+    df = calculate_max_ratings(df)
+    return df
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [6000, 60000, 600000]
+
+    print(f"{'players':>10} {'row-wise (s)':>14} {'vectorized (s)':>16} {'speedup':>9}  identical")
+    for size in sizes:
+        df = make_synthetic_players(size)
+
+        started = time.perf_counter()
+        vectorized = vectorized_pipeline(df)
+        vectorized_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        rowwise = rowwise_pipeline(df)
+        rowwise_time = time.perf_counter() - started
+
+        # MAX is a pure function of Overall_Rating and Position, so identical
+        # ratings mean identical MAX values
+        identical = (
+            np.array_equal(rowwise['Overall_Rating'].to_numpy(), vectorized['Overall_Rating'].to_numpy())
+            and np.array_equal(rowwise['Shot Accuracy'].to_numpy(), vectorized['Shot Accuracy'].to_numpy())
+            and np.array_equal(
+                rowwise['Team_Minutes_Played_Percentage'].to_numpy(),
+                vectorized['Team_Minutes_Played_Percentage'].to_numpy()
+            )
+        )
+
+        print(f"{size:>10} {rowwise_time:>14.3f} {vectorized_time:>16.3f} {rowwise_time / vectorized_time:>8.1f}x  {identical}")
+        if not identical:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark the Monte Carlo season simulator: simulated seasons per second on one process and
+on a process pool. The schedule is one round robin inside every conference of the current data.
+Usage: python scripts/benchmark_simulation.py [seasons] [workers...]   (default: 100000, 1 and all cores)
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+# Ensure project root is on path when run from the scripts directory
+CUR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.abspath(os.path.join(CUR, '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from db_access import connect_readonly
+from season_simulator import build_season_model, simulate_seasons
+
+
+def main():
+    seasons = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    workers = [int(arg) for arg in sys.argv[2:]] or sorted({1, os.cpu_count() or 1})
+
+    conn = connect_readonly(os.getenv('NCAA_DB_PATH', os.path.join(ROOT, 'data', 'ncaa_soccer.db')))
+    try:
+        model = build_season_model(conn, round_robin=True)
+    finally:
+        conn.close()
+    print(f"{len(model.home)} fixtures across {len(model.conferences)} conferences, {seasons:,} seasons")
+
+    print(f"{'workers':>8} {'time (s)':>10} {'seasons/s':>11}  same result")
+    baseline = None
+    for count in workers:
+        started = time.perf_counter()
+        result = simulate_seasons(model, seasons, workers=count, seed=2024)
+        elapsed = time.perf_counter() - started
+
+        # A fixed seed must give the same answer however the chunks are spread
+        baseline = baseline or result
+        same = np.array_equal(result['titles'], baseline['titles']) and \
+            np.array_equal(result['tournaments'], baseline['tournaments'])
+        print(f"{count:>8} {elapsed:>10.2f} {seasons / elapsed:>11,.0f}  {same}")
+
+
+if __name__ == '__main__':
+    main()
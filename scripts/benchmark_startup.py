@@ -0,0 +1,99 @@
+"""
+Benchmark web process cold start: time from interpreter start to the first response of the
+SQL-only pages (/, /matches, /teams), with a per-module `-X importtime` breakdown.
+Fails (exit 1) when the median time to first response exceeds the budget or when serving
+those pages imported pandas or matplotlib.
+Usage: python scripts/benchmark_startup.py [runs]   (default: 3; STARTUP_BUDGET=<seconds>, default 1.5)
+"""
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Ensure project root is on path when run from the scripts directory
+CUR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.abspath(os.path.join(CUR, '..'))
+
+STARTUP_BUDGET = float(os.getenv('STARTUP_BUDGET', '1.5'))
+SQL_ONLY_ROUTES = ['/', '/matches', '/teams']
+# Modules the SQL-only pages must not need
+DEFERRED_MODULES = ['pandas', 'matplotlib', 'player_ratings']
+
+CHILD = f"""
+import json, sys
+import ncaa_app
+client = ncaa_app.app.test_client()
+for route in {SQL_ONLY_ROUTES!r}:
+    assert client.get(route).status_code == 200, route
+print(json.dumps([m for m in {DEFERRED_MODULES!r} if m in sys.modules]))
+"""
+
+
+def run_once(db_path):
+    """(seconds to first responses, deferred modules loaded, importtime stderr) for one fresh process"""
+    env = dict(os.environ, NCAA_DB_PATH=db_path, RATINGS_WARMUP='0', RESPONSE_CACHE='off')
+    # Wall clock, so interpreter start-up counts too
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', CHILD],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    elapsed = time.perf_counter() - started
+    return elapsed, json.loads(result.stdout.strip().splitlines()[-1]), result.stderr
+
+
+def import_breakdown(stderr, limit=15):
+    """(cumulative seconds, module) for top-level imports and the modules they import directly"""
+    totals = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Each nesting level is indented by two more spaces
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth <= 1:
+            totals.append((int(cumulative) / 1e6, '  ' * depth + name.strip()))
+    return sorted(totals, reverse=True)[:limit]
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+    # A migrated scratch copy, so every measured run is a restart rather than a first deploy
+    db_path = os.path.join(tempfile.mkdtemp(), 'ncaa_soccer.db')
+    shutil.copy(os.getenv('NCAA_DB_PATH', os.path.join(ROOT, 'data', 'ncaa_soccer.db')), db_path)
+    run_once(db_path)
+
+    timings = []
+    loaded = set()
+    stderr = ''
+    for _ in range(runs):
+        elapsed, modules, stderr = run_once(db_path)
+        timings.append(elapsed)
+        loaded.update(modules)
+
+    median = statistics.median(timings)
+    print(f"{'seconds':>8}  module (indented: imported by the module above it)")
+    for seconds, name in import_breakdown(stderr):
+        print(f"{seconds:>8.3f}  {name}")
+    print(f"\nTime to first response: median {median:.3f}s over {runs} runs "
+          f"(min {min(timings):.3f}s, budget {STARTUP_BUDGET:.2f}s)")
+
+    ok = True
+    if loaded:
+        print(f"❌ SQL-only routes imported: {', '.join(sorted(loaded))}")
+        ok = False
+    if median > STARTUP_BUDGET:
+        print(f"❌ Cold start over budget by {median - STARTUP_BUDGET:.3f}s")
+        ok = False
+    if ok:
+        print("✅ Cold start within budget")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,5 +1,7 @@
 """
 CLI entry to run weekly data collection. Intended for Render Cron Jobs.
+Usage: python scripts/collect_weekly.py [season] [--incremental]
+  --incremental (or COLLECTION_MODE=incremental) ingests only games not seen before
 """
 import os
 import sys
@@ -12,12 +14,16 @@ if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
 
 from weekly_data_manager import SeasonDataManager
+from db_migrations import run_migrations
 
 
 def main():
-    season = sys.argv[1] if len(sys.argv) > 1 else os.getenv('SEASON', '2025')
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    season = args[0] if args else os.getenv('SEASON', '2025')
+    incremental = '--incremental' in sys.argv[1:] or os.getenv('COLLECTION_MODE', '').lower() == 'incremental'
 
     mgr = SeasonDataManager()
+    run_migrations(mgr.db_path)
 
     # Optionally allow forcing the season active via env
     if os.getenv('FORCE_ACTIVATE_SEASON', 'false').lower() in ('1', 'true', 'yes'):
@@ -26,12 +32,16 @@ def main():
         except Exception as e:
             print(f"Warning: could not activate season {season}: {e}")
 
-    ok = mgr.run_weekly_collection(season)
+    if incremental:
+        ok = mgr.run_incremental_collection(season)
+    else:
+        ok = mgr.run_weekly_collection(season)
+    mode = 'incremental' if incremental else 'weekly'
     if not ok:
-        print("Weekly collection reported failure or inactive season")
+        print(f"{mode.capitalize()} collection reported failure or inactive season")
         sys.exit(1)
 
-    print(f"Done weekly collection for {season} at {datetime.utcnow().isoformat()}Z")
+    print(f"Done {mode} collection for {season} at {datetime.utcnow().isoformat()}Z")
 
 
 if __name__ == '__main__':
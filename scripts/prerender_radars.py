@@ -0,0 +1,48 @@
+"""
+Pre-render PNG radar charts (RADAR_BACKEND=png) for every rated player so profile pages
+never wait on a render.
+Usage: python scripts/prerender_radars.py [--workers N] [--prune]
+  --prune  delete images in static/radars that no current player's chart uses
+"""
+import os
+import sys
+import time
+
+# Ensure project root is on path when run from the scripts directory
+CUR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.abspath(os.path.join(CUR, '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from radar_service import RadarRenderService, radar_chart_data, radar_filename
+from ratings_store import get_ratings_store
+
+
+def main():
+    args = sys.argv[1:]
+    workers = int(args[args.index('--workers') + 1]) if '--workers' in args else os.cpu_count()
+    prune = '--prune' in args
+
+    # Paths in the ratings pipeline and static/ are relative to the project root
+    os.chdir(ROOT)
+    players = [(record['Name'], record) for record in get_ratings_store().refresh().records()]
+    print(f"🖼️  {len(players)} rated players, {workers} render workers")
+
+    service = RadarRenderService(max_workers=workers)
+    started = time.time()
+    counts = service.prerender(players)
+    service.shutdown()
+    print(f"✅ {counts['rendered']} rendered, {counts['cached']} already cached, "
+          f"{counts['failed']} failed in {time.time() - started:.1f}s")
+
+    if prune:
+        current = {radar_filename(name, radar_chart_data(record)) for name, record in players}
+        stale = [name for name in os.listdir(service.output_dir)
+                 if name.endswith('.png') and name not in current]
+        for name in stale:
+            os.remove(os.path.join(service.output_dir, name))
+        print(f"🧹 Removed {len(stale)} stale radar images")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,358 @@
+"""
+Season Simulator for NCAA Soccer Dashboard
+Monte Carlo over the remaining schedule: each fixture's scoreline is drawn from the same
+truncated Poisson model as /api/predict-match, thousands of seasons at a time as NumPy arrays,
+with batches spread over a process pool. Reports conference finishing positions, regular-season
+title odds, conference tournament qualification and tournament wins.
+
+The remaining schedule is every matches row without a score, plus an optional CSV of
+home_team,away_team fixtures. Only conference games move the conference tables, so
+non-conference fixtures are ignored.
+"""
+
+import multiprocessing
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from db_access import connect_readonly
+from match_predictions import TEAM_RATINGS_SQL, TeamRatings, expected_goals, poisson_pmf
+
+# Teams reaching each conference tournament (top seeds get byes when this isn't a power of two)
+PLAYOFF_SPOTS = 6
+# Seasons per seeded task; results only depend on the seed and this, never on the worker count
+CHUNK_SEASONS = 10000
+# Seasons sampled per NumPy pass inside a task, to bound memory on long schedules
+BATCH_SEASONS = 1000
+EXCLUDED_CONFERENCES = {'Not D1'}
+
+
+def scoreline_cdf(home_lam, away_lam):
+    """Cumulative goal distributions on the model's truncated 0-5 grid, one row per fixture"""
+    cdfs = []
+    for lam in (home_lam, away_lam):
+        pmf = poisson_pmf(lam)
+        cdf = np.cumsum(pmf / pmf.sum(axis=-1, keepdims=True), axis=-1)
+        # Guard against rounding leaving the last step just under 1
+        cdf[..., -1] = 1.0
+        cdfs.append(cdf)
+    return cdfs
+
+
+def sample_goals(rng, cdf, size):
+    """Goals for `size` draws from rows of cdf (size must end with cdf's leading shape)"""
+    u = rng.random(size)
+    goals = np.zeros(size, dtype=np.int32)
+    # Counting the steps u clears is inverse-CDF sampling without a (size x grid) temporary
+    for step in range(cdf.shape[-1] - 1):
+        goals += u > cdf[..., step]
+    return goals
+
+
+def bracket_order(size):
+    """Seed numbers in bracket order, e.g. [1, 8, 4, 5, 2, 7, 3, 6], so top seeds meet last"""
+    order = [1]
+    while len(order) < size:
+        total = len(order) * 2 + 1
+        order = [seed for top in order for seed in (top, total - top)]
+    return order
+
+
+class SeasonModel:
+    """Everything a simulation needs as plain arrays, cheap to pickle into worker processes"""
+
+    def __init__(self, teams, conferences, ratings, standings, fixtures, playoff_spots=PLAYOFF_SPOTS):
+        self.teams = list(teams)
+        index = {team: i for i, team in enumerate(self.teams)}
+        self.conferences = {
+            conference: np.array([index[team] for team in members], dtype=int)
+            for conference, members in sorted(conferences.items())
+        }
+        self.playoff_spots = playoff_spots
+
+        # Unrated teams play at league average
+        self.att = np.array([ratings.get(team, (1.0, 1.0))[0] for team in self.teams], dtype=float)
+        self.def_ = np.array([ratings.get(team, (1.0, 1.0))[1] for team in self.teams], dtype=float)
+
+        # Current conference table: points, goal difference, goals for
+        self.base = np.zeros((3, len(self.teams)))
+        for team, (points, goal_difference, goals_for) in standings.items():
+            self.base[:, index[team]] = (points, goal_difference, goals_for)
+
+        self.home = np.array([index[home] for home, _ in fixtures], dtype=int)
+        self.away = np.array([index[away] for _, away in fixtures], dtype=int)
+        self.home_cdf, self.away_cdf = scoreline_cdf(*expected_goals(
+            self.att[self.home], self.def_[self.home], self.att[self.away], self.def_[self.away]))
+
+        # Fixture columns grouped by team, so per-team totals are one reduceat per side
+        self.home_order, self.home_teams, self.home_starts = self._grouping(self.home)
+        self.away_order, self.away_teams, self.away_starts = self._grouping(self.away)
+
+    @staticmethod
+    def _grouping(side):
+        order = np.argsort(side, kind='stable')
+        teams, starts = np.unique(side[order], return_index=True)
+        return order, teams, starts
+
+    def team_totals(self, home_values, away_values):
+        """Per-team sums of per-fixture values, given (seasons, fixtures) arrays for each side"""
+        totals = np.zeros((home_values.shape[0], len(self.teams)))
+        if len(self.home):
+            totals[:, self.home_teams] += np.add.reduceat(home_values[:, self.home_order], self.home_starts, axis=1)
+            totals[:, self.away_teams] += np.add.reduceat(away_values[:, self.away_order], self.away_starts, axis=1)
+        return totals
+
+
+def team_conferences(conn):
+    """{team: conference} using the label a team appears with most often in matches"""
+    df = pd.read_sql_query("""
+        SELECT home_team AS team, home_team_conference AS conference FROM matches
+        UNION ALL
+        SELECT away_team AS team, away_team_conference AS conference FROM matches
+    """, conn).dropna()
+    df = df[~df['conference'].isin(EXCLUDED_CONFERENCES)]
+    counts = df.groupby(['team', 'conference']).size().reset_index(name='games')
+    counts = counts.sort_values(['team', 'games', 'conference'], ascending=[True, False, True])
+    return dict(counts.drop_duplicates('team')[['team', 'conference']].itertuples(index=False))
+
+
+def round_robin_schedule(conferences):
+    """Single round robin inside every conference (for what-ifs and benchmarks)"""
+    fixtures = []
+    for members in conferences.values():
+        members = sorted(members)
+        fixtures.extend((home, away) for i, home in enumerate(members) for away in members[i + 1:])
+    return fixtures
+
+
+def build_season_model(conn, schedule=None, round_robin=False, playoff_spots=PLAYOFF_SPOTS):
+    """SeasonModel from played conference games, team ratings and the remaining fixtures"""
+    conference_of = team_conferences(conn)
+    conferences = {}
+    for team, conference in conference_of.items():
+        conferences.setdefault(conference, []).append(team)
+
+    def same_conference(home, away):
+        return home in conference_of and conference_of[home] == conference_of.get(away)
+
+    # Conference table so far, from conference games that have a result
+    standings = {team: [0, 0, 0] for team in conference_of}
+    played = conn.execute("""
+        SELECT home_team, home_team_score, away_team, away_team_score FROM matches
+        WHERE home_team_score IS NOT NULL AND away_team_score IS NOT NULL
+    """).fetchall()
+    for home, home_score, away, away_score in played:
+        if not same_conference(home, away):
+            continue
+        for team, scored, conceded in ((home, home_score, away_score), (away, away_score, home_score)):
+            standings[team][0] += 3 if scored > conceded else 1 if scored == conceded else 0
+            standings[team][1] += scored - conceded
+            standings[team][2] += scored
+
+    fixtures = [tuple(row) for row in conn.execute("""
+        SELECT home_team, away_team FROM matches
+        WHERE home_team_score IS NULL OR away_team_score IS NULL
+    """)]
+    fixtures += list(schedule or [])
+    if round_robin:
+        fixtures += round_robin_schedule(conferences)
+    fixtures = [(home, away) for home, away in fixtures if same_conference(home, away)]
+
+    try:
+        ratings = TeamRatings(conn.execute(TEAM_RATINGS_SQL).fetchall())
+        ratings = {team: (ratings.att[i], ratings.def_[i]) for team, i in ratings.index.items()}
+    except sqlite3.OperationalError:
+        # Database the migrations haven't reached yet: rate the teams from the matches directly
+        from team_standings import team_ratings
+        ratings = {team: (att, def_) for team, (att, def_, _) in team_ratings(conn).items()}
+    return SeasonModel(sorted(conference_of), conferences, ratings, standings, fixtures, playoff_spots)
+
+
+def load_schedule(path):
+    """Remaining fixtures from a CSV with home_team and away_team columns"""
+    df = pd.read_csv(path)
+    return list(df[['home_team', 'away_team']].itertuples(index=False, name=None))
+
+
+def _empty_counts(model):
+    return {
+        'seasons': 0,
+        'points': np.zeros(len(model.teams)),
+        'titles': np.zeros(len(model.teams), dtype=np.int64),
+        'playoffs': np.zeros(len(model.teams), dtype=np.int64),
+        'tournaments': np.zeros(len(model.teams), dtype=np.int64),
+        'positions': {conference: np.zeros((len(members), len(members)), dtype=np.int64)
+                      for conference, members in model.conferences.items()},
+    }
+
+
+def _merge_counts(total, counts):
+    total['seasons'] += counts['seasons']
+    for key in ('points', 'titles', 'playoffs', 'tournaments'):
+        total[key] += counts[key]
+    for conference, positions in counts['positions'].items():
+        total['positions'][conference] += positions
+    return total
+
+
+def _play_knockout(model, rng, home, away):
+    """Winners of one knockout round; drawn games go to a 50/50 shootout"""
+    home_cdf, away_cdf = scoreline_cdf(*expected_goals(
+        model.att[home], model.def_[home], model.att[away], model.def_[away]))
+    home_goals = sample_goals(rng, home_cdf, home.shape)
+    away_goals = sample_goals(rng, away_cdf, away.shape)
+    shootout = rng.random(home.shape) < 0.5
+    return (home_goals > away_goals) | ((home_goals == away_goals) & shootout)
+
+
+def _simulate_tournament(model, rng, seeds):
+    """Champion per simulated season given each season's seeded qualifiers (n, spots)"""
+    n, spots = seeds.shape
+    size = 1 << (spots - 1).bit_length()
+    # Slots hold per-season (seed number, team) arrays; seed numbers past the field are byes
+    slots = [
+        (np.full(n, seed), seeds[:, seed - 1]) if seed <= spots else None
+        for seed in bracket_order(size)
+    ]
+    while len(slots) > 1:
+        next_round = []
+        for top, bottom in zip(slots[::2], slots[1::2]):
+            if top is None or bottom is None:
+                next_round.append(top if bottom is None else bottom)
+                continue
+            # The better seed hosts
+            top_hosts = top[0] < bottom[0]
+            home_seed, away_seed = np.where(top_hosts, top[0], bottom[0]), np.where(top_hosts, bottom[0], top[0])
+            home, away = np.where(top_hosts, top[1], bottom[1]), np.where(top_hosts, bottom[1], top[1])
+            home_wins = _play_knockout(model, rng, home, away)
+            next_round.append((np.where(home_wins, home_seed, away_seed), np.where(home_wins, home, away)))
+        slots = next_round
+    return slots[0][1]
+
+
+def _simulate_chunk(model, n_seasons, seed_sequence):
+    """Process-pool entry point: n_seasons from one seeded generator, returned as counts"""
+    rng = np.random.default_rng(seed_sequence)
+    counts = _empty_counts(model)
+
+    for start in range(0, n_seasons, BATCH_SEASONS):
+        n = min(BATCH_SEASONS, n_seasons - start)
+        home_goals = sample_goals(rng, model.home_cdf, (n, len(model.home)))
+        away_goals = sample_goals(rng, model.away_cdf, (n, len(model.away)))
+
+        home_points = 3 * (home_goals > away_goals) + (home_goals == away_goals)
+        away_points = 3 * (away_goals > home_goals) + (home_goals == away_goals)
+        points = model.base[0] + model.team_totals(home_points, away_points)
+        goal_difference = model.base[1] + model.team_totals(home_goals - away_goals, away_goals - home_goals)
+        goals_for = model.base[2] + model.team_totals(home_goals, away_goals)
+
+        # Points, then goal difference, then goals for, then a coin toss; each term is
+        # scaled below the resolution of the one before it
+        score = points + goal_difference * 1e-3 + goals_for * 1e-6 + rng.random(points.shape) * 1e-9
+        counts['points'] += points.sum(axis=0)
+
+        for conference, members in model.conferences.items():
+            order = np.argsort(-score[:, members], axis=1)
+            ranked = members[order]
+            positions = counts['positions'][conference]
+            for place in range(len(members)):
+                positions[:, place] += np.bincount(order[:, place], minlength=len(members))
+
+            counts['titles'] += np.bincount(ranked[:, 0], minlength=len(model.teams))
+            qualifiers = ranked[:, :min(model.playoff_spots, len(members))]
+            counts['playoffs'] += np.bincount(qualifiers.ravel(), minlength=len(model.teams))
+            if qualifiers.shape[1] > 1:
+                champions = _simulate_tournament(model, rng, qualifiers)
+                counts['tournaments'] += np.bincount(champions, minlength=len(model.teams))
+            else:
+                counts['tournaments'] += np.bincount(qualifiers[:, 0], minlength=len(model.teams))
+        counts['seasons'] += n
+
+    return counts
+
+
+def simulate_seasons(model, n_seasons=100000, workers=None, seed=None, chunk_seasons=CHUNK_SEASONS):
+    """Aggregated counts over n_seasons simulated seasons.
+
+    Every chunk gets its own child of SeedSequence(seed), so a fixed seed reproduces the same
+    result on any number of workers.
+    """
+    sizes = [min(chunk_seasons, n_seasons - start) for start in range(0, n_seasons, chunk_seasons)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    workers = min(workers or os.cpu_count() or 1, len(sizes))
+
+    total = _empty_counts(model)
+    if workers <= 1:
+        for size, seed_sequence in zip(sizes, seeds):
+            _merge_counts(total, _simulate_chunk(model, size, seed_sequence))
+        return total
+
+    # spawn: the caller may be a threaded web worker, which fork can deadlock
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+        for counts in executor.map(_simulate_chunk, [model] * len(sizes), sizes, seeds):
+            _merge_counts(total, counts)
+    return total
+
+
+def summarize(model, counts):
+    """Per-conference odds tables, each team sorted by expected points"""
+    seasons = max(counts['seasons'], 1)
+    summary = {}
+    for conference, members in model.conferences.items():
+        positions = counts['positions'][conference] / seasons
+        rows = [{
+            'team': model.teams[team],
+            'expected_points': round(counts['points'][team] / seasons, 2),
+            'title': round(counts['titles'][team] / seasons * 100, 2),
+            'playoffs': round(counts['playoffs'][team] / seasons * 100, 2),
+            'tournament': round(counts['tournaments'][team] / seasons * 100, 2),
+            'positions': [round(p * 100, 2) for p in positions[i]],
+        } for i, team in enumerate(members)]
+        summary[conference] = sorted(rows, key=lambda row: (-row['expected_points'], row['team']))
+    return summary
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Monte Carlo conference standings and tournament odds')
+    parser.add_argument('--sims', type=int, default=100000)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--schedule', help='CSV of remaining fixtures (home_team,away_team)')
+    parser.add_argument('--round-robin', action='store_true', help='add a single round robin in every conference')
+    parser.add_argument('--playoff-spots', type=int, default=PLAYOFF_SPOTS)
+    parser.add_argument('--conference', help='only print this conference')
+    parser.add_argument('--db', default=os.getenv('NCAA_DB_PATH', 'data/ncaa_soccer.db'))
+    args = parser.parse_args()
+
+    conn = connect_readonly(args.db)
+    try:
+        schedule = load_schedule(args.schedule) if args.schedule else None
+        model = build_season_model(conn, schedule, args.round_robin, args.playoff_spots)
+    finally:
+        conn.close()
+    if not len(model.home):
+        print("⚠️  No remaining conference fixtures; odds reflect the current tables")
+
+    started = time.perf_counter()
+    counts = simulate_seasons(model, args.sims, args.workers, args.seed)
+    elapsed = time.perf_counter() - started
+    print(f"✅ Simulated {args.sims:,} seasons of {len(model.home)} fixtures in {elapsed:.2f}s")
+
+    for conference, rows in summarize(model, counts).items():
+        if args.conference and conference != args.conference:
+            continue
+        print(f"\n{conference}")
+        print(f"  {'Team':<28}{'xPts':>7}{'Title%':>8}{'Playoff%':>10}{'Champ%':>8}")
+        for row in rows:
+            print(f"  {row['team']:<28}{row['expected_points']:>7.1f}{row['title']:>8.1f}"
+                  f"{row['playoffs']:>10.1f}{row['tournament']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
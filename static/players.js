@@ -36,6 +36,7 @@ function jumpToPage() {
   if (pageNumber && pageNumber >= 1 && pageNumber <= maxPages) {
     const url = new URL(window.location.href);
     url.searchParams.set('page', pageNumber);
+    url.searchParams.delete('cursor'); // Jumping is offset-based; a keyset cursor would override the page
     window.location.href = url.toString();
   } else {
     alert('Please enter a page number between 1 and ' + maxPages);
@@ -63,9 +64,58 @@ document.addEventListener('DOMContentLoaded', function() {
     });
   }
   
+  if (searchInput) {
+    setupSearchSuggestions(searchInput);
+  }
+  
   console.log('players.js loaded successfully');
 });
 
+// Typeahead suggestions from /api/search under the player search box
+function setupSearchSuggestions(searchInput) {
+  const list = document.createElement('div');
+  list.className = 'list-group position-absolute w-100 shadow-sm';
+  list.style.top = '100%';
+  list.style.zIndex = '1000';
+  searchInput.parentElement.classList.add('position-relative');
+  searchInput.parentElement.appendChild(list);
+  searchInput.setAttribute('autocomplete', 'off');
+  
+  let timer = null;
+  let latest = 0;
+  
+  searchInput.addEventListener('input', function() {
+    clearTimeout(timer);
+    const query = searchInput.value.trim();
+    if (query.length < 2) {
+      list.innerHTML = '';
+      return;
+    }
+    timer = setTimeout(function() {
+      const request = ++latest;
+      fetch('/api/search?q=' + encodeURIComponent(query) + '&limit=8')
+        .then(response => response.json())
+        .then(players => {
+          if (request !== latest) return; // A newer keystroke already has its own request
+          list.innerHTML = '';
+          players.forEach(player => {
+            const item = document.createElement('a');
+            item.className = 'list-group-item list-group-item-action';
+            item.href = player.url;
+            item.textContent = player.name + ' \u2014 ' + player.team + (player.position ? ' (' + player.position + ')' : '');
+            list.appendChild(item);
+          });
+        })
+        .catch(error => console.error('Error loading search suggestions:', error));
+    }, 150);
+  });
+  
+  // Hide suggestions when focus leaves the search box (after a click on one has registered)
+  searchInput.addEventListener('blur', function() {
+    setTimeout(function() { list.innerHTML = ''; }, 200);
+  });
+}
+
 // Season/Date selector functions (for future use)
 function updateAvailableDates() {
   const season = document.getElementById('season-select').value;
@@ -0,0 +1,235 @@
+"""
+Local stub of the NCAA scoreboard and casablanca game-data endpoints.
+Serves fixture boxscore/pbp JSON so the collector can be tested and benchmarked offline.
+Usage: python stub_ncaa_server.py [port] [games_per_day] [latency_ms]
+"""
+
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIRST_NAMES = ['Liam', 'Noah', 'Mateo', 'Lucas', 'Ethan', 'Owen', 'Diego', 'Samuel', 'Jonas', 'Emil',
+               'Kwame', 'Omar', 'Hector', 'Bennett', 'Cohen', 'Brady', 'Scott', 'Alec', 'Jose', 'Ulfur']
+LAST_NAMES = ['Smith', 'Garcia', 'Diarra', 'Hughes', 'Harris', 'Painter', 'Weaver', 'Veltri', 'Dobruna', 'Barea',
+              'Acuna', 'Luna', 'Yehya', 'Testori', 'Navarro', 'Bjornsson', 'Amaya', 'Taboada', 'Geho', 'Schuetz']
+TEAMS = ['Akron', 'Duke', 'Indiana', 'Clemson', 'Marshall', 'Ohio St.', 'Stanford', 'Wake Forest',
+         'Virginia', 'Syracuse', 'Denver', 'Creighton', 'Pittsburgh', 'Louisville', 'Maryland', 'UCLA']
+POSITIONS = ['F', 'M', 'D', 'G', 'MF', 'DM']
+
+
+def _roster(rng, team):
+    """Deterministic 14-player roster for a team"""
+    players = []
+    for i in range(14):
+        players.append({
+            'firstName': rng.choice(FIRST_NAMES),
+            'lastName': f"{rng.choice(LAST_NAMES)}{'' if i < 10 else i}",
+            'position': rng.choice(POSITIONS),
+        })
+    return players
+
+
+def make_game_fixtures(game_id, status='F'):
+    """Boxscore and play-by-play documents shaped like the casablanca JSON"""
+    rng = random.Random(int(game_id))
+    home, away = rng.sample(TEAMS, 2)
+    teams_meta = [
+        {'id': 1, 'shortName': home, 'homeTeam': 'true'},
+        {'id': 2, 'shortName': away, 'homeTeam': 'false'},
+    ]
+
+    box_teams = []
+    rosters = {}
+    for team_id, team in ((1, home), (2, away)):
+        roster = _roster(random.Random(f"{team}"), team)
+        rosters[team_id] = roster
+        player_stats = []
+        for player in roster:
+            shots = rng.randint(0, 4)
+            player_stats.append({
+                'firstName': player['firstName'],
+                'lastName': player['lastName'],
+                'position': player['position'],
+                'minutesPlayed': str(rng.choice([90, 90, 75, 45, 20])),
+                'goals': str(rng.choice([0, 0, 0, 1])),
+                'assists': str(rng.choice([0, 0, 0, 1])),
+                'shots': str(shots),
+                'shotsOnGoal': str(rng.randint(0, shots)),
+            })
+        box_teams.append({'teamId': str(team_id), 'playerStats': player_stats})
+
+    boxscore = {'meta': {'teams': teams_meta, 'status': status}, 'teams': box_teams}
+
+    periods = []
+    home_goals = away_goals = 0
+    for period in (1, 2):
+        plays = []
+        for minute in range(0, 45, 3):
+            team_id = rng.choice((1, 2))
+            player = rng.choice(rosters[team_id])
+            name = f"{player['lastName']},{player['firstName']}"
+            kind = rng.choice(['Foul on', 'Shot by', 'Corner kick by', 'Offside against', 'Goal by', 'Foul on'])
+            score = ''
+            if kind == 'Goal by':
+                if team_id == 1:
+                    home_goals += 1
+                else:
+                    away_goals += 1
+                score = f"{home_goals}-{away_goals}"
+            text = f"{kind} {name}"
+            plays.append({
+                'score': score,
+                'time': f"{(period - 1) * 45 + minute:02d}:00",
+                'visitorText': text if team_id == 2 else '',
+                'homeText': text if team_id == 1 else '',
+            })
+        periods.append({'periodNumber': str(period), 'playStats': plays})
+
+    pbp = {'meta': {'teams': teams_meta, 'status': status}, 'periods': periods}
+    return boxscore, pbp
+
+
+class StubNCAAServer:
+    """Threaded HTTP server serving scoreboard pages and per-game JSON fixtures"""
+
+    def __init__(self, games_per_day=10, latency=0.0, fail_first=0, port=0, live_games=()):
+        self.games_per_day = games_per_day
+        self.latency = latency
+        self.fail_first = fail_first
+        self.port = port
+        # Games reported as in progress ('I') instead of final ('F')
+        self.live_games = set(live_games)
+        self.requests = 0
+        self.not_modified = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._failures = {}
+        self._lock = threading.Lock()
+        self._fixtures = {}
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    @property
+    def scoreboard_url(self):
+        return f"{self.base_url}/scoreboard/soccer-men"
+
+    @property
+    def game_data_url(self):
+        return f"{self.base_url}/casablanca/game"
+
+    def game_ids_for_day(self, month, day):
+        first = int(month) * 10000 + int(day) * 100
+        return [str(first + i) for i in range(self.games_per_day)]
+
+    def fixtures(self, game_id):
+        with self._lock:
+            if game_id not in self._fixtures:
+                status = 'I' if game_id in self.live_games else 'F'
+                self._fixtures[game_id] = make_game_fixtures(game_id, status)
+            return self._fixtures[game_id]
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.requests += 1
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                try:
+                    if stub.latency:
+                        time.sleep(stub.latency)
+                    self.route()
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+
+            def route(self):
+                parts = self.path.strip('/').split('/')
+
+                # Fail the first N requests per path to exercise retries
+                with stub._lock:
+                    failures = stub._failures.get(self.path, 0)
+                    if failures < stub.fail_first:
+                        stub._failures[self.path] = failures + 1
+                        self.send_response(503)
+                        self.end_headers()
+                        return
+
+                if parts[0] == 'scoreboard' and len(parts) >= 6:
+                    links = ''.join(
+                        f'<a class="gamePod-link" href="/game/{game_id}">Game</a>'
+                        for game_id in stub.game_ids_for_day(parts[4], parts[5])
+                    )
+                    self.reply(200, f"<html><body>{links}</body></html>".encode(), 'text/html')
+                elif parts[0] == 'casablanca' and len(parts) == 4 and parts[3] in ('boxscore.json', 'pbp.json'):
+                    boxscore, pbp = stub.fixtures(parts[2])
+                    document = boxscore if parts[3] == 'boxscore.json' else pbp
+                    self.reply(200, json.dumps(document).encode(), 'application/json')
+                else:
+                    self.reply(404, b'{}', 'application/json')
+
+            def reply(self, status, body, content_type):
+                # Honour conditional requests the way the real CDN does
+                etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+                if status == 200 and self.headers.get('If-None-Match') == etag:
+                    with stub._lock:
+                        stub.not_modified += 1
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                self.send_response(status)
+                self.send_header('ETag', etag)
+                self.send_header('Last-Modified', 'Sat, 02 Nov 2024 23:00:00 GMT')
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+    def start(self):
+        self._server = ThreadingHTTPServer(('127.0.0.1', self.port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import sys
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    games = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    latency_ms = float(sys.argv[3]) if len(sys.argv) > 3 else 0
+    server = StubNCAAServer(games_per_day=games, latency=latency_ms / 1000, port=port).start()
+    print(f"Stub NCAA server on {server.base_url}")
+    print(f"  NCAA_SCOREBOARD_URL={server.scoreboard_url}")
+    print(f"  NCAA_GAME_DATA_URL={server.game_data_url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
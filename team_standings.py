@@ -0,0 +1,182 @@
+"""
+Materialized Team Standings
+Keeps team_standings (GP, W/D/L, GF/GA, GD, points and the team ATT/DEF/MAX ratings) per
+season and snapshot, so /teams and team profiles read one indexed table instead of
+aggregating every match per request. Triggers on matches record which teams changed in
+team_standings_dirty; a refresh re-aggregates only those teams when a snapshot already exists.
+"""
+
+import os
+import time
+
+from app_state import bump_data_version
+from db_access import connect_readonly, write_transaction
+
+# Above this many changed teams a full rebuild is as cheap as per-team updates
+FULL_REFRESH_TEAMS = 50
+
+STANDINGS_SQL = """
+    SELECT
+        team,
+        COUNT(*) as games_played,
+        SUM(wins) as wins,
+        SUM(draws) as draws,
+        SUM(losses) as losses,
+        SUM(goals_for) as goals_for,
+        SUM(goals_against) as goals_against
+    FROM (
+        SELECT
+            home_team as team,
+            home_team_score as goals_for,
+            away_team_score as goals_against,
+            CASE WHEN home_team_score > away_team_score THEN 1 ELSE 0 END as wins,
+            CASE WHEN home_team_score = away_team_score THEN 1 ELSE 0 END as draws,
+            CASE WHEN home_team_score < away_team_score THEN 1 ELSE 0 END as losses
+        FROM matches
+        WHERE home_team IS NOT NULL {home_filter}
+        UNION ALL
+        SELECT
+            away_team as team,
+            away_team_score as goals_for,
+            home_team_score as goals_against,
+            CASE WHEN away_team_score > home_team_score THEN 1 ELSE 0 END as wins,
+            CASE WHEN away_team_score = home_team_score THEN 1 ELSE 0 END as draws,
+            CASE WHEN away_team_score < home_team_score THEN 1 ELSE 0 END as losses
+        FROM matches
+        WHERE away_team IS NOT NULL {away_filter}
+    ) team_results
+    GROUP BY team
+"""
+
+
+def current_snapshot(conn):
+    """(season, snapshot_date) the standings belong to: the newest current data snapshot"""
+    row = conn.execute("""
+        SELECT season, snapshot_date FROM data_snapshots
+        WHERE is_current = TRUE
+        ORDER BY season DESC, snapshot_date DESC
+        LIMIT 1
+    """).fetchone()
+    if row is None:
+        row = conn.execute("""
+            SELECT season, MAX(data_date) FROM players
+            WHERE season = (SELECT MAX(season) FROM players)
+        """).fetchone()
+    return tuple(row) if row and row[0] is not None else None
+
+
+def standings_are_stale(conn):
+    """True when the current snapshot has no standings yet or matches changed since the last refresh"""
+    snapshot = current_snapshot(conn)
+    if snapshot is None:
+        return False
+    exists = conn.execute(
+        "SELECT 1 FROM team_standings WHERE season = ? AND snapshot_date = ? LIMIT 1", snapshot
+    ).fetchone()
+    return exists is None or conn.execute("SELECT 1 FROM team_standings_dirty LIMIT 1").fetchone() is not None
+
+
+def team_ratings(conn):
+    """{team: (ATT, DEF, MAX)} from every match; league averages make these global"""
+    import pandas as pd
+    from player_ratings import calculate_team_max_ratings
+
+    matches = pd.read_sql_query("SELECT * FROM matches", conn)
+    if matches.empty:
+        return {}
+    ratings = calculate_team_max_ratings(matches)
+    return {
+        team: (float(att), float(def_), float(max_rating))
+        for team, att, def_, max_rating in zip(ratings['Team'], ratings['ATT'], ratings['DEF'], ratings['MAX'])
+    }
+
+
+def refresh_team_standings(conn, full=False):
+    """Bring team_standings up to date for the current snapshot; runs in the caller's transaction.
+
+    Returns the number of teams whose record was recomputed (0 when nothing changed).
+    """
+    snapshot = current_snapshot(conn)
+    if snapshot is None:
+        return 0
+    season, snapshot_date = snapshot
+
+    exists = conn.execute(
+        "SELECT 1 FROM team_standings WHERE season = ? AND snapshot_date = ? LIMIT 1", snapshot
+    ).fetchone()
+    dirty = [row[0] for row in conn.execute("SELECT team FROM team_standings_dirty")]
+    if exists and not full and not dirty:
+        return 0
+
+    if full or not exists or len(dirty) > FULL_REFRESH_TEAMS:
+        conn.execute("DELETE FROM team_standings WHERE season = ? AND snapshot_date = ?", snapshot)
+        rows = conn.execute(STANDINGS_SQL.format(home_filter='', away_filter='')).fetchall()
+    else:
+        # Only the changed teams; the filters seek idx_matches_home / idx_matches_away
+        rows = conn.execute(STANDINGS_SQL.format(
+            home_filter="AND home_team IN (SELECT team FROM team_standings_dirty)",
+            away_filter="AND away_team IN (SELECT team FROM team_standings_dirty)",
+        )).fetchall()
+        # Teams left without any match drop out of the standings
+        conn.execute("""
+            DELETE FROM team_standings
+            WHERE season = ? AND snapshot_date = ? AND team IN (SELECT team FROM team_standings_dirty)
+        """, snapshot)
+
+    conn.executemany("""
+        INSERT OR REPLACE INTO team_standings
+        (season, snapshot_date, team, games_played, wins, draws, losses,
+         goals_for, goals_against, goal_difference, points)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, [
+        (season, snapshot_date, team, games, wins, draws, losses,
+         goals_for, goals_against, goals_for - goals_against, wins * 3 + draws)
+        for team, games, wins, draws, losses, goals_for, goals_against in rows
+    ])
+
+    # Any match change moves the league averages behind every team's ratings
+    try:
+        ratings = team_ratings(conn)
+    except Exception as e:
+        print(f"⚠️  Could not calculate team ratings: {e}")
+        ratings = {}
+    conn.execute("""
+        UPDATE team_standings SET att_rating = NULL, def_rating = NULL, max_rating = NULL
+        WHERE season = ? AND snapshot_date = ?
+    """, snapshot)
+    conn.executemany("""
+        UPDATE team_standings SET att_rating = ?, def_rating = ?, max_rating = ?
+        WHERE season = ? AND snapshot_date = ? AND team = ?
+    """, [(att, def_, max_rating, season, snapshot_date, team)
+          for team, (att, def_, max_rating) in ratings.items()])
+
+    conn.execute("DELETE FROM team_standings_dirty")
+    bump_data_version(conn)
+    return len(rows)
+
+
+def ensure_team_standings(db_path=None, full=False):
+    """Standalone refresh (app start, CLI); commits its own transaction"""
+    db_path = db_path or os.getenv('NCAA_DB_PATH', 'data/ncaa_soccer.db')
+    if not full:
+        # Checking for work only reads, so an up-to-date start doesn't wait on an import's write lock
+        conn = connect_readonly(db_path)
+        try:
+            stale = standings_are_stale(conn)
+        finally:
+            conn.close()
+        if not stale:
+            return 0
+
+    started = time.perf_counter()
+    with write_transaction(db_path) as conn:
+        count = refresh_team_standings(conn, full=full)
+    if count:
+        print(f"✅ Refreshed standings for {count} teams in {time.perf_counter() - started:.2f}s")
+    return count
+
+
+if __name__ == "__main__":
+    import sys
+    path = sys.argv[1] if len(sys.argv) > 1 and not sys.argv[1].startswith('--') else None
+    ensure_team_standings(path, full='--full' in sys.argv)
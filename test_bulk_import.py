@@ -0,0 +1,76 @@
+import os
+import sqlite3
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+import pytest
+
+from db_migrations import run_migrations
+from weekly_data_manager import SeasonDataManager
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    db_path = str(tmp_path / 'ncaa_soccer.db')
+    run_migrations(db_path, verbose=False)
+    monkeypatch.setenv('NCAA_DB_PATH', db_path)
+    return SeasonDataManager()
+
+
+def make_stats(n, goals=1):
+    return pd.DataFrame({
+        'Name': [f'Player {i}' for i in range(n)],
+        'Team': [f'Team {i % 7}' for i in range(n)],
+        'Position': ['Forward', 'Defender'] * (n // 2),
+        'Minutes Played': range(n),
+        'Goals': [goals] * n,
+        'Assists': [0] * n,
+        'Shots': [3] * n,
+        'Shots On Target': [2] * n,
+        'Fouls Won': [4.0] * n,
+    })
+
+
+def test_bulk_import_writes_players_and_history(manager):
+    assert manager.import_weekly_data(make_stats(500), '2025', '2025-09-01', 'week 1')
+
+    conn = sqlite3.connect(manager.db_path)
+    players = conn.execute("""
+        SELECT name, team, position, minutes_played, goals, fouls_won, season, data_date
+        FROM players ORDER BY minutes_played
+    """).fetchall()
+    history = conn.execute("SELECT COUNT(*) FROM player_stats_history WHERE snapshot_date = '2025-09-01'").fetchone()
+    journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    conn.close()
+
+    assert len(players) == 500
+    assert players[3] == ('Player 3', 'Team 3', 'Defender', 3, 1, 4, '2025', '2025-09-01')
+    assert history == (500,)
+    assert journal_mode == 'wal'
+
+
+def test_reimport_replaces_the_snapshot(manager):
+    manager.import_weekly_data(make_stats(100), '2025', '2025-09-01')
+    manager.import_weekly_data(make_stats(60, goals=2), '2025', '2025-09-01')
+
+    conn = sqlite3.connect(manager.db_path)
+    totals = conn.execute("SELECT COUNT(*), SUM(goals) FROM players WHERE data_date = '2025-09-01'").fetchone()
+    conn.close()
+    assert totals == (60, 120)
+
+
+def test_failed_import_leaves_nothing_behind(manager):
+    bad = make_stats(10)
+    bad.loc[5, 'Name'] = None  # history.player_name is NOT NULL
+    assert not manager.import_weekly_data(bad, '2025', '2025-09-01')
+
+    conn = sqlite3.connect(manager.db_path)
+    counts = [conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+              for table in ('players', 'player_stats_history', 'data_snapshots')]
+    conn.close()
+    assert counts == [0, 0, 0]
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,71 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from ncaa_data_collector import NCAADataCollector
+from stub_ncaa_server import StubNCAAServer
+
+
+def make_collector(server, **kwargs):
+    return NCAADataCollector(
+        season='2024', division='d1',
+        scoreboard_url=server.scoreboard_url,
+        game_data_url=server.game_data_url,
+        **kwargs
+    )
+
+
+@pytest.fixture(autouse=True)
+def scratch_dir(tmp_path, monkeypatch):
+    # The collector creates data/<season>/ relative to the working directory
+    monkeypatch.chdir(tmp_path)
+
+
+def test_fetches_boxscore_and_pbp_for_every_game():
+    with StubNCAAServer(games_per_day=12) as server:
+        collector = make_collector(server)
+        game_ids = collector.get_game_ids('11/02')
+        documents = collector.fetch_game_documents(game_ids)
+
+    assert len(game_ids) == 12
+    for game_id in game_ids:
+        assert 'meta' in documents[game_id]['boxscore']
+        assert 'periods' in documents[game_id]['pbp']
+    # One scoreboard page plus two documents per game
+    assert server.requests == 1 + 2 * 12
+
+
+def test_per_host_concurrency_limit():
+    with StubNCAAServer(games_per_day=10, latency=0.05) as server:
+        collector = make_collector(server, max_workers=16, per_host_limit=3)
+        collector.fetch_game_documents(server.game_ids_for_day(11, 2))
+
+    assert server.max_in_flight <= 3
+
+
+def test_retries_transient_errors():
+    with StubNCAAServer(games_per_day=4, fail_first=2) as server:
+        collector = make_collector(server, retries=3, backoff_factor=0.01)
+        documents = collector.fetch_game_documents(server.game_ids_for_day(11, 2))
+
+    assert all(doc['boxscore'] and doc['pbp'] for doc in documents.values())
+
+
+def test_collect_season_data_from_stub():
+    with StubNCAAServer(games_per_day=6) as server:
+        collector = make_collector(server)
+        player_stats, description = collector.collect_season_data('2024-11-01', '2024-11-02', 'stub run')
+
+    assert description == 'stub run'
+    assert len(player_stats) > 0
+    assert list(player_stats.columns) == [
+        'Name', 'Team', 'Position', 'Minutes Played', 'Goals', 'Assists',
+        'Shots', 'Shots On Target', 'Fouls Won'
+    ]
+    assert player_stats['Fouls Won'].sum() > 0
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
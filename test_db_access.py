@@ -0,0 +1,151 @@
+import json
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from db_access import (BUSY_TIMEOUT_MS, connect, connect_readonly, get_writer,
+                       write_transaction)
+from db_migrations import run_migrations
+from update_conferences_from_csv import update_conferences_from_csv
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DB = os.path.join(ROOT, 'data', 'ncaa_soccer.db')
+
+# Reader threads page through /players while the main thread imports 50k players into a season
+# with no earlier snapshot (so player_history stores a version for every one of them, 100k rows in
+# all) and a second writer (a season switch) lands mid-import
+STRESS = """
+import json, sqlite3, threading, time
+import pandas as pd
+import ncaa_app
+from weekly_data_manager import SeasonDataManager
+
+QUERIES = ['', '?sort=max&order=desc', '?page=3', '?conference=ACC', '?position=D&sort=assists',
+           '?search=smith', '?sort=goals_per_90&paging=keyset']
+done = threading.Event()
+latencies, failures = [], []
+
+def read(offset):
+    client = ncaa_app.app.test_client()
+    i = offset
+    while not done.is_set():
+        started = time.perf_counter()
+        try:
+            response = client.get('/players' + QUERIES[i % len(QUERIES)])
+            if response.status_code != 200:
+                failures.append(response.status_code)
+        except Exception as e:
+            failures.append(str(e))
+        latencies.append(time.perf_counter() - started)
+        i += 1
+
+def write():
+    time.sleep(2.0)
+    try:
+        SeasonDataManager().activate_season('2024')
+    except Exception as e:
+        failures.append(str(e))
+
+readers = [threading.Thread(target=read, args=(n,)) for n in range(4)]
+writer = threading.Thread(target=write)
+for thread in readers + [writer]:
+    thread.start()
+time.sleep(0.5)
+
+n = 50000  # the season's first snapshot, so player_history gets a version per player too
+stats = pd.DataFrame({
+    'Name': [f'Player {i}' for i in range(n)], 'Team': [f'Team {i % 200}' for i in range(n)],
+    'Position': ['Forward', 'Defender'] * (n // 2), 'Minutes Played': [900] * n, 'Goals': [i % 9 for i in range(n)],
+    'Assists': [1] * n, 'Shots': [10] * n, 'Shots On Target': [4] * n, 'Fouls Won': [5.0] * n,
+})
+imported = SeasonDataManager().import_weekly_data(stats, '2023', '2023-12-31', 'stress test')
+writer.join()
+done.set()
+for reader in readers:
+    reader.join()
+
+latencies.sort()
+conn = sqlite3.connect(ncaa_app.db_path)
+versions = conn.execute("SELECT COUNT(*) FROM player_history WHERE season = '2023'").fetchone()[0]
+conn.close()
+print(json.dumps({'imported': imported, 'n': n, 'versions': versions, 'reads': len(latencies),
+                  'failures': failures[:5], 'p99': latencies[int(len(latencies) * 0.99)]}))
+"""
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / 'ncaa_soccer.db')
+    shutil.copy(SOURCE_DB, path)
+    run_migrations(path, verbose=False)
+    return path
+
+
+def test_connections_use_wal_and_tuned_pragmas(db_path):
+    conn = connect(db_path)
+    assert conn.execute("PRAGMA journal_mode").fetchone() == ('wal',)
+    conn.close()
+
+    reader = connect_readonly(db_path)
+    assert reader.execute("PRAGMA busy_timeout").fetchone() == (BUSY_TIMEOUT_MS,)
+    assert reader.execute("PRAGMA cache_size").fetchone()[0] < 0
+    with pytest.raises(sqlite3.OperationalError, match='readonly'):
+        reader.execute("DELETE FROM players")
+    reader.close()
+
+
+def test_write_transaction_reuses_one_writer_and_rolls_back(db_path):
+    assert get_writer(db_path) is get_writer(db_path)
+
+    with pytest.raises(ZeroDivisionError):
+        with write_transaction(db_path) as conn:
+            conn.execute("DELETE FROM players")
+            1 / 0
+    with write_transaction(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM players").fetchone()[0] > 0
+
+
+def test_conference_update_waits_for_another_process_writing(db_path):
+    # Longer than sqlite3's default 5s timeout, well inside busy_timeout
+    holder = subprocess.Popen([sys.executable, '-c', (
+        "import sqlite3, sys, time\n"
+        "conn = sqlite3.connect(sys.argv[1], isolation_level=None)\n"
+        "conn.execute('BEGIN IMMEDIATE')\n"
+        "print('locked', flush=True)\n"
+        "time.sleep(6)\n"
+        "conn.execute('COMMIT')\n"
+    ), db_path], stdout=subprocess.PIPE, text=True)
+    assert holder.stdout.readline().strip() == 'locked'
+
+    started = time.perf_counter()
+    update_conferences_from_csv(db_path)
+    assert holder.wait() == 0
+    assert time.perf_counter() - started > 5
+
+    conn = connect_readonly(db_path)
+    assert conn.execute("SELECT COUNT(*) FROM players WHERE conference IS NULL").fetchone()[0] == 0
+    conn.close()
+
+
+def test_players_pages_stay_fast_during_a_large_import(db_path):
+    env = dict(os.environ, NCAA_DB_PATH=db_path, RATINGS_WARMUP='0', RESPONSE_CACHE='off')
+    result = subprocess.run([sys.executable, '-c', STRESS], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+
+    assert report['imported']
+    assert report['versions'] == report['n']
+    assert 'database is locked' not in result.stdout + result.stderr
+    assert report['failures'] == []
+    assert report['reads'] > 20
+    assert report['p99'] < 2.0
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
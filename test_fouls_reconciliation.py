@@ -0,0 +1,83 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ncaa_data_collector import NCAADataCollector
+
+PLAYERS_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'd1_player_stats.csv')
+
+
+@pytest.fixture
+def collector(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return NCAADataCollector(season='2024', use_cache=False)
+
+
+def iterrows_reference(df, fouls):
+    """The original per-row implementation"""
+    df = df.copy()
+    for idx, row in df.iterrows():
+        if row['Fouls Won'] == 0:
+            matching_fouls = fouls[
+                (fouls['Team'] == row['Team']) &
+                (fouls['Name'].apply(lambda x: row['Name'] in x or x in row['Name']))
+            ]
+            if not matching_fouls.empty:
+                total_fouls = matching_fouls['Fouls'].sum()
+                df.at[idx, 'Fouls Won'] = total_fouls
+    return df
+
+
+def season_frames(teams=None, seed=3):
+    """2024 players with some fouls missing, and play-by-play style foul names per team"""
+    rng = np.random.default_rng(seed)
+    players = pd.read_csv(PLAYERS_CSV)[['Name', 'Team', 'Fouls Won']]
+    if teams is not None:
+        players = players[players['Team'].isin(players['Team'].unique()[:teams])]
+    players = players.assign(Name=players['Name'].str.lower()).reset_index(drop=True)
+
+    foul_rows = []
+    for name, team, fouls_won in players.itertuples(index=False):
+        parts = name.split()
+        spellings = [name, parts[-1], f"{parts[-1]},{parts[0]}"] if len(parts) > 1 else [name]
+        for spelling in rng.choice(spellings, size=rng.integers(1, 3), replace=False):
+            foul_rows.append((spelling, team, int(rng.integers(1, 6))))
+    for team in players['Team'].unique()[::5]:
+        foul_rows.append(('', team, 2))  # events without a parsable name
+    fouls = pd.DataFrame(foul_rows, columns=['Name', 'Team', 'Fouls'])
+    fouls = fouls.groupby(['Name', 'Team'], as_index=False).sum()
+
+    merged = pd.merge(players, fouls, on=['Name', 'Team'], how='left')
+    merged['Fouls Won'] = merged['Fouls'].fillna(0)
+    return merged, fouls
+
+
+def test_matches_iterrows_implementation(collector):
+    players, fouls = season_frames(teams=60)
+    assert (players['Fouls Won'] == 0).sum() > 100
+
+    result = collector.update_fouls_for_subset_names(players, fouls)
+    expected = iterrows_reference(players, fouls)
+
+    assert result.equals(expected)
+    assert (result.dtypes == expected.dtypes).all()
+    assert not players.equals(result)
+
+
+def test_integer_fouls_column_keeps_its_dtype(collector):
+    players = pd.DataFrame({'Name': ['liam smith', 'noah garcia'], 'Team': ['Akron', 'Akron'],
+                            'Fouls Won': [0, 3]})
+    fouls = pd.DataFrame({'Name': ['smith', 'garcia'], 'Team': ['Akron', 'Akron'], 'Fouls': [4, 1]})
+
+    result = collector.update_fouls_for_subset_names(players, fouls)
+
+    assert result['Fouls Won'].tolist() == [4, 3]
+    assert result.equals(iterrows_reference(players, fouls))
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,73 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from http_cache import HTTPResponseCache
+from ncaa_data_collector import NCAADataCollector
+from stub_ncaa_server import StubNCAAServer
+
+
+@pytest.fixture(autouse=True)
+def scratch_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+
+def make_collector(server, cache, **kwargs):
+    return NCAADataCollector(
+        season='2024', scoreboard_url=server.scoreboard_url,
+        game_data_url=server.game_data_url, cache=cache, **kwargs
+    )
+
+
+def test_final_games_are_served_from_disk(tmp_path):
+    cache = HTTPResponseCache(str(tmp_path / 'cache'))
+    with StubNCAAServer(games_per_day=8) as server:
+        make_collector(server, cache).collect_season_data('2024-11-01', '2024-11-02')
+        first_run = server.requests
+
+        # A fresh collector (next cron run) over the same window needs no network at all
+        collector = make_collector(server, cache)
+        collector.collect_season_data('2024-11-01', '2024-11-02')
+
+    assert first_run == 2 + 2 * 8 * 2
+    assert server.requests == first_run
+    assert collector.stats['network'] == 0
+    assert collector.stats['cache_hits'] == first_run
+
+
+def test_live_games_expire_and_revalidate(tmp_path):
+    cache = HTTPResponseCache(str(tmp_path / 'cache'))
+    with StubNCAAServer(games_per_day=3, live_games={'110200'}) as server:
+        game_ids = server.game_ids_for_day(11, 2)
+        make_collector(server, cache).fetch_game_documents(game_ids)
+
+        # Within the TTL the live game is a cache hit
+        collector = make_collector(server, cache, live_ttl=300)
+        collector.fetch_game_documents(game_ids)
+        assert collector.stats['network'] == 0
+
+        # Once expired it is revalidated with If-None-Match and answered with a 304
+        collector = make_collector(server, cache, live_ttl=0)
+        documents = collector.fetch_game_documents(game_ids)
+
+    assert collector.stats['network'] == 2
+    assert collector.stats['revalidated'] == 2
+    assert server.not_modified == 2
+    assert documents['110200']['boxscore']['meta']['status'] == 'I'
+
+
+def test_cache_entries_round_trip(tmp_path):
+    cache = HTTPResponseCache(str(tmp_path / 'cache'))
+    cache.put('game:1:boxscore', 'http://x/1', {'meta': {}}, final=True, etag='"abc"')
+
+    entry = cache.get('game:1:boxscore')
+    assert entry['body'] == {'meta': {}}
+    assert cache.is_fresh(entry, ttl=0)
+    assert cache.validators(entry) == {'If-None-Match': '"abc"'}
+    assert cache.get('game:2:boxscore') is None
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
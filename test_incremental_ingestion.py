@@ -0,0 +1,104 @@
+import os
+import shutil
+import sqlite3
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from db_migrations import run_migrations
+from http_cache import HTTPResponseCache
+from ncaa_data_collector import NCAADataCollector
+from stub_ncaa_server import StubNCAAServer
+from weekly_data_manager import SeasonDataManager
+
+SOURCE_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'ncaa_soccer.db')
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    db_path = str(tmp_path / 'ncaa_soccer.db')
+    shutil.copy(SOURCE_DB, db_path)
+    monkeypatch.setenv('NCAA_DB_PATH', db_path)
+    run_migrations(db_path, verbose=False)
+
+    mgr = SeasonDataManager()
+    mgr.activate_season('2024')
+    return mgr
+
+
+def make_collector(server, tmp_path):
+    return NCAADataCollector(
+        season='2024', scoreboard_url=server.scoreboard_url, game_data_url=server.game_data_url,
+        cache=HTTPResponseCache(str(tmp_path / 'cache'))
+    )
+
+
+def team_totals(db_path, snapshot_date):
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute("""
+        SELECT team, SUM(goals), SUM(minutes_played), SUM(shots)
+        FROM players WHERE season = '2024' AND data_date = ?
+        GROUP BY team
+    """, (snapshot_date,)).fetchall()
+    conn.close()
+    return {team: (goals, minutes, shots) for team, goals, minutes, shots in rows}
+
+
+def test_incremental_totals_match_full_collection(manager, tmp_path):
+    with StubNCAAServer(games_per_day=6) as server:
+        assert manager.run_incremental_collection('2024', '2024-11-01', '2024-11-01',
+                                                  collector=make_collector(server, tmp_path))
+        assert manager.run_incremental_collection('2024', '2024-11-01', '2024-11-02',
+                                                  collector=make_collector(server, tmp_path))
+
+        full, _ = make_collector(server, tmp_path).collect_season_data('2024-11-01', '2024-11-02')
+
+    expected = {
+        team: (int(group['Goals'].sum()), int(group['Minutes Played'].sum()), int(group['Shots'].sum()))
+        for team, group in full.groupby('Team')
+    }
+    assert team_totals(manager.db_path, '2024-11-02') == expected
+    # The first day's rows were carried forward rather than duplicated
+    assert team_totals(manager.db_path, '2024-11-01') == {}
+
+    conn = sqlite3.connect(manager.db_path)
+    assert conn.execute("SELECT COUNT(*) FROM ingested_games WHERE season = '2024'").fetchone()[0] == 12
+    current = conn.execute("""
+        SELECT snapshot_date, total_games FROM data_snapshots
+        WHERE season = '2024' AND is_current
+    """).fetchall()
+    conn.close()
+    assert current == [('2024-11-02', 12)]
+
+
+def test_rerun_only_processes_new_games(manager, tmp_path):
+    with StubNCAAServer(games_per_day=5) as server:
+        manager.run_incremental_collection('2024', '2024-11-01', '2024-11-02',
+                                           collector=make_collector(server, tmp_path))
+        before = team_totals(manager.db_path, '2024-11-02')
+
+        # Same window again: no game documents are fetched and the totals do not move
+        collector = make_collector(server, tmp_path)
+        requests = server.requests
+        assert manager.run_incremental_collection('2024', '2024-11-01', '2024-11-02', collector=collector)
+        assert server.requests == requests
+        assert collector.stats['cache_hits'] == 2
+
+    assert team_totals(manager.db_path, '2024-11-02') == before
+
+
+def test_skips_games_that_are_not_final(manager, tmp_path):
+    with StubNCAAServer(games_per_day=3, live_games={'110201'}) as server:
+        manager.run_incremental_collection('2024', '2024-11-02', '2024-11-02',
+                                           collector=make_collector(server, tmp_path))
+
+    conn = sqlite3.connect(manager.db_path)
+    ingested = {row[0] for row in conn.execute("SELECT game_id FROM ingested_games")}
+    conn.close()
+    assert ingested == {'110200', '110202'}
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
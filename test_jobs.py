@@ -0,0 +1,168 @@
+import os
+import shutil
+import sqlite3
+import sys
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from db_migrations import run_migrations
+from http_cache import HTTPResponseCache
+from jobs import JobRunner
+from ncaa_data_collector import NCAADataCollector
+from stub_ncaa_server import StubNCAAServer
+from weekly_data_manager import SeasonDataManager
+
+SOURCE_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'ncaa_soccer.db')
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / 'ncaa_soccer.db')
+    shutil.copy(SOURCE_DB, path)
+    run_migrations(path, verbose=False)
+    return path
+
+
+def test_triggers_for_a_running_season_coalesce(db_path):
+    runner = JobRunner(db_path)
+    release = threading.Event()
+    calls = []
+
+    def target(progress, season):
+        calls.append(season)
+        progress.start('scan', total=2)
+        progress.advance('scan', 2)
+        progress.finish('scan')
+        return release.wait(10)
+
+    first, created = runner.submit('weekly', '2025', target, {'season': '2025'})
+    again, created_again = runner.submit('weekly', '2025', target, {'season': '2025'})
+    other, _ = runner.submit('weekly', '2024', target, {'season': '2024'})
+    assert created and not created_again
+    assert again == first and other != first
+
+    release.set()
+    runner.join()
+    assert calls == ['2025', '2024']
+    job = runner.get(first)
+    assert job['status'] == 'succeeded' and job['seconds'] is not None
+    assert job['progress']['scan']['done'] == 2 and job['progress']['scan']['finished']
+
+    # Once the job is over, a new trigger starts a new job
+    assert runner.submit('weekly', '2025', target, {'season': '2025'})[0] not in (first, other)
+    runner.join()
+
+
+def test_failed_and_abandoned_jobs_are_recorded(db_path):
+    runner = JobRunner(db_path)
+
+    def broken(progress):
+        raise RuntimeError('scoreboard unavailable')
+
+    job_id, _ = runner.submit('weekly', '2025', broken)
+    runner.join()
+    job = runner.get(job_id)
+    assert job['status'] == 'failed' and 'scoreboard unavailable' in job['error']
+
+    # A running job from a worker that died no longer blocks new triggers
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        INSERT INTO jobs (kind, season, status, updated_at)
+        VALUES ('weekly', '2023', 'running', datetime('now', '-2 hours'))
+    """)
+    conn.commit()
+    conn.close()
+    new_id, created = runner.submit('weekly', '2023', lambda progress: True)
+    runner.join()
+    assert created and runner.get(new_id)['status'] == 'succeeded'
+    assert runner.get(new_id - 1)['error'].startswith('abandoned')
+
+
+def test_jobs_waiting_in_this_runner_are_not_abandoned(db_path):
+    runner = JobRunner(db_path)
+    release = threading.Event()
+    calls = []
+
+    def target(progress, season):
+        calls.append(season)
+        return release.wait(10) if season == '2025' else True
+
+    running, _ = runner.submit('weekly', '2025', target, {'season': '2025'})
+    waiting, _ = runner.submit('weekly', '2024', target, {'season': '2024'})
+    # Queued behind a long job for longer than the stale timeout
+    conn = sqlite3.connect(db_path)
+    conn.execute("UPDATE jobs SET updated_at = datetime('now', '-2 hours') WHERE id = ?", (waiting,))
+    conn.commit()
+    conn.close()
+
+    assert runner.submit('weekly', '2024', target, {'season': '2024'}) == (waiting, False)
+    release.set()
+    runner.join()
+    assert calls == ['2025', '2024']
+    assert runner.get(waiting)['status'] == 'succeeded'
+
+    # A job another process already gave up on is not started
+    conn = sqlite3.connect(db_path)
+    gone = conn.execute("INSERT INTO jobs (kind, season, status) VALUES ('weekly', '2022', 'failed')").lastrowid
+    conn.commit()
+    conn.close()
+    runner.run(gone, target, {'season': '2022'})
+    assert runner.get(gone)['status'] == 'failed' and '2022' not in calls
+
+
+def test_weekly_collection_reports_stage_progress(db_path, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('NCAA_DB_PATH', db_path)
+    manager = SeasonDataManager()
+    manager.activate_season('2024')
+    runner = JobRunner(db_path)
+
+    with StubNCAAServer(games_per_day=3) as server:
+        collector = NCAADataCollector(
+            season='2024', scoreboard_url=server.scoreboard_url, game_data_url=server.game_data_url,
+            cache=HTTPResponseCache(str(tmp_path / 'cache'))
+        )
+        job_id, _ = runner.submit(
+            'weekly', '2024',
+            lambda progress: manager.run_weekly_collection('2024', collector=collector, progress=progress)
+        )
+        runner.join()
+
+    job = runner.get(job_id)
+    assert job['status'] == 'succeeded'
+    stages = job['progress']
+    assert stages['scan']['done'] == stages['scan']['total'] == 8
+    assert stages['fetch']['done'] == 8 * 3
+    assert stages['import']['done'] == stages['import']['total'] > 0
+    assert all(stage['finished'] and stage['seconds'] >= 0 for stage in stages.values())
+
+
+def test_admin_endpoints_queue_and_report_jobs(ncaa_app, monkeypatch):
+    monkeypatch.setenv('ADMIN_TOKEN', 'secret')
+    release = threading.Event()
+
+    def fake_weekly_job(progress, season, force=False):
+        progress.start('scan', total=7)
+        return release.wait(10)
+
+    monkeypatch.setattr(ncaa_app, 'run_weekly_job', fake_weekly_job)
+    client = ncaa_app.app.test_client()
+
+    assert client.post('/admin/run-weekly?season=2031').status_code == 401
+    first = client.post('/admin/run-weekly?season=2031&token=secret')
+    second = client.post('/admin/run-weekly?season=2031', headers={'X-Admin-Token': 'secret'})
+    assert first.status_code == second.status_code == 202
+    assert second.json['job_id'] == first.json['job_id'] and second.json['coalesced']
+
+    release.set()
+    ncaa_app.job_runner.join()
+    status = client.get(first.json['status_url'] + '?token=secret')
+    assert status.json['job']['status'] == 'succeeded'
+    assert status.json['job']['progress']['scan']['total'] == 7
+    assert client.get('/admin/jobs/999999?token=secret').status_code == 404
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,92 @@
+import html
+import re
+import sqlite3
+import sys
+sys.path.append('.')
+
+import pytest
+
+from app_state import bump_data_version
+from keyset import cursor_signature, decode_cursor, encode_cursor
+
+
+def get_page(client, url):
+    response = client.get(url)
+    assert response.status_code == 200
+    body = response.get_data(as_text=True)
+    rows = re.findall(r'href="/player/([^"?]+)', body)
+    next_link = re.search(r'href="([^"]*cursor=[^"]*)">\s*Next', body)
+    prev_link = re.search(r'href="([^"]*cursor=[^"]*)">\s*<i class="fas fa-chevron-left"></i> Previous', body)
+    return rows, body, (html.unescape(next_link.group(1)) if next_link else None), \
+        (html.unescape(prev_link.group(1)) if prev_link else None)
+
+
+@pytest.mark.parametrize('query', [
+    'sort=goals&order=desc',
+    'sort=max&order=desc',
+    'sort=position&order=asc',
+    'sort=goals_per_90&order=asc&conference=ACC',
+])
+def test_cursor_pages_match_offset_pages(client, query):
+    rows, _, next_url, prev_url = get_page(client, f'/players?{query}&paging=keyset')
+    assert prev_url is None
+    pages = [rows]
+    urls = []
+    for _ in range(4):
+        if next_url is None:
+            break
+        urls.append(next_url)
+        rows, _, next_url, prev_url = get_page(client, next_url)
+        pages.append(rows)
+
+    for number, rows in enumerate(pages, 1):
+        assert rows == get_page(client, f'/players?{query}&page={number}')[0]
+
+    # Walking back from the last page visited returns the previous page
+    if len(pages) > 1:
+        _, _, _, prev_url = get_page(client, urls[-1])
+        assert get_page(client, prev_url)[0] == pages[-2]
+
+
+def test_matches_cursor_pages_match_offset_pages(client):
+    _, body, next_url, _ = get_page(client, '/matches?paging=keyset')
+    for page in range(2, 5):
+        _, cursor_body, next_url, prev_url = get_page(client, next_url)
+        offset_body = get_page(client, f'/matches?page={page}')[1]
+        table = lambda text: text[text.index('<tbody'):text.index('</tbody>')]
+        assert table(cursor_body) == table(offset_body)
+    assert table(get_page(client, prev_url)[1]) == table(get_page(client, f'/matches?page={page - 1}')[1])
+
+
+def test_cursor_is_rejected_for_other_filters():
+    signature = cursor_signature('players', 'players.goals', 'DESC')
+    token = encode_cursor([10, 'Someone', 5], 3, 'next', signature)
+
+    assert decode_cursor(token, signature) == ([10, 'Someone', 5], 3, 'next')
+    assert decode_cursor(token, cursor_signature('players', 'players.goals', 'ASC')) is None
+    assert decode_cursor('not-a-cursor', signature) is None
+
+
+def test_counts_are_cached_until_the_data_version_changes(ncaa_app, client):
+    get_page(client, '/matches')
+    conn = sqlite3.connect(ncaa_app.db_path)
+    total = conn.execute("SELECT COUNT(*) FROM matches").fetchone()[0]
+    conn.execute("INSERT INTO matches (home_team, home_team_score, away_team, away_team_score) "
+                 "VALUES ('A', 1, 'B', 0)")
+    conn.commit()
+
+    # Still the cached count until the writer bumps the version
+    assert f'{total} matches total' in get_page(client, '/matches')[1]
+    bump_data_version(conn)
+    conn.commit()
+    assert f'{total + 1} matches total' in get_page(client, '/matches')[1]
+
+    conn.execute("DELETE FROM matches WHERE home_team = 'A' AND away_team = 'B'")
+    bump_data_version(conn)
+    conn.commit()
+    conn.close()
+    ncaa_app.count_cache.clear()
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,94 @@
+import math
+import sys
+import time
+sys.path.append('.')
+
+import numpy as np
+import pytest
+
+from match_predictions import (TeamRatings, calculate_match_prediction, expected_goals,
+                               outcome_probabilities, prediction_matrix)
+
+
+def loop_prediction(home_att, home_def, away_att, away_def):
+    """The original scalar model: nested loops over a 6x6 grid"""
+    home_lam = max(0.1, min(5.0, home_att * away_def * 1.5 * 1.2))
+    away_lam = max(0.1, min(5.0, away_att * home_def * 1.5))
+    poisson = lambda k, lam: (math.e ** (-lam)) * (lam ** k) / math.factorial(k)
+
+    grid = [[poisson(h, home_lam) * poisson(a, away_lam) for a in range(6)] for h in range(6)]
+    total = sum(map(sum, grid))
+    grid = [[prob / total for prob in row] for row in grid]
+    home_win = sum(grid[h][a] for h in range(6) for a in range(6) if h > a)
+    draw = sum(grid[h][h] for h in range(6))
+    away_win = sum(grid[h][a] for h in range(6) for a in range(6) if h < a)
+    under = sum(grid[h][a] for h in range(6) for a in range(6) if h + a <= 2)
+    return home_lam, away_lam, grid, (home_win, draw, away_win), under
+
+
+@pytest.mark.parametrize('ratings', [(1.0, 1.0, 1.0, 1.0), (1.8, 0.6, 0.7, 1.4), (3.0, 0.2, 0.05, 4.0)])
+def test_vectorized_model_matches_the_loops(ratings):
+    home_lam, away_lam, grid, outcomes, under = loop_prediction(*ratings)
+    home = {'Team': 'Home', 'ATT': ratings[0], 'DEF': ratings[1], 'MAX': 50.0}
+    away = {'Team': 'Away', 'ATT': ratings[2], 'DEF': ratings[3], 'MAX': 40.0}
+    prediction = calculate_match_prediction(home, away)
+
+    assert np.allclose(outcome_probabilities(*expected_goals(*ratings)), outcomes)
+    assert prediction['expected_goals'] == {'home': round(home_lam, 2), 'away': round(away_lam, 2)}
+    assert prediction['probabilities'] == {
+        'home_win': round(outcomes[0] * 100, 1), 'draw': round(outcomes[1] * 100, 1), 'away_win': round(outcomes[2] * 100, 1)}
+    assert prediction['scoreline_matrix'] == [[round(prob * 100, 2) for prob in row] for row in grid]
+    # First scoreline in row order wins ties, as in the loops
+    cells = [(h, a) for h in range(6) for a in range(6)]
+    best = max(cells, key=lambda cell: (grid[cell[0]][cell[1]], -cells.index(cell)))
+    assert (prediction['most_likely_score']['home'], prediction['most_likely_score']['away']) == best
+    assert prediction['over_under']['under_2_5'] == round(under * 100, 1)
+
+
+def test_matrix_cells_match_single_predictions(ncaa_app):
+    with ncaa_app.app.app_context():
+        ratings = TeamRatings(ncaa_app.load_prediction_ratings())
+    teams = ratings.teams[:5]
+    home_win, draw, away_win = prediction_matrix(ratings, teams, teams)
+
+    for i, home in enumerate(teams):
+        for j, away in enumerate(teams):
+            expected = outcome_probabilities(*expected_goals(
+                ratings.att[i], ratings.def_[i], ratings.att[j], ratings.def_[j]))
+            assert np.allclose((home_win[i, j], draw[i, j], away_win[i, j]), expected)
+
+
+def test_predict_matrix_endpoint_covers_the_league_quickly(client):
+    started = time.perf_counter()
+    response = client.get('/api/predict-matrix')
+    elapsed = time.perf_counter() - started
+    assert response.status_code == 200
+    data = response.get_json()
+
+    teams = data['teams']
+    assert len(teams) > 200 and len(data['home_win']) == len(teams)
+    assert data['draw'][0][0] is None
+    total = data['home_win'][0][1] + data['draw'][0][1] + data['away_win'][0][1]
+    assert total == pytest.approx(100, abs=0.2)
+    assert elapsed < 1.0
+
+    subset = client.get(f'/api/predict-matrix?teams={teams[3]},{teams[7]}').get_json()
+    assert subset['home_win'][0][1] == data['home_win'][3][7]
+    assert client.get('/api/predict-matrix?teams=Nowhere').status_code == 404
+
+
+def test_single_match_endpoint_is_memoized(ncaa_app, client):
+    with ncaa_app.app.app_context():
+        teams = TeamRatings(ncaa_app.load_prediction_ratings()).teams
+    url = f'/api/predict-match?home_team={teams[0]}&away_team={teams[1]}'
+    first = client.get(url).get_json()
+    assert first['home_team'] == teams[0]
+
+    hits = ncaa_app.prediction_engine._predictions._entries
+    assert (teams[0], teams[1]) in hits
+    assert client.get(url).get_json() == first
+    assert client.get(f'/api/predict-match?home_team={teams[0]}&away_team=Nowhere').status_code == 404
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
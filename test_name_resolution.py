@@ -0,0 +1,82 @@
+import os
+import random
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+import pytest
+from rapidfuzz import process, fuzz
+
+from db_migrations import run_migrations
+from name_resolution import NameResolver, build_name_mapping, preprocess_name
+
+PLAYERS_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'd1_player_stats.csv')
+
+
+def name_variants(names, seed=1):
+    """Spellings the scraper sees: 'Last,First' from play-by-play, dropped letters, suffixes"""
+    rng = random.Random(seed)
+    variants = []
+    for name in names:
+        parts = name.split()
+        if len(parts) >= 2:
+            variants.append(f"{parts[-1]},{' '.join(parts[:-1])}")
+        if rng.random() < 0.2 and len(name) > 5:
+            i = rng.randrange(1, len(name) - 1)
+            variants.append(name[:i] + name[i + 1:])
+        if rng.random() < 0.1:
+            variants.append(f"{name} Jr")
+    return variants
+
+
+def all_pairs_mapping(names, similarity_threshold=90):
+    """The original create_name_mapping loop, over names in first-seen order"""
+    standardized_names = {}
+    for name in dict.fromkeys(preprocess_name(name) for name in names):
+        match = process.extractOne(name, standardized_names.keys(), scorer=fuzz.WRatio)
+        if match and match[1] > similarity_threshold:
+            standardized_names[name] = standardized_names[match[0]]
+        else:
+            standardized_names[name] = name
+    return standardized_names
+
+
+def test_matches_all_pairs_mapping_on_2024_names():
+    names = pd.read_csv(PLAYERS_CSV)['Name'].tolist()[:1200]
+    names = names + name_variants(names)
+
+    mapping = build_name_mapping(names)
+
+    assert mapping == all_pairs_mapping(names)
+    assert sum(1 for name, standard in mapping.items() if name != standard) > 100
+
+
+def test_typo_in_the_first_letter_still_shares_a_block():
+    resolver = NameResolver(use_db=False)
+    mapping = resolver.resolve(['Christopher Williamson', 'Xhristopher Williamsom'])
+    assert mapping['xhristopher williamsom'] == 'christopher williamson'
+
+
+def test_resolutions_are_memoized_across_runs(tmp_path):
+    db_path = str(tmp_path / 'ncaa_soccer.db')
+    run_migrations(db_path, verbose=False)
+
+    first = NameResolver(db_path=db_path).resolve(['Jonathan Smith', 'Liam Garcia'])
+    assert first == {'jonathan smith': 'jonathan smith', 'liam garcia': 'liam garcia'}
+
+    # A later run maps new spellings onto names stored by the first one
+    resolver = NameResolver(db_path=db_path)
+    second = resolver.resolve(['Jonathon Smith', 'Smith, Jonathan', 'Liam Garcia'])
+    assert second['jonathon smith'] == 'jonathan smith'
+    assert second['liam garcia'] == 'liam garcia'
+    assert len(resolver.names) == 4
+
+
+def test_works_without_a_database(tmp_path):
+    resolver = NameResolver(db_path=str(tmp_path / 'missing.db'))
+    assert resolver.resolve(['José Núñez', 'Jose Nunez']) == {'jose nunez': 'jose nunez'}
+    assert not os.path.exists(tmp_path / 'missing.db')
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
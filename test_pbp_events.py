@@ -0,0 +1,132 @@
+import os
+import re
+import shutil
+import sqlite3
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+import pytest
+
+from db_migrations import run_migrations
+from http_cache import HTTPResponseCache
+from ncaa_data_collector import NCAADataCollector
+from pbp_events import flatten_pbp, parse_events
+from stub_ncaa_server import StubNCAAServer, make_game_fixtures
+from weekly_data_manager import SeasonDataManager
+
+SOURCE_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'ncaa_soccer.db')
+
+
+@pytest.fixture
+def collector(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return NCAADataCollector(season='2024', use_cache=False)
+
+
+def apply_reference(collector, game_ids, documents):
+    """The original per-game DataFrame with three row-wise .apply passes"""
+    def extract_player(event):
+        matches = re.findall(r'\b[A-Z][a-z]+,?\s*[A-Z][a-z]+', event)
+        return matches[0] if matches else None
+
+    foul_data = []
+    for game_id in game_ids:
+        data = documents[game_id]['pbp']
+        home = data['meta']['teams'][0]['shortName']
+        away = data['meta']['teams'][1]['shortName']
+        events = []
+        for period in data['periods']:
+            for play in period['playStats']:
+                if play['visitorText']:
+                    events.append({'Event': play['visitorText'], 'Team': 1})
+                else:
+                    events.append({'Event': play['homeText'], 'Team': 0})
+        df = pd.DataFrame(events)
+        df['Name'] = df['Event'].apply(extract_player).apply(collector.clean_name)
+        df['Team'] = df['Team'].apply(lambda x: home if x == 0 else away)
+        foul_df = df[df['Event'].str.contains('Foul', case=False)]
+        foul_data.append(foul_df.groupby(['Name', 'Team']).size().reset_index(name='Fouls'))
+    return pd.concat(foul_data, ignore_index=True)
+
+
+def stub_documents(count=40):
+    game_ids = [str(110100 + i) for i in range(count)]
+    documents = {game_id: {'pbp': make_game_fixtures(game_id)[1]} for game_id in game_ids}
+    plays = documents[game_ids[0]]['pbp']['periods'][0]['playStats']
+    for play, text in zip(plays, ['Foul on Smith, John', 'Foul called, no player named',
+                                  'Goal by Doe,Jane (Shot by Roe,Ann)']):
+        play.update(homeText=text, visitorText='')
+    return game_ids, documents
+
+
+def test_fouls_won_match_the_apply_implementation(collector):
+    game_ids, documents = stub_documents()
+    expected = apply_reference(collector, game_ids, documents)
+
+    result = collector.collect_fouls_won(game_ids, documents)
+    assert result.equals(expected)
+    assert 'John Smith' in set(result['Name'])
+
+
+def test_events_are_typed_like_categorize_event(collector):
+    game_ids, documents = stub_documents(10)
+    events = parse_events(flatten_pbp(game_ids, documents))
+    labels = {'goal': 'Goal', 'shot': 'Shot', 'foul': 'Foul', 'corner': 'Corner Kick', 'offside': 'Offside', 'other': 'Other'}
+
+    assert [labels[kind] for kind in events['event_type']] == \
+        [collector.categorize_event(text) for text in events['description']]
+    assert events.loc[2, 'event_type'] == 'goal' and events.loc[2, 'player'] == 'Doe,Jane'
+
+    # The running score ends at each game's goal count
+    for game_id, game in events.groupby('game_id'):
+        goals = game[game['event_type'] == 'goal']
+        if game_id != game_ids[0]:
+            assert (goals['side'] == 'home').sum() == game['home_score'].iloc[-1]
+            assert (goals['side'] == 'away').sum() == game['away_score'].iloc[-1]
+
+
+def test_incremental_collection_stores_events_once(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    db_path = str(tmp_path / 'ncaa_soccer.db')
+    shutil.copy(SOURCE_DB, db_path)
+    monkeypatch.setenv('NCAA_DB_PATH', db_path)
+    run_migrations(db_path, verbose=False)
+    manager = SeasonDataManager()
+    manager.activate_season('2024')
+
+    with StubNCAAServer(games_per_day=4) as server:
+        for _ in range(2):
+            collector = NCAADataCollector(
+                season='2024', scoreboard_url=server.scoreboard_url, game_data_url=server.game_data_url,
+                cache=HTTPResponseCache(str(tmp_path / 'cache'))
+            )
+            assert manager.run_incremental_collection('2024', '2024-11-01', '2024-11-01', collector=collector)
+
+    conn = sqlite3.connect(db_path)
+    games = conn.execute("SELECT COUNT(DISTINCT game_id), COUNT(*) FROM match_events").fetchone()
+    assert games == (4, 4 * 30)
+
+    # Stored rows are exactly the parsed play-by-play of the ingested games
+    game_ids = [row[0] for row in conn.execute("SELECT game_id FROM ingested_games ORDER BY game_id")]
+    documents = {game_id: {'pbp': make_game_fixtures(game_id)[1]} for game_id in game_ids}
+    expected = parse_events(flatten_pbp(game_ids, documents))
+    stored = conn.execute("""
+        SELECT game_id, sequence, event_type, player, home_score, away_score FROM match_events
+        ORDER BY game_id, sequence
+    """).fetchall()
+    assert stored == [
+        (game_id, sequence, event_type, player or None, int(home_score), int(away_score))
+        for game_id, sequence, event_type, player, home_score, away_score in expected[
+            ['game_id', 'sequence', 'event_type', 'player', 'home_score', 'away_score']
+        ].itertuples(index=False, name=None)
+    ]
+
+    plan = ' '.join(row[-1] for row in conn.execute(
+        "EXPLAIN QUERY PLAN SELECT COUNT(*) FROM match_events WHERE season = '2024' AND team = 'Akron' AND event_type = 'goal'"))
+    assert 'idx_match_events_team' in plan
+    conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
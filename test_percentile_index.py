@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import sys
+sys.path.append('.')
+
+from player_ratings import (
+    load_data, calculate_per90_stats, normalize_stats, calculate_max_ratings,
+    PercentileIndex, PERCENTILE_METRICS, PERCENTILE_POSITIONS
+)
+from ratings_store import RatingsSnapshot
+
+
+def rank_percentiles(df):
+    """The original dense ranking pass, kept here as the reference"""
+    expected = {}
+    for position in PERCENTILE_POSITIONS:
+        position_df = df[df['Position'] == position]
+        for metric in PERCENTILE_METRICS:
+            expected[(position, metric)] = (position_df[metric].rank(pct=True) * 100).round(1)
+    return expected
+
+
+def rated_players():
+    merged_df, _ = load_data()
+    merged_df = calculate_per90_stats(merged_df)
+    merged_df = normalize_stats(merged_df)
+    return calculate_max_ratings(merged_df)
+
+
+def test_index_matches_rank_pct_on_league_data():
+    df = rated_players()
+    index = PercentileIndex(df)
+
+    for (position, metric), expected in rank_percentiles(df).items():
+        actual = index.percentiles(position, metric, df.loc[expected.index, metric])
+        assert np.array_equal(actual, expected.to_numpy(), equal_nan=True), (position, metric)
+
+
+def test_ties_and_missing_values():
+    df = pd.DataFrame({
+        'Position': ['Forward'] * 6 + ['Defender'],
+        'Goals_per90': [0.0, 0.0, 0.0, 0.5, np.nan, 1.2, 0.3],
+    })
+    index = PercentileIndex(df, metrics=['Goals_per90'])
+    expected = (df.loc[:5, 'Goals_per90'].rank(pct=True) * 100).round(1).to_numpy()
+
+    assert np.array_equal(index.percentiles('Forward', 'Goals_per90', df.loc[:5, 'Goals_per90']),
+                          expected, equal_nan=True)
+    # Values that are not in the table land between their neighbours
+    assert index.percentile('Forward', 'Goals_per90', 0.9) == 90.0
+    # Positions with no players rank everyone at 0 like the dense columns did
+    assert index.percentile('Midfielder', 'Goals_per90', 0.9) == 0.0
+
+
+def test_snapshot_attaches_the_players_own_percentiles():
+    df = rated_players()
+    snapshot = RatingsSnapshot('test', df)
+    expected = rank_percentiles(df)
+
+    for row in df.sample(50, random_state=7).itertuples():
+        player = snapshot.with_percentiles(snapshot.by_name_team[(row.Name, row.Team)])
+        for metric in PERCENTILE_METRICS:
+            value = player[f'{metric}_percentile_{row.Position}']
+            assert value == expected[(row.Position, metric)][row.Index]
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,190 @@
+import os
+import re
+import json
+import shutil
+import sqlite3
+import subprocess
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from db_access import write_transaction
+from db_migrations import run_migrations
+from player_history import snapshot_rows, store_history_snapshot
+from update_conferences_from_csv import update_conferences_from_csv
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DB = os.path.join(ROOT, 'data', 'ncaa_soccer.db')
+DATES = ['2031-09-01', '2031-09-08', '2031-09-15', '2031-09-22']
+
+# Two weekly imports of a new season (half the players change in week 2), then the conference
+# update the weekly collection runs after each import, then the historical pages filtered by
+# conference; in its own process so the new season stays out of the shared app database
+WEEKLY = """
+import json, re, sqlite3
+import pandas as pd
+import ncaa_app
+from update_conferences_from_csv import update_conferences_from_csv
+from weekly_data_manager import SeasonDataManager
+
+conn = sqlite3.connect(ncaa_app.db_path)
+roster = conn.execute(
+    "SELECT name, team, position FROM players WHERE conference IS NOT NULL AND conference != 'Other' "
+    "ORDER BY name LIMIT 20").fetchall()
+conn.close()
+
+def week(goals):
+    return pd.DataFrame({
+        'Name': [name for name, _, _ in roster], 'Team': [team for _, team, _ in roster],
+        'Position': [position for _, _, position in roster], 'Minutes Played': [300] * len(roster),
+        'Goals': goals, 'Assists': [0] * len(roster), 'Shots': [5] * len(roster),
+        'Shots On Target': [2] * len(roster), 'Fouls Won': [1.0] * len(roster),
+    })
+
+manager = SeasonDataManager()
+manager.import_weekly_data(week([i % 3 for i in range(len(roster))]), '2031', '2031-09-01')
+update_conferences_from_csv(ncaa_app.db_path)
+manager.import_weekly_data(week([i % 3 + i % 2 for i in range(len(roster))]), '2031', '2031-09-08')
+update_conferences_from_csv(ncaa_app.db_path)
+
+conn = sqlite3.connect(ncaa_app.db_path)
+conference = conn.execute("SELECT conference FROM players WHERE season = '2031' AND name = ?",
+                          (roster[0][0],)).fetchone()[0]
+expected = conn.execute("SELECT COUNT(*) FROM players WHERE season = '2031' AND data_date = '2031-09-08' "
+                        "AND conference = ?", (conference,)).fetchone()[0]
+versions = conn.execute("SELECT COUNT(*) FROM player_history WHERE season = '2031'").fetchone()[0]
+conn.close()
+
+client = ncaa_app.app.test_client()
+listed = {}
+for date in ('2031-09-01', '2031-09-08'):
+    page = client.get(f'/players/2031/{date}?conference={conference}').get_data(as_text=True)
+    listed[date] = len(re.findall(r'href="/player/[^"]+"', page))
+dropdown = f'value="{conference}"' in client.get('/players/2031').get_data(as_text=True)
+print(json.dumps({'players': len(roster), 'expected': expected, 'listed': listed,
+                  'dropdown': dropdown, 'versions': versions}))
+"""
+
+
+def week_rows(week):
+    """Season-to-date lines after a week: odd players play every week, even ones only in week 1,
+    and Player 9 debuts in the last week"""
+    rows = []
+    for i in range(10):
+        if i == 9 and week < 3:
+            continue
+        games = week + 1 if i % 2 else 1
+        rows.append((f'Player {i}', 'Akron', 'F', 90 * games, games // 2, 0, 3 * games, games, 2, 'MAC'))
+    return sorted(rows)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / 'ncaa_soccer.db')
+    shutil.copy(SOURCE_DB, path)
+    run_migrations(path, verbose=False)
+    return path
+
+
+def store(db_path, date, rows):
+    with write_transaction(db_path) as conn:
+        conn.execute("""
+            INSERT OR IGNORE INTO data_snapshots (season, snapshot_date, total_players) VALUES ('2031', ?, ?)
+        """, (date, len(rows)))
+        return store_history_snapshot(conn, '2031', date, rows)
+
+
+def test_snapshots_rebuild_exactly_from_changed_lines(db_path):
+    written = [store(db_path, date, week_rows(week)) for week, date in enumerate(DATES)]
+    # Only the players whose line changed (and the debut) are stored after week 1
+    assert written == [9, 4, 4, 5]
+
+    conn = sqlite3.connect(db_path)
+    for week, date in enumerate(DATES):
+        assert snapshot_rows(conn, '2031', date) == week_rows(week)
+        view = conn.execute("""
+            SELECT player_name, team, position, minutes_played, goals, assists, shots,
+                   shots_on_target, fouls_won, conference
+            FROM player_stats_history WHERE season = '2031' AND snapshot_date = ?
+            ORDER BY player_name
+        """, (date,)).fetchall()
+        assert view == week_rows(week)
+    assert conn.execute("SELECT COUNT(*) FROM player_history WHERE season = '2031'").fetchone()[0] == 22
+    conn.close()
+
+
+def test_backfilled_and_reimported_snapshots_replay_later_weeks(db_path):
+    for week in (0, 1, 3):
+        store(db_path, DATES[week], week_rows(week))
+    # A missed week arrives late, then week 2 is re-imported with a correction
+    store(db_path, DATES[2], week_rows(2))
+    corrected = [row if row[0] != 'Player 1' else row[:4] + (9,) + row[5:] for row in week_rows(1)]
+    store(db_path, DATES[1], corrected)
+
+    conn = sqlite3.connect(db_path)
+    assert snapshot_rows(conn, '2031', DATES[0]) == week_rows(0)
+    assert snapshot_rows(conn, '2031', DATES[1]) == corrected
+    for week in (2, 3):
+        assert snapshot_rows(conn, '2031', DATES[week]) == week_rows(week)
+    conn.close()
+
+
+def test_conference_updates_only_re_encode_changed_seasons(db_path):
+    update_conferences_from_csv(db_path)
+    conn = sqlite3.connect(db_path)
+    settled = conn.execute("SELECT rowid FROM player_history WHERE season = '2024'").fetchall()
+    conn.close()
+
+    # A new season imported without conferences; 2024 already matches the CSV
+    rows = [row[:-1] + (None,) for row in week_rows(0)]
+    with write_transaction(db_path) as conn:
+        conn.executemany("""
+            INSERT INTO players (name, team, position, minutes_played, goals, assists, shots,
+                                 shots_on_target, fouls_won, conference, season, data_date)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, '2031', ?)
+        """, [row + (DATES[0],) for row in rows])
+    store(db_path, DATES[0], rows)
+    update_conferences_from_csv(db_path)
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT rowid FROM player_history WHERE season = '2024'").fetchall() == settled
+    conferences = {row[-1] for row in snapshot_rows(conn, '2031', DATES[0])}
+    assert conferences and None not in conferences
+    conn.close()
+
+
+def test_historical_players_pages_match_the_live_page(client):
+    for query in ['', '?sort=assists&order=asc', '?conference=ACC&page=2', '?search=smith', '?position=D&sort=max']:
+        live = client.get('/players' + query).get_data(as_text=True)
+        historical = client.get('/players/2024/2024-12-31' + query)
+        assert historical.status_code == 200
+        page = historical.get_data(as_text=True)
+        assert 'as of 2024-12-31' in page
+        assert re.findall(r'href="/player/[^"]+"', page) == re.findall(r'href="/player/[^"]+"', live)
+
+    # Keyset cursors page through the snapshot, not the live table
+    first = client.get('/players/2024?sort=goals_per_90&paging=keyset').get_data(as_text=True)
+    next_url = re.search(r'href="(/players/2024/2024-12-31\?cursor=[^"]+)"', first).group(1)
+    second = client.get(next_url.replace('&amp;', '&'))
+    assert second.status_code == 200 and '/player/' in second.get_data(as_text=True)
+
+    missing = client.get('/players/2024/2024-01-01').get_data(as_text=True)
+    assert 'No 2024 snapshot was taken on 2024-01-01' in missing
+
+
+def test_weekly_imports_keep_conferences_in_history(db_path):
+    env = dict(os.environ, NCAA_DB_PATH=db_path, RATINGS_WARMUP='0', RESPONSE_CACHE='off')
+    result = subprocess.run([sys.executable, '-c', WEEKLY], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+
+    assert report['expected'] > 0
+    assert report['listed'] == {'2031-09-01': report['expected'], '2031-09-08': report['expected']}
+    assert report['dropdown']
+    # Week 2 only adds versions for the players whose goals changed
+    assert report['versions'] == report['players'] + report['players'] // 2
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,74 @@
+import os
+import shutil
+import sqlite3
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+import pytest
+
+from db_migrations import run_migrations
+from player_search import build_match_query, search_players
+from weekly_data_manager import SeasonDataManager
+
+SOURCE_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'ncaa_soccer.db')
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = str(tmp_path / 'ncaa_soccer.db')
+    shutil.copy(SOURCE_DB, path)
+    monkeypatch.setenv('NCAA_DB_PATH', path)
+    run_migrations(path, verbose=False)
+    return path
+
+
+def test_query_building_is_injection_safe():
+    assert build_match_query('Emil  Jaas') == '"Emil"* "Jaas"*'
+    assert build_match_query('name: "x" OR') == '"name"* "x"* "OR"*'
+    assert build_match_query(' -*" ') is None
+
+
+def test_prefix_search_ranks_names_first(db_path):
+    conn = sqlite3.connect(db_path)
+    results = search_players(conn, 'emil jaas')
+    assert results[0]['name'] == 'Emil Jaaskelainen' and results[0]['team'] == 'Akron'
+
+    # A name hit outranks players who only match through their team
+    results = search_players(conn, 'akron', limit=50)
+    assert {player['team'] for player in results} == {'Akron'}
+    assert len(search_players(conn, 'smi', limit=50)) > len(search_players(conn, 'smith', limit=50)) > 0
+    conn.close()
+
+
+def test_ingest_keeps_the_index_in_sync_and_ignores_accents(db_path):
+    players = pd.DataFrame([{
+        'Name': 'José Ñúñez', 'Team': 'Akron', 'Position': 'Forward', 'Minutes Played': 900,
+        'Goals': 3, 'Assists': 2, 'Shots': 20, 'Shots On Target': 9, 'Fouls Won': 5,
+    }])
+    assert SeasonDataManager().import_weekly_data(players, '2025', '2025-09-01', 'one player')
+
+    conn = sqlite3.connect(db_path)
+    assert search_players(conn, 'jose nunez')[0]['name'] == 'José Ñúñez'
+    assert search_players(conn, 'ÑÚÑ')[0]['name'] == 'José Ñúñez'
+    conn.close()
+
+
+def test_typeahead_queries_take_milliseconds(db_path):
+    conn = sqlite3.connect(db_path)
+    terms = ['a', 'jo', 'smi', 'akr', 'mar', 'will', 'gar', 'acc']
+    search_players(conn, 'warm up')
+
+    started = time.perf_counter()
+    for _ in range(25):
+        for term in terms:
+            search_players(conn, term)
+    per_query = (time.perf_counter() - started) / (25 * len(terms))
+    conn.close()
+
+    assert per_query < 0.01
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,104 @@
+import sys
+sys.path.append('.')
+
+import pytest
+from sqlalchemy import event
+
+from db_migrations import MIGRATIONS, run_migrations
+
+# Routes that together issue every SQL statement in ncaa_app.py
+ROUTES = [
+    '/',
+    '/players',
+    '/players?page=3',
+    '/players?team=Akron',
+    '/players?position=F',
+    '/players?conference=ACC',
+    '/players?search=smith',
+    '/players?sort=assists&order=asc',
+    '/players?sort=max',
+    '/players/2024',
+    '/players/2024/2024-12-31?search=smith&conference=ACC',
+    '/teams',
+    '/matches',
+    '/matches?page=5',
+    '/player/A.J. Schuetz',
+    '/team/Akron',
+    '/match-odds',
+    '/api/seasons',
+    '/api/dates/2024',
+    '/api/season-status',
+    '/api/search?q=smi',
+    '/api/predict-matrix',
+]
+
+TABLES = {'players', 'matches', 'seasons', 'data_snapshots', 'player_stats_history', 'player_ratings', 'team_standings',
+          'player_history'}
+
+
+def capture_queries(ncaa_app):
+    """Hit every route and collect the SQL statements the app executes"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append((statement, parameters))
+
+    # Cached pages and counts would hide their queries
+    ncaa_app.response_cache.clear()
+    ncaa_app.count_cache.clear()
+
+    with ncaa_app.app.app_context():
+        engine = ncaa_app.db.engine
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        client = ncaa_app.app.test_client()
+        for route in ROUTES:
+            client.get(route)
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+    return statements
+
+
+def full_scans(conn, statement, parameters):
+    """Plan lines that read a base table without any index"""
+    plan = conn.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters).fetchall()
+    scans = []
+    for row in plan:
+        detail = row[-1]
+        if not detail.startswith('SCAN ') or 'USING' in detail:
+            continue
+        table = detail.split()[1]
+        if table not in TABLES:
+            continue
+        # Walking the rowid b-tree backwards for a LIMITed page is already an index read
+        normalized = ' '.join(statement.upper().split())
+        if 'ORDER BY ROWID DESC LIMIT' in normalized and ' WHERE ' not in normalized:
+            continue
+        scans.append(detail)
+    return scans
+
+
+def test_migrations_are_idempotent(ncaa_app):
+    latest = MIGRATIONS[-1][0]
+    assert run_migrations(ncaa_app.db_path, verbose=False) == latest
+    assert run_migrations(ncaa_app.db_path, verbose=False) == latest
+
+
+def test_every_app_query_uses_an_index(ncaa_app):
+    statements = capture_queries(ncaa_app)
+    assert len(statements) > 20
+
+    # Plans come from the app's own engine, so they describe the database it just queried
+    with ncaa_app.app.app_context(), ncaa_app.db.engine.connect() as conn:
+        failures = []
+        for statement, parameters in statements:
+            scans = full_scans(conn, statement, parameters)
+            if scans:
+                failures.append((' '.join(statement.split())[:120], scans))
+
+    assert not failures, failures
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,65 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pytest
+
+from radar_service import RadarRenderService, radar_chart_data, radar_filename
+
+PLAYER = {
+    'Position': 'Forward',
+    'MAX': np.float64(88.0),
+    'Minutes Played': np.int64(1450),
+    'Goals_per90_percentile_Forward': 91.5,
+    'Assists_per90_percentile_Forward': 72.0,
+    'Shots_per90_percentile_Forward': 80.2,
+    'Shots On Target_per90_percentile_Forward': 65.0,
+    'Fouls Won_per90_percentile_Forward': 40.1,
+    'Goals_per90_percentile_Defender': 99.0,
+}
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = RadarRenderService(output_dir=str(tmp_path / 'radars'), max_workers=2)
+    yield service
+    service.shutdown()
+
+
+def test_filename_tracks_the_drawn_values():
+    base = radar_filename('Liam Smith', radar_chart_data(PLAYER))
+    plain = dict(PLAYER, MAX=88.0, **{'Minutes Played': 1450})
+
+    assert base.startswith('Liam_Smith_') and base.endswith('.png')
+    # Same values from numpy or Python types, and unrelated columns, give the same image
+    assert radar_filename('Liam Smith', radar_chart_data(plain)) == base
+    assert radar_filename('Liam Smith', radar_chart_data(dict(PLAYER, Team='Akron'))) == base
+    # Anything drawn on the chart changes the key
+    assert radar_filename('Liam Smith', radar_chart_data(dict(PLAYER, MAX=89.0))) != base
+    assert radar_filename('Liam Smith', radar_chart_data(
+        dict(PLAYER, **{'Fouls Won_per90_percentile_Forward': 41.0}))) != base
+
+
+def test_renders_in_background_then_serves_from_disk(service):
+    assert service.get_chart('Liam Smith', PLAYER) is None
+
+    filename, future = service.submit('Liam Smith', PLAYER)
+    # A second request joins the in-flight render instead of starting another
+    assert service.submit('Liam Smith', PLAYER)[1] is future
+    assert future.result(timeout=120) == filename
+
+    assert service.get_chart('Liam Smith', PLAYER) == filename
+    assert os.path.getsize(os.path.join(service.output_dir, filename)) > 0
+    assert not [name for name in os.listdir(service.output_dir) if name.startswith('.')]
+
+
+def test_prerender_skips_cached_charts(service):
+    players = [('Liam Smith', PLAYER), ('Noah Garcia', dict(PLAYER, MAX=70.0))]
+
+    assert service.prerender(players) == {'cached': 0, 'rendered': 2, 'failed': 0}
+    assert service.prerender(players) == {'cached': 2, 'rendered': 0, 'failed': 0}
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,70 @@
+import os
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from radar_svg import POSITION_STYLES, render_radar_svg
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SVG = '{http://www.w3.org/2000/svg}'
+
+PLAYER = {
+    'Position': 'Defender',
+    'MAX': 77.6,
+    'Minutes Played': 1620,
+    'Goals_per90_percentile_Defender': 91.5,
+    'Assists_per90_percentile_Defender': 72.0,
+    'Shots_per90_percentile_Defender': 50.0,
+    'Shots On Target_per90_percentile_Defender': 'N/A',
+    'Fouls Won_per90_percentile_Defender': 12.3,
+}
+
+
+def test_svg_matches_the_png_chart_content():
+    svg = render_radar_svg('Luca "Lu" O\'Neil & Co', PLAYER)
+    root = ET.fromstring(svg)
+    texts = [node.text for node in root.iter(f'{SVG}text')]
+
+    for label in ('Goals', 'Assists', 'Shots', 'Shots on Target', 'Fouls Won'):
+        assert label in texts
+    # Same percentile labels as the PNG: int() of each value, missing values as 0
+    for value in ('91', '72', '50', '0', '12'):
+        assert value in texts
+    assert 'Luca "Lu" O\'Neil & Co' in texts
+    assert 'Percentile rank vs. Defender | 1620 minutes | MAX Rating: 78' in texts
+    assert '● Defending' in texts
+
+    polygon = root.find(f'{SVG}polygon')
+    assert polygon.get('fill') == POSITION_STYLES['Defender'][0]
+    assert len(polygon.get('points').split()) == 5
+    assert len(svg) < 10000
+
+
+def test_unknown_position_uses_gray():
+    svg = render_radar_svg('Someone', {'Position': 'Unknown', 'MAX': 'N/A'})
+    assert 'fill="#7f8c8d"' in svg
+    assert 'MAX Rating: N/A' in svg
+
+
+def test_renders_fast_and_memoizes():
+    started = time.perf_counter()
+    for i in range(200):
+        render_radar_svg(f'Player {i}', dict(PLAYER, MAX=float(i)))
+    per_chart = (time.perf_counter() - started) / 200
+
+    assert per_chart < 0.005
+    assert render_radar_svg('Player 1', dict(PLAYER, MAX=1.0)) is render_radar_svg('Player 1', dict(PLAYER, MAX=1.0))
+
+
+def test_does_not_import_matplotlib():
+    code = ("import sys, radar_svg; radar_svg.render_radar_svg('A', {'Position': 'Forward'}); "
+            "print('matplotlib' in sys.modules)")
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == 'False'
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,82 @@
+import math
+import os
+import shutil
+import sqlite3
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from player_ratings import (
+    load_data, calculate_per90_stats, normalize_stats, calculate_max_ratings,
+    calculate_percentiles_by_position
+)
+from ratings_store import RATINGS_SOURCE_FILES, PlayerRatingsStore
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DB = os.path.join(ROOT, 'data', 'ncaa_soccer.db')
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """A scratch copy of the ratings inputs, read through the same relative paths"""
+    os.makedirs(tmp_path / 'data')
+    for path in RATINGS_SOURCE_FILES:
+        shutil.copy(os.path.join(ROOT, path), tmp_path / path)
+    shutil.copy(SOURCE_DB, tmp_path / 'data' / 'ncaa_soccer.db')
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_store_rebuilds_when_csv_or_snapshots_change(data_dir):
+    store = PlayerRatingsStore(db_path='data/ncaa_soccer.db')
+    first = store.refresh()
+    assert store.refresh() is first
+
+    # A newer CSV is only noticed once the check interval passes or the store is invalidated
+    stat = os.stat('data/d1_player_stats.csv')
+    os.utime('data/d1_player_stats.csv', ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert store.refresh() is first
+    store.invalidate()
+    second = store.refresh()
+    assert second is not first and second.version != first.version
+
+    conn = sqlite3.connect('data/ncaa_soccer.db')
+    conn.execute("""
+        INSERT INTO data_snapshots (season, snapshot_date, total_players, is_current)
+        VALUES ('2031', '2031-09-01', 10, TRUE)
+    """)
+    conn.commit()
+    conn.close()
+    store.invalidate()
+    third = store.refresh()
+    assert third is not second
+
+    # Nothing changed, so an invalidated check keeps the snapshot
+    store.invalidate()
+    assert store.refresh() is third
+
+
+def test_store_lookup_matches_the_full_pipeline(data_dir):
+    merged_df, _ = load_data()
+    merged_df = calculate_per90_stats(merged_df)
+    merged_df = normalize_stats(merged_df)
+    merged_df = calculate_max_ratings(merged_df)
+    merged_df = calculate_percentiles_by_position(merged_df)
+
+    store = PlayerRatingsStore(db_path='data/ncaa_soccer.db')
+    for name in ['A.J. Schuetz'] + list(merged_df['Name'].sample(20, random_state=3)):
+        # The old lookup took the first row for the name
+        expected = merged_df[merged_df['Name'] == name].iloc[0].to_dict()
+        actual = store.get_player(name)
+        for key, value in actual.items():
+            if isinstance(value, float) and math.isnan(value):
+                assert math.isnan(expected[key]), (name, key)
+            else:
+                assert value == expected[key], (name, key)
+
+    assert store.get_player('Nobody At All') is None
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,72 @@
+import os
+import shutil
+import sqlite3
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+import pytest
+
+from db_migrations import run_migrations
+from ratings_table import ensure_player_ratings
+from weekly_data_manager import SeasonDataManager
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DB = os.path.join(ROOT, 'data', 'ncaa_soccer.db')
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / 'ncaa_soccer.db')
+    shutil.copy(SOURCE_DB, path)
+    run_migrations(path, verbose=False)
+    return path
+
+
+def stored_ratings(db_path, data_date='2024-12-31'):
+    conn = sqlite3.connect(db_path)
+    try:
+        return pd.read_sql_query(
+            "SELECT name, team, max_rating FROM player_ratings WHERE season = '2024' AND data_date = ?",
+            conn, params=(data_date,)
+        )
+    finally:
+        conn.close()
+
+
+def test_backfill_matches_the_published_csv(db_path):
+    assert ensure_player_ratings(db_path) == 1
+    # Already rated snapshots are left alone
+    assert ensure_player_ratings(db_path) == 0
+
+    stored = stored_ratings(db_path)
+    csv = pd.read_csv(os.path.join(ROOT, 'data', 'd1_player_stats.csv'))
+    stored['Team'] = stored['team'].str.strip()
+    merged = stored.merge(csv, left_on=['name', 'Team'], right_on=['Name', 'Team'])
+
+    assert len(merged) == len(stored) == len(csv)
+    assert (merged['max_rating'] == merged['MAX']).all()
+
+
+def test_weekly_import_rates_the_new_snapshot(db_path, monkeypatch):
+    monkeypatch.setenv('NCAA_DB_PATH', db_path)
+    conn = sqlite3.connect(db_path)
+    players = pd.read_sql_query("""
+        SELECT name AS "Name", team AS "Team", position AS "Position",
+               minutes_played AS "Minutes Played", goals AS "Goals", assists AS "Assists",
+               shots AS "Shots", shots_on_target AS "Shots On Target", fouls_won AS "Fouls Won"
+        FROM players
+    """, conn)
+    conn.close()
+
+    assert SeasonDataManager().import_weekly_data(players, '2024', '2025-01-07', 're-import')
+    ensure_player_ratings(db_path)
+
+    before = stored_ratings(db_path).sort_values(['name', 'team']).reset_index(drop=True)
+    after = stored_ratings(db_path, '2025-01-07').sort_values(['name', 'team']).reset_index(drop=True)
+    assert len(after) > 3000
+    assert after.equals(before)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
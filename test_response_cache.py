@@ -0,0 +1,84 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from flask import Flask, jsonify, request
+
+from response_cache import MemoryBackend, ResponseCache, SQLiteBackend
+
+
+def make_app(backend):
+    app = Flask(__name__)
+    state = {'version': 1, 'renders': 0}
+    cache = ResponseCache(lambda: state['version'], backend, namespace='test')
+
+    @app.route('/teams')
+    @cache
+    def teams():
+        state['renders'] += 1
+        return f"<p>render {state['renders']} {request.args.get('page', '1')}</p>"
+
+    @app.route('/missing')
+    @cache
+    def missing():
+        state['renders'] += 1
+        return jsonify({'error': 'not found'}), 404
+
+    return app.test_client(), state, cache
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def backend(request, tmp_path):
+    if request.param == 'memory':
+        return MemoryBackend(max_entries=8)
+    return SQLiteBackend(str(tmp_path / 'response_cache.db'))
+
+
+def test_renders_once_per_data_version(backend):
+    client, state, cache = make_app(backend)
+
+    first = client.get('/teams?page=2&search=')
+    # Same page with reordered and empty args is the same cache entry
+    second = client.get('/teams?search=&page=2')
+    assert first.data == second.data == b'<p>render 1 2</p>'
+    assert state['renders'] == 1 and cache.hits == 1
+
+    client.get('/teams')
+    assert state['renders'] == 2
+
+    state['version'] += 1
+    assert client.get('/teams?page=2').data == b'<p>render 3 2</p>'
+
+
+def test_etag_revalidation_returns_304(backend):
+    client, state, _ = make_app(backend)
+    response = client.get('/teams')
+    etag = response.headers['ETag']
+    assert response.headers['Last-Modified']
+    assert 'no-cache' in response.headers['Cache-Control']
+
+    assert client.get('/teams', headers={'If-None-Match': etag}).status_code == 304
+    state['version'] += 1
+    assert client.get('/teams', headers={'If-None-Match': etag}).status_code == 200
+
+
+def test_errors_are_not_cached(backend):
+    client, state, _ = make_app(backend)
+    assert client.get('/missing').status_code == 404
+    assert client.get('/missing').status_code == 404
+    assert state['renders'] == 2
+
+
+def test_sqlite_backend_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / 'response_cache.db')
+    worker_a, state_a, _ = make_app(SQLiteBackend(path))
+    worker_b, state_b, cache_b = make_app(SQLiteBackend(path))
+
+    body = worker_a.get('/teams').data
+    assert worker_b.get('/teams').data == body
+    assert state_b['renders'] == 0 and cache_b.hits == 1
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,82 @@
+import os
+import shutil
+import sqlite3
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pytest
+
+from db_migrations import run_migrations
+from match_predictions import expected_goals, outcome_probabilities
+from season_simulator import (bracket_order, build_season_model, sample_goals, scoreline_cdf,
+                              simulate_seasons, summarize)
+from team_standings import ensure_team_standings
+
+SOURCE_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'ncaa_soccer.db')
+
+
+@pytest.fixture(scope='module')
+def conn(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('simulator') / 'ncaa_soccer.db')
+    shutil.copy(SOURCE_DB, path)
+    run_migrations(path, verbose=False)
+    ensure_team_standings(path)
+    conn = sqlite3.connect(path)
+    yield conn
+    conn.close()
+
+
+def test_sampled_scorelines_follow_the_prediction_model():
+    rng = np.random.default_rng(7)
+    home_lam, away_lam = expected_goals(1.6, 0.8, 0.9, 1.3)
+    home_cdf, away_cdf = scoreline_cdf(np.array([home_lam]), np.array([away_lam]))
+    home_goals = sample_goals(rng, home_cdf, (200000, 1))[:, 0]
+    away_goals = sample_goals(rng, away_cdf, (200000, 1))[:, 0]
+
+    sampled = [(home_goals > away_goals).mean(), (home_goals == away_goals).mean(), (home_goals < away_goals).mean()]
+    assert np.allclose(sampled, outcome_probabilities(home_lam, away_lam), atol=0.005)
+    assert home_goals.max() <= 5
+
+
+def test_bracket_keeps_top_seeds_apart():
+    assert bracket_order(8) == [1, 8, 4, 5, 2, 7, 3, 6]
+    assert bracket_order(2) == [1, 2]
+
+
+def test_odds_are_consistent_and_reproducible(conn):
+    model = build_season_model(conn, round_robin=True, playoff_spots=6)
+    first = simulate_seasons(model, 3000, workers=1, seed=11, chunk_seasons=1000)
+    again = simulate_seasons(model, 3000, workers=2, seed=11, chunk_seasons=1000)
+    assert np.array_equal(first['titles'], again['titles'])
+    assert np.array_equal(first['tournaments'], again['tournaments'])
+
+    for conference, members in model.conferences.items():
+        spots = min(6, len(members))
+        assert first['titles'][members].sum() == 3000
+        assert first['tournaments'][members].sum() == 3000
+        assert first['playoffs'][members].sum() == 3000 * spots
+        # Every team finishes somewhere and every place is filled each season
+        positions = first['positions'][conference]
+        assert (positions.sum(axis=0) == 3000).all() and (positions.sum(axis=1) == 3000).all()
+
+    rows = summarize(model, first)['ACC']
+    assert rows[0]['title'] == max(row['title'] for row in rows)
+    assert sum(row['title'] for row in rows) == pytest.approx(100, abs=0.1)
+
+
+def test_without_fixtures_the_current_leader_takes_the_title(conn):
+    model = build_season_model(conn)
+    assert len(model.home) == 0
+
+    counts = simulate_seasons(model, 200, workers=1, seed=3)
+    for conference, members in model.conferences.items():
+        table = model.base[:, members]
+        order = np.lexsort((-table[2], -table[1], -table[0]))
+        leader, runner_up = table[:, order[0]], table[:, order[1]]
+        if tuple(leader) != tuple(runner_up):
+            assert counts['titles'][members[order[0]]] == 200
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,52 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from db_migrations import run_migrations
+from ratings_table import ensure_player_ratings
+from team_standings import ensure_team_standings
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DB = os.path.join(ROOT, 'data', 'ncaa_soccer.db')
+
+CHILD = """
+import json, sys
+import ncaa_app
+client = ncaa_app.app.test_client()
+pages = [client.get(route).status_code for route in ['/', '/matches', '/teams']]
+before = [m for m in ['pandas', 'matplotlib', 'player_ratings'] if m in sys.modules]
+ncaa_app.get_player_rating_data('Nobody', generate_chart=False)
+print(json.dumps({'pages': pages, 'before': before, 'after': 'player_ratings' in sys.modules}))
+"""
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / 'ncaa_soccer.db')
+    shutil.copy(SOURCE_DB, path)
+    run_migrations(path, verbose=False)
+    # Ratings and standings are built on first deploy (that does need pandas); a restart only reads them
+    ensure_player_ratings(path)
+    ensure_team_standings(path)
+    return path
+
+
+def test_sql_only_pages_do_not_import_the_ratings_stack(db_path):
+    env = dict(os.environ, NCAA_DB_PATH=db_path, RATINGS_WARMUP='0', RESPONSE_CACHE='off')
+    result = subprocess.run([sys.executable, '-c', CHILD], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+
+    assert report['pages'] == [200, 200, 200]
+    assert report['before'] == []
+    # The first ratings lookup pulls the stack in on demand
+    assert report['after']
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,110 @@
+import os
+import shutil
+import sqlite3
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+import pytest
+
+from db_migrations import run_migrations
+from player_ratings import calculate_team_max_ratings
+from team_standings import STANDINGS_SQL, current_snapshot, ensure_team_standings, refresh_team_standings
+
+SOURCE_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'ncaa_soccer.db')
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / 'ncaa_soccer.db')
+    shutil.copy(SOURCE_DB, path)
+    run_migrations(path, verbose=False)
+    ensure_team_standings(path)
+    return path
+
+
+def standings(conn):
+    snapshot = current_snapshot(conn)
+    return {
+        row[0]: row[1:]
+        for row in conn.execute("""
+            SELECT team, games_played, wins, draws, losses, goals_for, goals_against,
+                   goal_difference, points, att_rating, def_rating, max_rating
+            FROM team_standings WHERE season = ? AND snapshot_date = ?
+        """, snapshot)
+    }
+
+
+def test_materialized_rows_match_the_match_aggregate(db_path):
+    conn = sqlite3.connect(db_path)
+    table = standings(conn)
+    expected = conn.execute(STANDINGS_SQL.format(home_filter='', away_filter='')).fetchall()
+    ratings = calculate_team_max_ratings(pd.read_sql_query("SELECT * FROM matches", conn))
+    conn.close()
+
+    assert len(table) == len(expected) > 0
+    for team, games, wins, draws, losses, goals_for, goals_against in expected:
+        assert table[team][:8] == (games, wins, draws, losses, goals_for, goals_against,
+                                   goals_for - goals_against, wins * 3 + draws)
+
+    for rating in ratings[['Team', 'ATT', 'DEF', 'MAX']].to_dict('records'):
+        assert table[rating['Team']][8:] == pytest.approx((rating['ATT'], rating['DEF'], rating['MAX']))
+
+
+def test_incremental_refresh_only_touches_changed_teams(db_path):
+    conn = sqlite3.connect(db_path)
+    home, away = conn.execute("SELECT home_team, away_team FROM matches LIMIT 1").fetchone()
+    before = standings(conn)
+
+    conn.execute("INSERT INTO matches (home_team, home_team_score, away_team, away_team_score) "
+                 "VALUES (?, 2, ?, 1)", (home, away))
+    conn.commit()
+    assert {row[0] for row in conn.execute("SELECT team FROM team_standings_dirty")} == {home, away}
+
+    assert refresh_team_standings(conn) == 2
+    conn.commit()
+    after = standings(conn)
+    assert after[home][:8] != before[home][:8] and after[home][1] == before[home][1] + 1
+    assert after[away][3] == before[away][3] + 1
+    # The ratings the predictions read move with the new match
+    assert after[home][8] != before[home][8]
+    assert all(after[team][:8] == before[team][:8] for team in before if team not in (home, away))
+
+    # Same result as recomputing every team from scratch
+    refresh_team_standings(conn, full=True)
+    conn.commit()
+    assert standings(conn) == after
+
+    conn.execute("DELETE FROM matches WHERE rowid = (SELECT MAX(rowid) FROM matches)")
+    conn.commit()
+    assert refresh_team_standings(conn) == 2
+    conn.commit()
+    assert {team: row[:8] for team, row in standings(conn).items()} == \
+        {team: row[:8] for team, row in before.items()}
+    assert refresh_team_standings(conn) == 0
+    conn.close()
+
+
+def test_up_to_date_standings_skip_the_write_lock(db_path):
+    # Another process importing holds the write lock
+    importer = sqlite3.connect(db_path, isolation_level=None)
+    importer.execute("BEGIN IMMEDIATE")
+    started = time.perf_counter()
+    try:
+        assert ensure_team_standings(db_path) == 0
+    finally:
+        importer.execute("ROLLBACK")
+        importer.close()
+    assert time.perf_counter() - started < 1.0
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("INSERT INTO matches (home_team, home_team_score, away_team, away_team_score) "
+                 "VALUES ('Akron', 1, 'Ohio State', 0)")
+    conn.commit()
+    conn.close()
+    assert ensure_team_standings(db_path) == 2
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+import sqlite3
+import sys
+sys.path.append('.')
+
+from player_ratings import (
+    load_data, calculate_per90_stats, normalize_stats, calculate_max_ratings,
+    calculate_rating, get_position_weights, calculate_team_max_ratings
+)
+
+
+def rowwise_team_ratings(df):
+    """The original per-team apply() implementation of team ATT/DEF/MAX, kept as the reference"""
+    df = df.copy()
+    avg_home = df['home_team_score'].mean()
+    avg_away = df['away_team_score'].mean()
+    df['capped_home_team_score'] = df.apply(
+        lambda row: min(row['home_team_score'], row['away_team_score'] + 5), axis=1
+    )
+    df['capped_away_team_score'] = df.apply(
+        lambda row: min(row['away_team_score'], row['home_team_score'] + 5), axis=1
+    )
+
+    def side(team_col, conf_col, capped_for, capped_against, avg_for, avg_against):
+        d1 = df[df[conf_col] != 'Not D1']
+        side_df = d1[[team_col, conf_col]].drop_duplicates()
+        side_df.columns = ['Team', 'Conference']
+        side_df['MP'] = side_df['Team'].apply(lambda team: len(df[df[team_col] == team]))
+        side_df['GF'] = side_df['Team'].apply(lambda team: df[df[team_col] == team][capped_for].sum())
+        side_df['GA'] = side_df['Team'].apply(lambda team: df[df[team_col] == team][capped_against].sum())
+        conf_for = d1.groupby(conf_col)[capped_for].mean()
+        conf_against = d1.groupby(conf_col)[capped_against].mean()
+        side_df['ATT'] = side_df.apply(
+            lambda row: ((row['GF'] / row['MP']) / avg_for) * (conf_for[row['Conference']] / avg_for)
+            if row['MP'] > 0 else 0, axis=1
+        )
+        side_df['DEF'] = side_df.apply(
+            lambda row: ((row['GA'] / row['MP']) / avg_against) * (conf_against[row['Conference']] / avg_against)
+            if row['MP'] > 0 else 0, axis=1
+        )
+        return side_df
+
+    home_df = side('home_team', 'home_team_conference', 'capped_home_team_score', 'capped_away_team_score',
+                   avg_home, avg_away)
+    away_df = side('away_team', 'away_team_conference', 'capped_away_team_score', 'capped_home_team_score',
+                   avg_away, avg_home)
+    overall_df = pd.merge(home_df, away_df, on=['Team', 'Conference'], how='inner')
+    for metric in ['MP', 'GF', 'GA', 'ATT', 'DEF']:
+        overall_df[metric] = overall_df[f'{metric}_x'] + overall_df[f'{metric}_y']
+    overall_df['ATT'] = overall_df['ATT'] / 2
+    overall_df['DEF'] = overall_df['DEF'] / 2
+    max_def = overall_df['DEF'].max()
+    overall_df['STR'] = overall_df['ATT'] * 0.5 + (max_def - overall_df['DEF']) * 0.5
+    overall_df['MAX'] = (overall_df['STR'] - overall_df['STR'].min()) / (overall_df['STR'].max() - overall_df['STR'].min()) * 100
+    return overall_df
+
+
+def test_vectorized_ratings_match_rowwise():
+    """Vectorized Overall_Rating must be bit-identical to the row-wise formula"""
+    merged_df, _ = load_data()
+    merged_df = calculate_per90_stats(merged_df)
+    merged_df = normalize_stats(merged_df)
+    merged_df = calculate_max_ratings(merged_df)
+
+    weights = get_position_weights()
+    rowwise = merged_df.apply(lambda row: calculate_rating(row, weights), axis=1)
+
+    assert np.array_equal(rowwise.to_numpy(), merged_df['Overall_Rating'].to_numpy())
+
+
+def test_shot_accuracy_and_team_minutes_match_rowwise():
+    merged_df, _ = load_data()
+    merged_df = calculate_per90_stats(merged_df)
+    merged_df = normalize_stats(merged_df)
+
+    shot_accuracy = merged_df.apply(
+        lambda row: row['Shots On Target'] / row['Shots'] if row['Shots'] > 0 else 0, axis=1
+    )
+    team_minutes = merged_df.groupby('Team')['Minutes Played'].sum()
+    team_share = merged_df.apply(lambda row: row['Minutes Played'] / team_minutes[row['Team']], axis=1)
+
+    assert np.array_equal(shot_accuracy.to_numpy(dtype=float), merged_df['Shot Accuracy'].to_numpy())
+    assert np.array_equal(team_share.to_numpy(), merged_df['Team_Minutes_Played_Percentage'].to_numpy())
+
+
+def test_team_max_ratings_match_rowwise():
+    conn = sqlite3.connect('data/ncaa_soccer.db')
+    matches = pd.read_sql_query("SELECT * FROM matches", conn)
+    conn.close()
+
+    expected = rowwise_team_ratings(matches).set_index('Team').sort_index()
+    actual = calculate_team_max_ratings(matches).set_index('Team').sort_index()
+
+    assert list(actual.index) == list(expected.index)
+    for column in ['MP', 'GF', 'GA']:
+        assert np.array_equal(actual[column].to_numpy(), expected[column].to_numpy()), column
+    for column in ['ATT', 'DEF', 'STR', 'MAX']:
+        assert np.allclose(actual[column].to_numpy(), expected[column].to_numpy(), rtol=0, atol=1e-12), column
+
+
+if __name__ == "__main__":
+    test_vectorized_ratings_match_rowwise()
+    test_shot_accuracy_and_team_minutes_match_rowwise()
+    test_team_max_ratings_match_rowwise()
+    print("✅ Vectorized ratings match the row-wise calculation")
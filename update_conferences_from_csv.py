@@ -1,7 +1,11 @@
 import pandas as pd
-import sqlite3
 
-def update_conferences_from_csv():
+from app_state import bump_data_version
+from db_access import connect_readonly, write_transaction
+from player_history import player_conferences, rebuild_changed_conferences
+from player_search import rebuild_player_search
+
+def update_conferences_from_csv(db_path=None):
     """Update player conferences based on actual data from ncaa_mens_scores_2024.csv"""
     
     # Read the scores CSV to get team-conference mappings
@@ -35,29 +39,39 @@ def update_conferences_from_csv():
     for conf, count in sorted(conf_counts.items(), key=lambda x: x[1], reverse=True):
         print(f"  {conf}: {count} teams")
     
-    # Update the database
-    conn = sqlite3.connect('data/ncaa_soccer.db')
-    cursor = conn.cursor()
-    
-    # Reset all conferences to NULL first
-    cursor.execute("UPDATE players SET conference = NULL")
-    
-    # Update players with conference information
-    updated_count = 0
-    for team, conference in team_conferences.items():
-        cursor.execute("UPDATE players SET conference = ? WHERE team = ?", (conference, team))
-        updated_count += cursor.rowcount
-    
-    # Set remaining teams to "Other" conference
-    cursor.execute("UPDATE players SET conference = 'Other' WHERE conference IS NULL")
-    other_count = cursor.rowcount
-    
-    conn.commit()
+    # Update the database through the shared writer, so an import or the web app's
+    # startup refresh holding the write lock is waited for instead of failing
+    with write_transaction(db_path) as conn:
+        cursor = conn.cursor()
+        
+        before = player_conferences(conn)
+        
+        # Reset all conferences to NULL first
+        cursor.execute("UPDATE players SET conference = NULL")
+        
+        # Update players with conference information
+        updated_count = 0
+        for team, conference in team_conferences.items():
+            cursor.execute("UPDATE players SET conference = ? WHERE team = ?", (conference, team))
+            updated_count += cursor.rowcount
+        
+        # Set remaining teams to "Other" conference
+        cursor.execute("UPDATE players SET conference = 'Other' WHERE conference IS NULL")
+        other_count = cursor.rowcount
+        
+        # Conferences are searchable too, and filterable on historical snapshots
+        rebuild_player_search(conn)
+        rebuilt = rebuild_changed_conferences(conn, before)
+        bump_data_version(conn)
     
     print(f"\nUpdated {updated_count} players with known conferences")
     print(f"Set {other_count} players to 'Other' conference")
+    if rebuilt:
+        print(f"📚 Re-encoded player history for {', '.join(rebuilt)}")
     
     # Show final conference distribution in database
+    conn = connect_readonly(db_path)
+    cursor = conn.cursor()
     cursor.execute("SELECT conference, COUNT(*) as player_count FROM players GROUP BY conference ORDER BY player_count DESC")
     conferences = cursor.fetchall()
     print("\nFinal conference distribution in database:")
@@ -3,11 +3,29 @@ Weekly Data Management System for NCAA Soccer Dashboard
 This script will be used when the 2025 season starts
 """
 
-import sqlite3
 import pandas as pd
 import os
+import time
 from datetime import datetime, timedelta
+from rapidfuzz import process, fuzz
 from ncaa_data_collector import NCAADataCollector
+from ratings_table import ensure_player_ratings, refresh_player_ratings
+from app_state import bump_data_version
+from player_search import rebuild_player_search
+from team_standings import ensure_team_standings, refresh_team_standings
+from pbp_events import store_match_events
+from player_history import players_snapshot_rows, store_history_snapshot
+from db_access import connect, write_transaction
+
+# Stat columns summed from per-game lines into season totals (DataFrame name, DB column)
+GAME_STAT_COLUMNS = [
+    ('Minutes Played', 'minutes_played'),
+    ('Goals', 'goals'),
+    ('Assists', 'assists'),
+    ('Shots', 'shots'),
+    ('Shots On Target', 'shots_on_target'),
+    ('Fouls Won', 'fouls_won'),
+]
 
 class SeasonDataManager:
     def __init__(self):
@@ -20,8 +38,8 @@ class SeasonDataManager:
             pass
         
     def get_db_connection(self):
-        """Get database connection"""
-        return sqlite3.connect(self.db_path)
+        """Get database connection (WAL, busy timeout); writes go through write_transaction"""
+        return connect(self.db_path)
     
     def is_season_active(self, season):
         """Check if data collection is active for a season"""
@@ -40,92 +58,92 @@ class SeasonDataManager:
     
     def activate_season(self, season):
         """Activate data collection for a season"""
-        conn = self.get_db_connection()
-        cursor = conn.cursor()
-        
-        # Deactivate all other seasons
-        cursor.execute("UPDATE seasons SET is_active = FALSE, data_collection_active = FALSE")
-        
-        # Activate the specified season
-        cursor.execute("""
-            UPDATE seasons 
-            SET is_active = TRUE, data_collection_active = TRUE 
-            WHERE season = ?
-        """, (season,))
-        
-        conn.commit()
-        conn.close()
+        with write_transaction(self.db_path) as conn:
+            # Deactivate all other seasons
+            conn.execute("UPDATE seasons SET is_active = FALSE, data_collection_active = FALSE")
+            
+            # Activate the specified season
+            conn.execute("""
+                UPDATE seasons 
+                SET is_active = TRUE, data_collection_active = TRUE 
+                WHERE season = ?
+            """, (season,))
         
         print(f"✅ Activated data collection for {season} season")
     
-    def import_weekly_data(self, player_stats, season, snapshot_date, description=""):
-        """Import weekly data to database"""
+    def import_weekly_data(self, player_stats, season, snapshot_date, description="", events=None):
+        """Import weekly data (and any parsed play-by-play events) in a single bulk transaction"""
         if player_stats is None or len(player_stats) == 0:
             print("❌ No data to import")
             return False
             
-        conn = self.get_db_connection()
-        cursor = conn.cursor()
+        started = time.perf_counter()
+        
+        # Convert the frame to plain tuples once; both tables are loaded from them
+        rows = list(player_stats[[
+            'Name', 'Team', 'Position', 'Minutes Played', 'Goals', 'Assists',
+            'Shots', 'Shots On Target', 'Fouls Won'
+        ]].itertuples(index=False, name=None))
         
         try:
-            # Add data snapshot record
-            cursor.execute("""
-                INSERT OR REPLACE INTO data_snapshots 
-                (season, snapshot_date, description, total_players, is_current)
-                VALUES (?, ?, ?, ?, TRUE)
-            """, (season, snapshot_date, description, len(player_stats)))
-            
-            # Mark previous snapshots as not current for this season
-            cursor.execute("""
-                UPDATE data_snapshots 
-                SET is_current = FALSE 
-                WHERE season = ? AND snapshot_date != ?
-            """, (season, snapshot_date))
-            
-            # Remove existing player data for this snapshot (if updating)
-            cursor.execute("""
-                DELETE FROM players 
-                WHERE season = ? AND data_date = ?
-            """, (season, snapshot_date))
-            
-            # Insert new player data
-            for _, player in player_stats.iterrows():
+            # One transaction on the shared writer: readers see the old snapshot until COMMIT
+            with write_transaction(self.db_path) as conn:
+                cursor = conn.cursor()
+                
+                # Add data snapshot record
+                cursor.execute("""
+                    INSERT OR REPLACE INTO data_snapshots 
+                    (season, snapshot_date, description, total_players, is_current)
+                    VALUES (?, ?, ?, ?, TRUE)
+                """, (season, snapshot_date, description, len(rows)))
+                
+                # Mark previous snapshots as not current for this season
+                cursor.execute("""
+                    UPDATE data_snapshots 
+                    SET is_current = FALSE 
+                    WHERE season = ? AND snapshot_date != ?
+                """, (season, snapshot_date))
+                
+                # Remove existing player data for this snapshot (if updating)
                 cursor.execute("""
+                    DELETE FROM players 
+                    WHERE season = ? AND data_date = ?
+                """, (season, snapshot_date))
+                
+                # Insert new player data (conference is updated separately)
+                cursor.executemany("""
                     INSERT INTO players 
                     (name, team, position, minutes_played, goals, assists, shots, 
                      shots_on_target, fouls_won, season, data_date, conference)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    player['Name'], player['Team'], player['Position'],
-                    player['Minutes Played'], player['Goals'], player['Assists'],
-                    player['Shots'], player['Shots On Target'], player['Fouls Won'],
-                    season, snapshot_date, None  # Conference will be updated separately
-                ))
-            
-            # Also insert into history table
-            for _, player in player_stats.iterrows():
-                cursor.execute("""
-                    INSERT OR REPLACE INTO player_stats_history 
-                    (player_name, team, season, snapshot_date, position,
-                     minutes_played, goals, assists, shots, shots_on_target, fouls_won)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    player['Name'], player['Team'], season, snapshot_date,
-                    player['Position'], player['Minutes Played'], player['Goals'],
-                    player['Assists'], player['Shots'], player['Shots On Target'],
-                    player['Fouls Won']
-                ))
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, NULL)
+                """, [row + (season, snapshot_date) for row in rows])
+                
+                # History only stores the lines that changed since the previous snapshot; the
+                # conference updater re-encodes it once conferences are filled in
+                history_written = store_history_snapshot(conn, season, snapshot_date,
+                                                         [row + (None,) for row in rows])
+                
+                stored_events = store_match_events(conn, events, season)
+                
+                # Store MAX ratings for the snapshot so listings can sort by them in SQL
+                rated = refresh_player_ratings(conn, season, snapshot_date)
+                rebuild_player_search(conn)
+                # A new current snapshot gets its own standings
+                refresh_team_standings(conn)
+                bump_data_version(conn)
             
-            conn.commit()
-            print(f"✅ Successfully imported {len(player_stats)} players for {season} - {snapshot_date}")
+            elapsed = time.perf_counter() - started
+            print(f"✅ Successfully imported {len(rows)} players for {season} - {snapshot_date}")
+            print(f"⭐ Rated {rated} players")
+            if stored_events:
+                print(f"📝 Stored {stored_events} play-by-play events")
+            loaded = len(rows) + history_written
+            print(f"⚡ Loaded {loaded} rows in {elapsed:.2f}s ({loaded / max(elapsed, 1e-9):,.0f} rows/sec)")
             return True
             
         except Exception as e:
-            conn.rollback()
             print(f"❌ Error importing data: {e}")
             return False
-        finally:
-            conn.close()
     
     def update_conferences(self, season, snapshot_date):
         """Update conference information from scores data"""
@@ -138,7 +156,7 @@ class SeasonDataManager:
                 
             from update_conferences_from_csv import update_conferences_from_csv
             # This would need to be modified to work with specific season/date
-            update_conferences_from_csv()
+            update_conferences_from_csv(self.db_path)
             print(f"✅ Updated conferences for {season} - {snapshot_date}")
             return True
             
@@ -146,8 +164,8 @@ class SeasonDataManager:
             print(f"❌ Error updating conferences: {e}")
             return False
     
-    def run_weekly_collection(self, season='2025'):
-        """Run weekly data collection (when season is active)"""
+    def run_weekly_collection(self, season='2025', collector=None, progress=None):
+        """Run weekly data collection (when season is active); `progress` is a jobs.JobProgress"""
         if not self.is_season_active(season):
             print(f"⚠️  Data collection not active for {season} season")
             return False
@@ -160,14 +178,15 @@ class SeasonDataManager:
         snapshot_date = end_date.strftime('%Y-%m-%d')
         
         # Initialize collector
-        collector = NCAADataCollector(season=season, division='d1')
+        collector = collector or NCAADataCollector(season=season, division='d1')
         
         try:
             # Collect data
             player_stats, description = collector.collect_season_data(
                 start_date.strftime('%Y-%m-%d'),
                 end_date.strftime('%Y-%m-%d'),
-                f"Weekly update - {snapshot_date}"
+                f"Weekly update - {snapshot_date}",
+                progress=progress
             )
             
             if player_stats is not None:
@@ -175,7 +194,13 @@ class SeasonDataManager:
                 week_dir, csv_path = collector.save_data(player_stats, snapshot_date, description)
                 
                 # Import to database
-                success = self.import_weekly_data(player_stats, season, snapshot_date, description)
+                events = pd.concat(collector.collected_events, ignore_index=True) if collector.collected_events else None
+                if progress:
+                    progress.start('import', total=len(player_stats))
+                success = self.import_weekly_data(player_stats, season, snapshot_date, description, events)
+                if progress:
+                    progress.advance('import', len(player_stats) if success else 0)
+                    progress.finish('import')
                 
                 if success:
                     # Update conferences
@@ -190,6 +215,260 @@ class SeasonDataManager:
             
         return False
     
+    def get_incremental_start_date(self, season, end_date, lookback_days=2):
+        """First day to scan: a short overlap before the last ingested game, else the season start"""
+        conn = self.get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT MAX(game_date) FROM ingested_games WHERE season = ?", (season,))
+        last_game_date = cursor.fetchone()[0]
+        cursor.execute("SELECT start_date FROM seasons WHERE season = ?", (season,))
+        row = cursor.fetchone()
+        conn.close()
+
+        if last_game_date:
+            # Re-check recent days for games that were still in progress or posted late
+            return pd.Timestamp(last_game_date) - timedelta(days=lookback_days)
+        if row and row[0]:
+            return pd.Timestamp(row[0])
+        return end_date - timedelta(days=7)
+
+    def filter_new_games(self, season, game_ids):
+        """Game ids from the list that have not been ingested yet"""
+        if not game_ids:
+            return []
+        conn = self.get_db_connection()
+        placeholders = ','.join('?' * len(game_ids))
+        cursor = conn.execute(
+            f"SELECT game_id FROM ingested_games WHERE season = ? AND game_id IN ({placeholders})",
+            [season] + list(game_ids)
+        )
+        seen = {row[0] for row in cursor.fetchall()}
+        conn.close()
+        return [game_id for game_id in game_ids if game_id not in seen]
+
+    def resolve_game_line_names(self, cursor, season, lines, similarity_threshold=90):
+        """Map names in new lines onto names already ingested for the same team this season"""
+        resolved = {}
+        for team, names in lines.groupby('Team')['Name']:
+            cursor.execute("""
+                SELECT DISTINCT name FROM player_game_stats
+                WHERE season = ? AND team = ?
+            """, (season, team))
+            known = {row[0].lower(): row[0] for row in cursor.fetchall()}
+
+            for name in names.unique():
+                key = name.lower()
+                if key not in known:
+                    match = process.extractOne(key, list(known.keys()), scorer=fuzz.WRatio)
+                    if match and match[1] > similarity_threshold:
+                        key = match[0]
+                    else:
+                        # Later games in this batch resolve to the new name as well
+                        known[key] = name
+                resolved[(name, team)] = known[key]
+        return resolved
+
+    def ingest_game_lines(self, collector, lines, game_dates, snapshot_date, description="", events=None):
+        """Store new per-game lines and apply them as deltas to the season-to-date totals.
+
+        Games already recorded in ingested_games are skipped, so re-running over the same
+        window changes nothing. Returns the number of newly ingested games.
+        """
+        season = collector.season
+
+        try:
+            # Name resolution reads and the writes below see one consistent state
+            with write_transaction(self.db_path) as conn:
+                cursor = conn.cursor()
+
+                # Unify spellings with earlier games, then merge lines that now share a name
+                names = self.resolve_game_line_names(cursor, season, lines)
+                lines = lines.copy()
+                lines['Name'] = [names[(name, team)] for name, team in zip(lines['Name'], lines['Team'])]
+                lines = lines.groupby(['Game ID', 'Name', 'Team'], as_index=False, sort=False).sum()
+
+                # Claim each game in the ledger; a game claimed before contributes nothing
+                new_lines = []
+                for game_id, game_lines in lines.groupby('Game ID', sort=False):
+                    cursor.execute("""
+                        INSERT OR IGNORE INTO ingested_games (game_id, season, game_date, player_lines)
+                        VALUES (?, ?, ?, ?)
+                    """, (game_id, season, game_dates.get(game_id), len(game_lines)))
+                    if cursor.rowcount:
+                        new_lines.append(game_lines)
+
+                if not new_lines:
+                    print("ℹ️  No new games to ingest")
+                    return 0
+
+                new_lines = pd.concat(new_lines, ignore_index=True)
+                if events is not None:
+                    # Only the games claimed above; skipped and already-ingested games keep their rows
+                    store_match_events(conn, events[events['game_id'].isin(new_lines['Game ID'])], season, game_dates)
+                stat_columns = [column for column, _ in GAME_STAT_COLUMNS]
+                new_lines[stat_columns] = new_lines[stat_columns].astype(int)
+
+                cursor.executemany("""
+                    INSERT INTO player_game_stats
+                    (game_id, season, game_date, name, team, position,
+                     minutes_played, goals, assists, shots, shots_on_target, fouls_won)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, [
+                    (game_id, season, game_dates.get(game_id), name, team, position, *stats)
+                    for game_id, name, team, position, *stats in new_lines[
+                        ['Game ID', 'Name', 'Team', 'Position'] + stat_columns
+                    ].itertuples(index=False, name=None)
+                ])
+
+                # Incremental snapshots record total_games; carry the latest one forward to this date
+                cursor.execute("""
+                    SELECT snapshot_date FROM data_snapshots
+                    WHERE season = ? AND total_games IS NOT NULL
+                    ORDER BY snapshot_date DESC LIMIT 1
+                """, (season,))
+                row = cursor.fetchone()
+                if row:
+                    snapshot_date = max(snapshot_date, row[0])
+                    cursor.execute("""
+                        UPDATE players SET data_date = ?
+                        WHERE season = ? AND data_date = ?
+                    """, (snapshot_date, season, row[0]))
+                    cursor.execute("""
+                        DELETE FROM player_ratings
+                        WHERE season = ? AND data_date = ?
+                    """, (season, row[0]))
+                else:
+                    # First incremental run builds the totals from scratch
+                    cursor.execute("""
+                        DELETE FROM players
+                        WHERE season = ? AND data_date = ?
+                    """, (season, snapshot_date))
+
+                # Apply the deltas: only players who appeared in the new games are touched
+                deltas = new_lines.groupby(['Name', 'Team'], as_index=False, sort=False)[stat_columns].sum()
+                assignments = ', '.join(f"{column} = {column} + ?" for _, column in GAME_STAT_COLUMNS)
+                inserted = 0
+                for name, team, *stats in deltas[['Name', 'Team'] + stat_columns].itertuples(index=False, name=None):
+                    cursor.execute(f"""
+                        UPDATE players SET {assignments}
+                        WHERE season = ? AND data_date = ? AND name = ? AND team = ?
+                    """, (*stats, season, snapshot_date, name, team))
+                    if cursor.rowcount:
+                        continue
+
+                    cursor.execute("""
+                        SELECT conference FROM players
+                        WHERE team = ? AND conference IS NOT NULL LIMIT 1
+                    """, (team,))
+                    conference = cursor.fetchone()
+                    cursor.execute("""
+                        INSERT INTO players
+                        (name, team, position, minutes_played, goals, assists, shots,
+                         shots_on_target, fouls_won, season, data_date, conference)
+                        VALUES (?, ?, NULL, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """, (name, team, *stats, season, snapshot_date, conference[0] if conference else None))
+                    inserted += 1
+
+                # Re-derive the dominant position from every appearance of the affected players
+                for name, team in deltas[['Name', 'Team']].itertuples(index=False, name=None):
+                    cursor.execute("""
+                        SELECT GROUP_CONCAT(position, '') FROM player_game_stats
+                        WHERE season = ? AND team = ? AND name = ?
+                    """, (season, team, name))
+                    position = collector.dominant_position(cursor.fetchone()[0])
+                    cursor.execute("""
+                        UPDATE players SET position = ?
+                        WHERE season = ? AND data_date = ? AND name = ? AND team = ?
+                    """, (position, season, snapshot_date, name, team))
+
+                # Ratings are scaled across the whole snapshot, so re-rate everyone
+                refresh_player_ratings(conn, season, snapshot_date)
+
+                cursor.execute("SELECT COUNT(*) FROM players WHERE season = ? AND data_date = ?",
+                               (season, snapshot_date))
+                total_players = cursor.fetchone()[0]
+                cursor.execute("SELECT COUNT(*) FROM ingested_games WHERE season = ?", (season,))
+                total_games = cursor.fetchone()[0]
+
+                cursor.execute("""
+                    INSERT OR REPLACE INTO data_snapshots
+                    (season, snapshot_date, description, total_players, total_games, is_current)
+                    VALUES (?, ?, ?, ?, ?, TRUE)
+                """, (season, snapshot_date, description, total_players, total_games))
+                cursor.execute("""
+                    UPDATE data_snapshots
+                    SET is_current = FALSE
+                    WHERE season = ? AND snapshot_date != ?
+                """, (season, snapshot_date))
+
+                # Keep the history's copy of this snapshot in step with the totals
+                store_history_snapshot(conn, season, snapshot_date,
+                                       players_snapshot_rows(conn, season, snapshot_date))
+
+                rebuild_player_search(conn)
+                refresh_team_standings(conn)
+                bump_data_version(conn)
+
+            games = new_lines['Game ID'].nunique()
+            print(f"✅ Ingested {games} new games ({len(new_lines)} player lines) for {season} - {snapshot_date}")
+            print(f"📊 Updated {len(deltas)} players ({inserted} new), {total_players} season-to-date")
+            return games
+
+        except Exception as e:
+            print(f"❌ Error ingesting game lines: {e}")
+            raise
+
+    def run_incremental_collection(self, season='2025', start_date=None, end_date=None,
+                                   collector=None, lookback_days=2):
+        """Collect only games not ingested yet and update season-to-date totals in place"""
+        if not self.is_season_active(season):
+            print(f"⚠️  Data collection not active for {season} season")
+            return False
+
+        end = pd.Timestamp(end_date) if end_date else pd.Timestamp(datetime.now().date())
+        start = pd.Timestamp(start_date) if start_date else self.get_incremental_start_date(season, end, lookback_days)
+        snapshot_date = end.strftime('%Y-%m-%d')
+        description = f"Incremental update - {snapshot_date}"
+
+        print(f"🏈 Starting incremental collection for {season} season")
+        print(f"📅 Scanning {start.strftime('%Y-%m-%d')} to {snapshot_date}")
+
+        collector = collector or NCAADataCollector(season=season, division='d1')
+        all_lines = []
+        all_events = []
+        game_dates = {}
+
+        try:
+            for day in pd.date_range(start=start, end=end):
+                game_ids = collector.get_game_ids(day.strftime('%m/%d'))
+                new_ids = self.filter_new_games(season, game_ids)
+                if not new_ids:
+                    continue
+
+                documents = collector.fetch_game_documents(new_ids)
+                events = collector.collect_events(new_ids, documents)
+                lines = collector.collect_game_lines(new_ids, documents, events=events)
+                all_events.append(events)
+                game_dates.update({game_id: day.strftime('%Y-%m-%d') for game_id in new_ids})
+                all_lines.append(lines)
+                print(f"✅ {day.strftime('%m/%d')} - {len(new_ids)} new games, {len(lines)} player lines")
+
+            lines = pd.concat(all_lines, ignore_index=True) if all_lines else None
+            if lines is None or lines.empty:
+                print("ℹ️  No new games since the last run")
+                return True
+
+            events = pd.concat(all_events, ignore_index=True)
+            self.ingest_game_lines(collector, lines, game_dates, snapshot_date, description, events)
+            print(f"🌐 Network requests: {collector.stats['network']} | Cache hits: {collector.stats['cache_hits']}")
+            print(f"🎉 Incremental collection completed successfully!")
+            return True
+
+        except Exception as e:
+            print(f"❌ Incremental collection failed: {e}")
+
+        return False
+
     def prepare_for_2025_season(self):
         """Prepare the system for 2025 season data collection"""
         print("🔧 Preparing for 2025 season...")
@@ -199,17 +478,12 @@ class SeasonDataManager:
         os.makedirs('data/2025/conference_data', exist_ok=True)
         
         # Update season status (but don't activate yet)
-        conn = self.get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            UPDATE seasons 
-            SET start_date = '2025-08-15', end_date = '2025-12-15'
-            WHERE season = '2025'
-        """)
-        
-        conn.commit()
-        conn.close()
+        with write_transaction(self.db_path) as conn:
+            conn.execute("""
+                UPDATE seasons 
+                SET start_date = '2025-08-15', end_date = '2025-12-15'
+                WHERE season = '2025'
+            """)
         
         print("✅ System prepared for 2025 season")
         print("ℹ️  Data collection will begin when season is manually activated")
@@ -253,6 +527,9 @@ def main():
         print("  python weekly_data_manager.py prepare-2025")
         print("  python weekly_data_manager.py activate-2025")
         print("  python weekly_data_manager.py collect-weekly [season]")
+        print("  python weekly_data_manager.py collect-incremental [season]")
+        print("  python weekly_data_manager.py refresh-ratings")
+        print("  python weekly_data_manager.py refresh-standings")
         return
     
     command = sys.argv[1]
@@ -270,6 +547,16 @@ def main():
         season = sys.argv[2] if len(sys.argv) > 2 else '2025'
         manager.run_weekly_collection(season)
         
+    elif command == 'collect-incremental':
+        season = sys.argv[2] if len(sys.argv) > 2 else '2025'
+        manager.run_incremental_collection(season)
+        
+    elif command == 'refresh-ratings':
+        ensure_player_ratings(manager.db_path, rebuild=True)
+        
+    elif command == 'refresh-standings':
+        ensure_team_standings(manager.db_path, full=True)
+        
     else:
         print(f"Unknown command: {command}")
 